@@ -0,0 +1 @@
+"""Бенчмарки конвеєра на синтетичних даних: python -m benchmarks --help"""
@@ -0,0 +1,52 @@
+# benchmarks/__main__.py
+"""
+python -m benchmarks --rows 1000 10000 100000 --out build/bench/results.json
+python -m benchmarks --rows 10000 --compare build/bench/base.json   (код виходу 1 — є регресії)
+"""
+from __future__ import annotations
+import argparse
+import logging
+import sys
+
+from src.reportgen.report_pipeline import REPORT_NAMES
+
+from .run import DEFAULT_THRESHOLD, compare_results, load_results, run_benchmarks, save_results
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Бенчмарки конвеєра звітів на синтетичних даних")
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000],
+                    help="розміри вивантаження перехоплень (рядків), 1k … 1M")
+    ap.add_argument("--networks", type=int, default=200, help="кількість мереж у довіднику")
+    ap.add_argument("--sheets", type=int, default=60, help="кількість еталонних вкладок у довіднику")
+    ap.add_argument("--reports", nargs="+", default=None, choices=REPORT_NAMES,
+                    help="які DOCX-генератори міряти (за замовчуванням — усі)")
+    ap.add_argument("--repeat", type=int, default=1, help="прогонів на розмір (береться найкращий час)")
+    ap.add_argument("--workdir", default="build/bench", help="куди генерувати синтетичні набори")
+    ap.add_argument("--out", default="build/bench/results.json", help="JSON з результатами")
+    ap.add_argument("--compare", default=None, help="JSON попереднього прогону для порівняння")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="у скільки разів повільніше вважати регресією")
+    ap.add_argument("--log-level", default="INFO")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO),
+                        format="%(levelname)s: %(message)s")
+    # звіти самі логують на INFO — у бенчмарку лишаємо лише власні рядки
+    logging.getLogger("src").setLevel(logging.WARNING)
+    for name in ("enemies_report", "eralonky"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    result = run_benchmarks(args.workdir, args.rows, networks=args.networks, etalon_sheets=args.sheets,
+                            reports=args.reports, repeat=args.repeat)
+    print(f"OK: результати → {save_results(result, args.out)}")
+
+    if args.compare:
+        lines, regressed = compare_results(load_results(args.compare), result, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+# benchmarks/run.py
+"""
+Заміри часу по етапах конвеєра на синтетичних наборах і порівняння JSON-результатів між комітами.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+
+import pandas as pd
+
+from src.armorkit.data_loader import cache_for_config, load_inputs
+from src.armorkit.domain.callsigns import callsign_table
+from src.armorkit.domain.intercepts import InterceptSlices
+from src.armorkit.domain.reference_index import ReferenceIndex
+from src.armorkit.frame_cache import configure_frame_cache
+from src.armorkit.normalize_freq import normalize_frequency_column
+from src.armorkit.xlsxutils.workbook import close_workbooks
+from src.reportgen.grouping import group_frequencies_by_tag, unique_frequencies_with_counts
+from src.reportgen.export.word_report import SECTION_CACHE_FILE
+from src.reportgen.report_pipeline import REPORT_NAMES, PreparedInputs, build_report
+from src.reportgen.settings import load_config
+from src.armorkit.dates import parse_period_from_filename
+
+from .synthetic import REPO_ROOT, DatasetSpec, make_dataset
+
+log = logging.getLogger(__name__)
+
+# результат повільніший за базовий більш ніж у стільки разів — регресія
+DEFAULT_THRESHOLD = 1.2
+# різниці, менші за цю (с), — шум таймера, регресією не вважаються
+MIN_DELTA = 0.05
+
+
+class StageTimer:
+    """Час кожного етапу (найкращий з repeat прогонів), у секундах."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            self.stages[name] = min(dt, self.stages.get(name, dt))
+            log.info("  %-28s %8.3f с", name, dt)
+
+
+@contextmanager
+def _cwd(path: Path):
+    # генератори звітів пишуть у ./build відносно робочого каталогу
+    old = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old)
+
+
+def _run_stages(config: Path, timer: StageTimer, reports: Iterable[str]) -> None:
+    cfg = load_config(str(config))
+
+    # 1) завантаження: без кешу (openpyxl) і з теплим дисковим кешем.
+    # Спільні книги (open_workbook) тримають розпарсені аркуші весь процес — перед кожним
+    # холодним етапом їх закриваємо, інакше з --repeat > 1 міряється вже тепле читання.
+    configure_frame_cache(enabled=False)
+    close_workbooks()
+    with timer.stage("load"):
+        li = load_inputs(str(config))
+    configure_frame_cache(enabled=True)
+    load_inputs(str(config))  # прогрів кешу
+    close_workbooks()
+    with timer.stage("load_cached"):
+        load_inputs(str(config))
+
+    with timer.stage("reference_index"):
+        ref_idx = ReferenceIndex.from_frame(li.reference_df, cfg.grouping)
+    with timer.stage("normalize"):
+        normalize_frequency_column(li.intercepts_df, ref_idx)
+    with timer.stage("grouping"):
+        freqs, counts = unique_frequencies_with_counts(li.intercepts_df)
+        groups = group_frequencies_by_tag(freqs, ref_idx, (cfg.grouping or {}).get("allowed_tags", []),
+                                          (cfg.grouping or {}).get("other_bucket", "Інші радіомережі"),
+                                          cfg.grouping)
+    with timer.stage("slices"):
+        slices = InterceptSlices.from_frame(li.intercepts_df)
+    with timer.stage("callsigns"):
+        callsigns = callsign_table(li.intercepts_df, cfg.callsign_aliases)
+
+    period_start, period_end = parse_period_from_filename(li.report_path)
+    prepared = PreparedInputs(cfg=cfg, li=li, ref_idx=ref_idx, slices=slices, freqs=freqs, counts=counts,
+                              groups=groups, period_start=period_start, period_end=period_end,
+                              callsigns=callsigns)
+
+    # 2) DOCX: кожен генератор окремо, без кешу секцій, і кожен сам читає еталонні аркуші
+    # (не з книги, яку вже розпарсив попередній); чернетка — ще й з порожнім кешем секцій
+    # (нове вивантаження: змінились лічильники в заголовках, усе — промахи) і з теплим.
+    # Кеш секцій увімкнено за замовчуванням, тож обидва мають бути не гіршими за docx:draft-docx.
+    configure_frame_cache(enabled=False)
+    for name in reports:
+        close_workbooks()
+        with timer.stage(f"docx:{name}"):
+            build_report(name, prepared)
+    configure_frame_cache(enabled=True)
+    if "draft-docx" in reports:
+        (cache_for_config(cfg).root / SECTION_CACHE_FILE).unlink(missing_ok=True)
+        close_workbooks()
+        with timer.stage("docx:draft-docx:cold-cache"):
+            build_report("draft-docx", prepared)  # заодно прогрів кешу секцій
+        close_workbooks()
+        with timer.stage("docx:draft-docx:cached"):
+            build_report("draft-docx", prepared)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, timeout=30)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(workdir: str | Path, rows: Iterable[int], networks: int = 200, etalon_sheets: int = 60,
+                   reports: Iterable[str] | None = None, repeat: int = 1) -> dict:
+    """
+    Для кожного розміру rows: генерує (або бере готовий) набір у workdir/rows_<N>
+    і міряє етапи. Повертає словник, придатний для JSON і compare_results.
+    """
+    reports = list(reports or REPORT_NAMES)
+    workdir = Path(workdir).resolve()
+    runs: List[dict] = []
+    for n in rows:
+        spec = DatasetSpec(rows=n, networks=networks, etalon_sheets=etalon_sheets)
+        case_dir = workdir / f"rows_{n}"
+        t0 = time.perf_counter()
+        config = make_dataset(case_dir, spec)
+        log.info("Бенчмарк: %d рядків (набір готовий за %.1f с)", n, time.perf_counter() - t0)
+        timer = StageTimer()
+        with _cwd(case_dir):
+            for _ in range(max(1, repeat)):
+                _run_stages(config, timer, reports)
+        runs.append({"spec": spec.__dict__, "stages": timer.stages})
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "runs": runs,
+    }
+
+
+def _by_case(result: dict) -> Dict[int, Dict[str, float]]:
+    return {run["spec"]["rows"]: run["stages"] for run in result.get("runs", [])}
+
+
+def compare_results(base: dict, new: dict, threshold: float = DEFAULT_THRESHOLD,
+                    min_delta: float = MIN_DELTA) -> tuple[list[str], bool]:
+    """Таблиця «етап: база -> нове (×)» для спільних розмірів; True, якщо є регресії понад threshold."""
+    lines, regressed = [], False
+    base_cases, new_cases = _by_case(base), _by_case(new)
+    lines.append(f"{'rows':>8}  {'етап':<28}{'база, с':>10}{'нове, с':>10}{'×':>8}")
+    for n in sorted(set(base_cases) & set(new_cases)):
+        for stage, t_new in new_cases[n].items():
+            t_base = base_cases[n].get(stage)
+            if t_base is None:
+                continue
+            ratio = t_new / t_base if t_base > 0 else float("inf")
+            flag = ""
+            if ratio > threshold and t_new - t_base > min_delta:
+                flag, regressed = "  РЕГРЕСІЯ", True
+            lines.append(f"{n:>8}  {stage:<28}{t_base:>10.3f}{t_new:>10.3f}{ratio:>8.2f}{flag}")
+    return lines, regressed
+
+
+def save_results(result: dict, path: str | Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def load_results(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
@@ -0,0 +1,143 @@
+# benchmarks/synthetic.py
+"""
+Синтетичні вхідні дані для бенчмарків: довідник Frequencies_63.xlsx
+(маски, мітки «Хто», теги, N еталонних вкладок) і report_*.xlsx на потрібну кількість рядків.
+Формат колонок — як у реальних вивантаженнях (config.yml: columns).
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from pathlib import Path
+import json
+import logging
+
+import numpy as np
+import yaml
+from openpyxl import Workbook
+
+log = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# мітки «Хто» — частина ловиться map, частина — regex-шаблонами, решта йде в «Інші»
+TAGS = ["36 мсп 67 мсд 25 ЗА", "37 мсп 67 мсд 25 ЗА", "31 мсп 67 мсд 25 ЗА", "164 омсбр 25 ЗА",
+        "12 мсп 3 А", "інші", None]
+CALLERS = ["ОРЕЛ", "сокіл 1, ОРЕЛ", "НВ", "вовк;лис", "БЕРКУТ", "ГРІМ 2"]
+RECEIVERS = ["БАЗА", "база 2", None, "ЯСТРУБ"]
+COMMENTS = [None, "", "важливо", "повтор", "координати"]
+UNKNOWN_MASK = "100.999"
+REPORT_NAME = "report_2025-10-01T12-00_2025-10-01T16-30.xlsx"
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Розмір синтетичного набору (однаковий spec -> однакові файли)."""
+    rows: int = 10_000
+    networks: int = 200
+    etalon_sheets: int = 60
+    seed: int = 7
+
+
+def _frequencies(rng: np.random.Generator, n: int) -> np.ndarray:
+    # унікальні частоти 130–450 МГц з кроком 0.0001
+    picked = rng.choice(np.arange(1_300_000, 4_500_000), size=n, replace=False)
+    return picked / 10_000
+
+
+def write_reference(path: Path, spec: DatasetSpec) -> np.ndarray:
+    """Довідник: головний аркуш + spec.etalon_sheets вкладок «Категорія | Значення». Повертає частоти."""
+    rng = np.random.default_rng(spec.seed)
+    freqs = _frequencies(rng, spec.networks)
+    wb = Workbook(write_only=True)
+    main = wb.create_sheet("main")
+    main.append(["Частота", "Радіомережа", "Хто", "Маска_3", "Маска_Ш", "Маска_А", "Маска_Акв", "Теги",
+                 "Статус", "Підрозділ", "Зона функціонування", "Вузли зв’язку", "Тип"])
+    for i, f in enumerate(freqs):
+        main.append([
+            f if i % 17 else f"{f:.4f}".replace(".", ","),
+            f"Мережа {i}" if i % 9 else None,
+            TAGS[rng.integers(len(TAGS))],
+            round(100 + i / 1000, 3) if i % 3 == 0 else None,
+            round(300.3 + i / 1000, 3) if i % 5 == 0 else None,
+            f"КЛЮЧ{i}" if i % 7 == 0 else None,
+            None,
+            "Арта" if i % 6 == 0 else "",
+            "Спостерігається" if i % 4 == 0 else "",
+            f"підр {i}",
+            "ЗОНА",
+            "ВЗ" if i % 8 == 0 else None,
+            "т",
+        ])
+    for i, f in enumerate(freqs[:spec.etalon_sheets]):
+        ws = wb.create_sheet(f"{f:.4f}")
+        ws.append(["№", "Категорія", "Значення"])
+        for n, (cat, val) in enumerate([("Призначення", f"призн {i}"), ("Склад кореспондентів", f"кор {i}"),
+                                        ("Вид передачі", "ЧМ"), ("Район функціонування", "р-н"),
+                                        ("Позивні", "ОРЕЛ, БАЗА")], start=1):
+            ws.append([n, cat, val])
+    wb.save(path)
+    return freqs
+
+
+def write_report(path: Path, spec: DatasetSpec, freqs: np.ndarray) -> None:
+    """Вивантаження перехоплень на spec.rows рядків: реальні частоти, маски, ключі в тексті, невідомі маски."""
+    rng = np.random.default_rng(spec.seed + 1)
+    n = spec.rows
+    net = rng.integers(len(freqs), size=n)
+    kind = rng.integers(10, size=n)          # 0 — маска, 1 — без частоти (ключ у тексті), 2 — невідома маска
+    days = rng.integers(1, 3, size=n)
+    hours = rng.integers(0, 24, size=n)
+    minutes = rng.integers(0, 60, size=n)
+    callers = rng.integers(len(CALLERS), size=n)
+    receivers = rng.integers(len(RECEIVERS), size=n)
+    comments = rng.integers(len(COMMENTS), size=n)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("report")
+    ws.append(["Дата", "Час", "Частота", "хто", "кому", "р\\обмін", "примітки"])
+    for k in range(n):
+        i = int(net[k])
+        if kind[k] == 0 and i % 3 == 0:
+            freq = f"{100 + i / 1000:.3f}"
+        elif kind[k] == 1 and i % 7 == 0:
+            freq = None
+        elif kind[k] == 2:
+            freq = UNKNOWN_MASK
+        else:
+            freq = f"{freqs[i]:.4f}"
+        text = f"КЛЮЧ{i}\nтекст {k}" if freq is None else f"2025-10-0{days[k]} {hours[k]:02d}:00\nтекст {k}"
+        ws.append([f"{days[k]:02d}.10.2025", f"{hours[k]:02d}:{minutes[k]:02d}", freq,
+                   CALLERS[callers[k]], RECEIVERS[receivers[k]], text, COMMENTS[comments[k]]])
+    wb.save(path)
+
+
+def write_config(path: Path, workdir: Path) -> None:
+    """config.yml репозиторію з шляхами, переведеними на синтетичні файли."""
+    cfg = yaml.safe_load((REPO_ROOT / "config.yml").read_text(encoding="utf-8"))
+    cfg.setdefault("paths", {}).update({
+        "freq_file": str(workdir / "Frequencies_63.xlsx"),
+        "reports_dir": str(workdir / "reports"),
+        "report_mask": "report_*.xlsx",
+        "beamshots_dir": str(workdir / "beams"),
+        "output_dir": "build",
+    })
+    path.write_text(yaml.safe_dump(cfg, allow_unicode=True, sort_keys=False), encoding="utf-8")
+
+
+def make_dataset(workdir: str | Path, spec: DatasetSpec) -> Path:
+    """
+    Генерує набір у workdir (довідник, reports/, config.yml) і повертає шлях до config.yml.
+    Якщо набір з тим самим spec вже є — повторно не генерується (1M рядків пишуться хвилини).
+    """
+    workdir = Path(workdir).resolve()
+    marker = workdir / "dataset.json"
+    config = workdir / "config.yml"
+    if marker.exists() and config.exists() and json.loads(marker.read_text()) == asdict(spec):
+        return config
+
+    (workdir / "reports").mkdir(parents=True, exist_ok=True)
+    log.info("Бенчмарк: генерую набір %s у %s", spec, workdir)
+    freqs = write_reference(workdir / "Frequencies_63.xlsx", spec)
+    write_report(workdir / "reports" / REPORT_NAME, spec, freqs)
+    write_config(config, workdir)
+    marker.write_text(json.dumps(asdict(spec)))
+    return config
@@ -3,15 +3,11 @@ import argparse
 import logging
 from pathlib import Path  # ⚡
 from glob import glob
-from src.activefrequencies.report import build_active_frequencies_docx
-from src.armorkit.data_loader import load_inputs
-from src.armorkit.normalize_freq import normalize_frequency_column
+# Тут лише легкі модулі: pandas, python-docx і генератори звітів імпортуються
+# всередині гілок режимів — peleng-gui/read не платять за те, чим не користуються.
+from src.armorkit.instrument import enable_profiling, stage
 # from src.reportgen.export_xlsx import save_df_xlsx
 
-from src.reportgen.grouping import unique_frequencies_with_counts, group_frequencies_by_tag
-from src.reportgen.settings import load_config
-from src.reportgen.export.word_report import build_draft_docx
-
 def parse_args():
     ap = argparse.ArgumentParser(description="Report generator")
     
@@ -34,22 +30,91 @@ def main():
     ap.add_argument("--config", default="config.yml", help="Шлях до YAML-конфіга")
     ap.add_argument(
         "--mode",
-        choices=["read", "normalize", "freq-groups", "draft-docx", "run", "active-freqs", "peleng-gui", "artyleria-report", "eralonky", "enemies"],
+        choices=["read", "normalize", "freq-groups", "draft-docx", "run", "watch", "active-freqs", "peleng-gui", "artyleria-report", "eralonky", "enemies"],
         default="read",
         help="read=зчитати; normalize=нормалізувати 'Частота' і зберегти XLSX; "
-             "freq-groups=вивести групи частот; draft-docx=згенерувати DOCX-чернетку; run=повний конвеєр; active-freqs=звіт 'Активні мережі'",
+             "freq-groups=вивести групи частот; draft-docx=згенерувати DOCX-чернетку; run=повний конвеєр; "
+             "watch=стежити за новими report_*.xlsx і перебудовувати змінені звіти; active-freqs=звіт 'Активні мережі'",
     )
     ap.add_argument("--log-level", default="INFO", help="DEBUG, INFO, WARNING, ERROR")
+    ap.add_argument("--reports", nargs="+", default=None,
+                    choices=["draft-docx", "active-freqs", "artyleria-report", "eralonky", "enemies"],
+                    help="run/watch: які звіти будувати (за замовчуванням — усі)")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="run: кількість процесів для паралельного рендеру (1 = послідовно)")
+    ap.add_argument("--section-workers", type=int, default=None,
+                    help="draft-docx: рендер секцій частот у N процесах (для великих звітів)")
+    ap.add_argument("--from", dest="window_from", default=None,
+                    help="вікно часу: початок (2025-10-01T12-00 / '01.10.2025 12:00' / 01.10.2025); "
+                         "звіт будується з усіх report_*.xlsx, що перетинають вікно")
+    ap.add_argument("--to", dest="window_to", default=None,
+                    help="вікно часу: кінець (формати як у --from)")
+    ap.add_argument("--interval", type=float, default=60.0,
+                    help="watch: період опитування каталогу звітів, с")
+    ap.add_argument("--stream", action="store_true",
+                    help="freq-groups: читати звіт перехоплень потоково, шматками (великі файли)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="не використовувати дисковий кеш розпарсених XLSX (читати файли заново)")
+    ap.add_argument("--purge-cache", action="store_true",
+                    help="очистити дисковий кеш розпарсених XLSX перед запуском")
+    ap.add_argument("--profile", nargs="?", const="mem", default=None, choices=["mem", "time"],
+                    help="заміряти етапи і вивести таблицю: mem (за замовчуванням) — час і пік пам'яті "
+                         "(tracemalloc, помітно сповільнює роботу); time — лише час")
+    ap.add_argument("--profile-json", default=None,
+                    help="з --profile: записати JSON-трейс усіх подій (зокрема секцій по частотах)")
     args = ap.parse_args()
+    if args.stream and (args.window_from or args.window_to):
+        # потоково читається лише найсвіжіший звіт; вікно (кілька файлів + дедуплікація) — без --stream
+        ap.error("--stream не поєднується з --from/--to")
 
     logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO),
                         format="%(levelname)s: %(message)s")
 
+    if not args.profile:
+        run_mode(args)
+        return
+    profiler = enable_profiling(memory=args.profile == "mem")
+    try:
+        with stage(f"mode:{args.mode}"):
+            run_mode(args)
+    finally:
+        profiler.disable()
+        print("\n=== ПРОФІЛЬ ЕТАПІВ ===")
+        print(profiler.table())
+        if args.profile_json:
+            print(f"OK: трейс профілю → {profiler.write_trace(args.profile_json)}")
+
+
+def run_mode(args):
+
+    if args.no_cache or args.purge_cache:
+        from src.armorkit.frame_cache import configure_frame_cache
+        configure_frame_cache(enabled=not args.no_cache)
+    if args.purge_cache:
+        from src.armorkit.data_loader import cache_for_config
+        from src.reportgen.settings import load_config
+        removed = cache_for_config(load_config(args.config)).purge()
+        print(f"OK: кеш очищено ({removed} файлів)")
+
+    window = None
+    if args.window_from or args.window_to:
+        from src.armorkit.dates import parse_window_bound
+        window = (parse_window_bound(args.window_from) if args.window_from else None,
+                  parse_window_bound(args.window_to) if args.window_to else None)
+
+    def _prepared():
+        # для вікна — спільний стан з кількох звітів; інакше генератор готує дані сам
+        from src.reportgen.report_pipeline import prepare_inputs
+        return prepare_inputs(args.config, window) if window else None
+
     if args.mode == "read":
-        li = load_inputs(args.config)
+        from src.armorkit.data_loader import load_inputs, load_window
+        li = load_window(args.config, *window) if window else load_inputs(args.config)
         print("CONFIG :", li.cfg_path)
         print("FREQ   :", li.freq_path, "| shape:", li.reference_df.shape)
         print("REPORT :", li.report_path, "| shape:", li.intercepts_df.shape)
+        if li.period:
+            print("WINDOW :", f"{li.period[0]} — {li.period[1]}", "| files:", len(li.report_paths))
         print("Reference columns:", list(li.reference_df.columns)[:12])
         print("Intercepts columns:", list(li.intercepts_df.columns)[:12])
         return
@@ -63,13 +128,29 @@ def main():
     #     return
 
     if args.mode == "freq-groups":
-        li = load_inputs(args.config)
+        from src.armorkit.data_loader import (
+            load_inputs, load_window, cache_for_config, load_reference, load_latest_report_path, load_report_chunks,
+        )
+        from src.armorkit.domain.reference_index import ReferenceIndex
+        from src.armorkit.normalize_freq import normalize_frequency_column, normalize_frequency_chunks
+        from src.reportgen.grouping import unique_frequencies_with_counts, group_frequencies_by_tag
+        from src.reportgen.settings import load_config
         cfg = load_config(args.config)
-        normalize_frequency_column(li.intercepts_df, li.reference_df)
-        freqs, counts = unique_frequencies_with_counts(li.intercepts_df)
+        if args.stream:
+            # довідник — як завжди; перехоплення — шматками, без повного DataFrame у пам'яті
+            ref_df = load_reference(cfg.paths.freq_file, cache_for_config(cfg))
+            ref_idx = ReferenceIndex.from_frame(ref_df, cfg.grouping)
+            report = load_latest_report_path(cfg.paths.reports_dir, cfg.paths.report_mask)
+            chunks = normalize_frequency_chunks(load_report_chunks(report, cfg), ref_idx)
+            freqs, counts = unique_frequencies_with_counts(chunks)
+        else:
+            li = load_window(args.config, *window) if window else load_inputs(args.config)
+            ref_idx = ReferenceIndex.from_frame(li.reference_df, cfg.grouping)
+            normalize_frequency_column(li.intercepts_df, ref_idx)
+            freqs, counts = unique_frequencies_with_counts(li.intercepts_df)
         allowed = (cfg.grouping or {}).get("allowed_tags", [])
         other   = (cfg.grouping or {}).get("other_bucket", "Інші радіомережі")
-        groups = group_frequencies_by_tag(freqs, li.reference_df, allowed, other, cfg.grouping)
+        groups = group_frequencies_by_tag(freqs, ref_idx, allowed, other, cfg.grouping)
         print("\n=== ГРУПИ РАДІОМЕРЕЖ ===")
         for bucket, items in groups.items():
             print(f"\n[{bucket}]  ({len(items)})")
@@ -78,16 +159,28 @@ def main():
         return
 
     if args.mode == "draft-docx":
-        path = build_draft_docx(args.config)
+        from src.reportgen.export.word_report import build_draft_docx
+        path = build_draft_docx(args.config, prepared=_prepared(), section_workers=args.section_workers)
         print(f"OK: DOCX збережено → {path}")
         return
 
+    if args.mode == "watch":
+        from src.reportgen.watch import ReportWatcher
+        ReportWatcher(args.config, reports=args.reports, window=window,
+                      section_workers=args.section_workers).run(args.interval)
+        return
+
     if args.mode == "run":
-        print("Full pipeline will be implemented next.")
+        from src.reportgen.report_pipeline import run_pipeline
+        results = run_pipeline(args.config, reports=args.reports, workers=args.workers,
+                               section_workers=args.section_workers, window=window)
+        for name, path in results.items():
+            print(f"OK: {name} → {path}")
         return
     
     elif args.mode == "active-freqs":
-        path = build_active_frequencies_docx(args.config)
+        from src.activefrequencies.report import build_active_frequencies_docx
+        path = build_active_frequencies_docx(args.config, prepared=_prepared())
         print(f"OK: DOCX збережено → {path}")
         
         
@@ -101,17 +194,17 @@ def main():
     
     elif args.mode == "artyleria-report":
         from src.artyleria.runner import run as arty_run
-        arty_run()
+        arty_run(prepared=_prepared())
         return
     
     elif args.mode == "eralonky":
         from src.etalonky.runner import run as eralonky_run
-        eralonky_run()
+        eralonky_run(prepared=_prepared())
         return
     
     elif args.mode == "enemies":
         from src.enemies.generate_enemies_report import main as enemies_main
-        enemies_main()
+        enemies_main(prepared=_prepared())
         return
 
 
@@ -1,25 +1,39 @@
 # src/reportgen/data_loader.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+import os
 
 import pandas as pd
 
 from ..reportgen.settings import load_config, Config
-from ..reportgen.io_utils import read_excel, find_latest
+from ..reportgen.io_utils import read_excel, find_latest, iter_excel_chunks, intercept_columns, STREAM_CHUNK_ROWS
+from .xlsxutils.workbook import open_workbook
+from .frame_cache import FrameCache, frame_cache
+from .dates import parse_period_bounds, format_period_bound, add_datetime_column
+from .instrument import timed
 
+log = logging.getLogger(__name__)
 
 
 __all__ = [
     "LoadedInputs",
     "load_inputs",
+    "cache_for_config",
     "load_reference",
     "load_latest_report_path",
     "load_report",
+    "load_report_chunks",
     "load_tables",
     "combine_tables",
+    "select_reports_in_window",
+    "dedup_intercepts",
+    "load_window",
 ]
 
 
@@ -34,7 +48,22 @@ class LoadedInputs:
     freq_path: str
     report_path: str
     reference_df: pd.DataFrame
-    intercepts_df: pd.DataFrame
+    intercepts_df: pd.DataFrame      # + колонка dates.DT_COL (Дата/Час -> datetime64)
+    # вікно з кількох звітів: усі файли і об'єднаний період ('ДД.ММ.РРРР ГГ:ХХ');
+    # для одного звіту період береться з назви report_path
+    report_paths: List[str] = field(default_factory=list)
+    period: Optional[Tuple[str, str]] = None
+
+
+def cache_for_config(cfg: Config) -> FrameCache:
+    """Дисковий кеш розпарсених XLSX: paths.cache_dir або <output_dir>/.cache."""
+    return frame_cache(cfg.paths.cache_dir or Path(cfg.paths.output_dir) / ".cache")
+
+
+def _with_datetime(df: pd.DataFrame, cfg: Config) -> pd.DataFrame:
+    """Один векторний прохід Дата/Час -> dates.DT_COL (сортування/періоди далі — по колонці)."""
+    cols = intercept_columns(cfg.columns)
+    return add_datetime_column(df, cols["date"], cols["time"])
 
 
 def _read_excel_first_sheet(path: str) -> pd.DataFrame:
@@ -63,13 +92,18 @@ def load_inputs(config_path: str = "config.yml") -> LoadedInputs:
 # Основні функції читання
 # =========================
 
-def load_reference(freq_path: str | Path) -> pd.DataFrame:
+def load_reference(freq_path: str | Path, cache: FrameCache | None = None) -> pd.DataFrame:
     """
     Зчитує довідник радіомереж (XLSX).
     Повертає raw DataFrame без нормалізації/мапінгу колонок.
+    Якщо файл не змінювався — береться з дискового кешу (FrameCache).
     """
     path = Path(freq_path)
-    df = read_excel(path)  # engine='openpyxl' всередині io_utils.read_excel
+    if not path.exists():
+        raise FileNotFoundError(f"Excel file not found: {path}")
+    # головний (перший) аркуш — через спільну книгу, яку далі читають і еталонні вкладки
+    cache = cache or frame_cache()
+    df = cache.load(path, lambda p: open_workbook(p).sheet(0), kind="reference")
     if df.empty:
         raise ValueError(f"Reference (frequencies) file is empty: {path}")
     return df
@@ -82,18 +116,34 @@ def load_latest_report_path(reports_dir: str | Path, mask: str = "report_*.xlsx"
     return find_latest(str(reports_dir), mask)
 
 
-def load_report(report_path: str | Path) -> pd.DataFrame:
+def load_report(report_path: str | Path, cache: FrameCache | None = None) -> pd.DataFrame:
     """
     Зчитує файл перехоплень (XLSX).
     Повертає raw DataFrame без нормалізації/мапінгу колонок.
+    Якщо файл не змінювався — береться з дискового кешу (FrameCache).
     """
     path = Path(report_path)
-    df = read_excel(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Excel file not found: {path}")
+    cache = cache or frame_cache()
+    df = cache.load(path, read_excel, kind="report")
     if df.empty:
         raise ValueError(f"Intercepts report is empty: {path}")
     return df
 
 
+def load_report_chunks(report_path: str | Path, cfg: Config | None = None,
+                       chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Потокове читання файлу перехоплень: типізовані шматки лише з колонок
+    columns.intercepts (config.yml). Для багатоденних вивантажень, які не
+    поміщаються в пам'ять цілком; дисковий кеш тут не застосовується.
+    """
+    columns = intercept_columns(cfg.columns if cfg is not None else None)
+    return iter_excel_chunks(report_path, columns, chunk_rows)
+
+
+@timed()
 def load_inputs(config_path: str = "config.yml") -> LoadedInputs:
     """
     Комплексне зчитування двох джерел:
@@ -106,8 +156,9 @@ def load_inputs(config_path: str = "config.yml") -> LoadedInputs:
     freq_path = Path(cfg.paths.freq_file)
     latest_report = load_latest_report_path(cfg.paths.reports_dir, cfg.paths.report_mask)
 
-    reference_df = load_reference(freq_path)
-    intercepts_df = load_report(latest_report)
+    cache = cache_for_config(cfg)
+    reference_df = load_reference(freq_path, cache)
+    intercepts_df = _with_datetime(load_report(latest_report, cache), cfg)
 
     return LoadedInputs(
         cfg_path=str(Path(config_path).resolve()),
@@ -123,28 +174,43 @@ def load_inputs(config_path: str = "config.yml") -> LoadedInputs:
 # (можуть знадобитись для пакетного читання)
 # =========================
 
-def load_tables(paths: List[str]) -> Dict[str, pd.DataFrame]:
+def _load_table(path: Path, cache: FrameCache | None = None) -> pd.DataFrame:
+    if path.suffix.lower() in {".csv"}:
+        df = pd.read_csv(path)
+    elif path.suffix.lower() == ".xlsx":
+        # XLSX — через дисковий кеш, якщо переданий (перетин вікон читає ті самі файли)
+        df = cache.load(path, read_excel, kind="report") if cache is not None else read_excel(path)
+    elif path.suffix.lower() == ".xls":
+        df = pd.read_excel(path)
+    else:
+        raise ValueError(f"Unsupported file type: {path.suffix}")
+
+    # Додаємо ім'я джерела для аудиту
+    df = df.copy()
+    df["__source__"] = path.name
+    return df
+
+
+def load_tables(paths: List[str], workers: int | None = None,
+                cache: FrameCache | None = None) -> Dict[str, pd.DataFrame]:
     """
-    Завантажує CSV/Excel файли за шляхами, повертає dict ім'я->DataFrame.
+    Завантажує CSV/Excel файли за шляхами, повертає dict ім'я->DataFrame (у порядку paths).
     Для CSV використовується pd.read_csv, для XLSX/XLS — pd.read_excel.
+    Кілька файлів читаються паралельно в пулі процесів (парсинг XLSX впирається в CPU);
+    workers=1 — послідовно.
     """
-    result: Dict[str, pd.DataFrame] = {}
-    for p in paths:
-        path = Path(p)
+    files = [Path(p) for p in paths]
+    for path in files:
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
-        if path.suffix.lower() in {".csv"}:
-            df = pd.read_csv(path)
-        elif path.suffix.lower() in {".xlsx", ".xls"}:
-            df = pd.read_excel(path, engine="openpyxl" if path.suffix.lower() == ".xlsx" else None)
-        else:
-            raise ValueError(f"Unsupported file type: {path.suffix}")
 
-        # Додаємо ім'я джерела для аудиту
-        df = df.copy()
-        df["__source__"] = path.name
-        result[path.stem] = df
-    return result
+    workers = workers or min(len(files), os.cpu_count() or 1)
+    if workers <= 1 or len(files) <= 1:
+        frames = [_load_table(p, cache) for p in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_load_table, files, [cache] * len(files)))
+    return {p.stem: df for p, df in zip(files, frames)}
 
 
 def combine_tables(tables: Dict[str, pd.DataFrame]) -> pd.DataFrame:
@@ -153,3 +219,94 @@ def combine_tables(tables: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         raise ValueError("No tables to combine")
     combined = pd.concat(tables.values(), axis=0, ignore_index=True, sort=False)
     return combined
+
+
+# =========================
+# Вікно часу з кількох звітів перехоплень
+# =========================
+
+def select_reports_in_window(reports_dir: str | Path, mask: str,
+                             start: datetime, end: datetime) -> List[Tuple[Path, datetime, datetime]]:
+    """
+    Усі report_*.xlsx, чий період з назви ПЕРЕТИНАЄ [start, end).
+    Повертає (шлях, початок, кінець), відсортовані за початком періоду.
+    Файли без періоду в назві пропускаються.
+    """
+    found = []
+    for p in Path(reports_dir).glob(mask):
+        bounds = parse_period_bounds(p)
+        if bounds is None:
+            log.debug("Вікно: %s без періоду в назві — пропущено.", p.name)
+            continue
+        b_start, b_end = bounds
+        if b_start < end and b_end > start:
+            found.append((p, b_start, b_end))
+    found.sort(key=lambda t: (t[1], t[2], t[0].name))
+    return found
+
+
+def dedup_intercepts(df: pd.DataFrame, columns: Dict[str, str] | None = None) -> pd.DataFrame:
+    """
+    Прибирає перехоплення, що повторюються в кількох вивантаженнях з перекриттям:
+    ключ — (дата, час, частота, хеш тексту). Лишається перший запис
+    (звіти склеюються за зростанням періоду).
+    """
+    cols = intercept_columns({"intercepts": columns} if columns else None)
+    keys = {}
+    for role in ("date", "time", "frequency"):
+        name = cols[role]
+        if name in df.columns:
+            keys[role] = df[name].astype("object").map(lambda v: "" if pd.isna(v) else str(v).strip())
+    msg = cols["message"]
+    if msg in df.columns:
+        text = df[msg].astype("object").map(lambda v: "" if pd.isna(v) else str(v).strip())
+        keys["text"] = pd.util.hash_pandas_object(text, index=False)
+    if not keys:
+        return df
+    dup = pd.DataFrame(keys, index=df.index).duplicated(keep="first")
+    if dup.any():
+        log.info("Вікно: прибрано %d дублікатів перехоплень з перекриття звітів.", int(dup.sum()))
+    return df.loc[~dup].reset_index(drop=True)
+
+
+@timed()
+def load_window(config_path: str = "config.yml",
+                start: datetime | None = None,
+                end: datetime | None = None,
+                workers: int | None = None) -> LoadedInputs:
+    """
+    Як load_inputs, але замість одного найсвіжішого звіту — усі звіти, чий період
+    перетинає [start, end): читаються паралельно, склеюються і дедуплікуються.
+    period у результаті — об'єднаний період вибраних файлів.
+    """
+    cfg = load_config(config_path)
+    start = start or datetime.min
+    end = end or datetime.max
+    selected = select_reports_in_window(cfg.paths.reports_dir, cfg.paths.report_mask, start, end)
+    if not selected:
+        raise FileNotFoundError(
+            f"No reports in {cfg.paths.reports_dir} intersect window {start:%Y-%m-%d %H:%M} — {end:%Y-%m-%d %H:%M}")
+    log.info("Вікно: %d звітів (%s … %s)", len(selected), selected[0][0].name, selected[-1][0].name)
+
+    cache = cache_for_config(cfg)
+    freq_path = Path(cfg.paths.freq_file)
+    reference_df = load_reference(freq_path, cache)
+
+    tables = load_tables([str(p) for p, _, _ in selected], workers=workers, cache=cache)
+    combined = combine_tables(tables).drop(columns="__source__")
+    intercepts_df = dedup_intercepts(combined, (cfg.columns or {}).get("intercepts"))
+    if intercepts_df.empty:
+        raise ValueError(f"Intercepts reports are empty: {[p.name for p, _, _ in selected]}")
+    _with_datetime(intercepts_df, cfg)
+
+    period = (format_period_bound(min(s for _, s, _ in selected)),
+              format_period_bound(max(e for _, _, e in selected)))
+    return LoadedInputs(
+        cfg_path=str(Path(config_path).resolve()),
+        freq_path=str(freq_path.resolve()),
+        report_path=str(selected[-1][0].resolve()),
+        reference_df=reference_df,
+        intercepts_df=intercepts_df,
+        report_paths=[str(p.resolve()) for p, _, _ in selected],
+        period=period,
+    )
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, time, timedelta
 import re
 import pandas as pd
 import pathlib
@@ -15,13 +15,38 @@ _PERIOD_RE = re.compile(
 
 
 def parse_period_from_filename(path: str) -> tuple[str, str]:
+    bounds = parse_period_bounds(path)
+    if bounds is None:
+        return "", ""
+    return format_period_bound(bounds[0]), format_period_bound(bounds[1])
+
+
+def parse_period_bounds(path: str | Path) -> tuple[datetime, datetime] | None:
+    """Період report_<start>_<end>.xlsx як (datetime, datetime) або None."""
     m = _PERIOD_RE.search(Path(path).name)
     if not m:
-        return "", ""
-    def fmt(s: str) -> str:
-        dt = datetime.strptime(s, "%Y-%m-%dT%H-%M")
-        return dt.strftime("%d.%m.%Y %H:%M")
-    return fmt(m.group(1)), fmt(m.group(2))
+        return None
+    return (datetime.strptime(m.group(1), "%Y-%m-%dT%H-%M"),
+            datetime.strptime(m.group(2), "%Y-%m-%dT%H-%M"))
+
+
+def format_period_bound(dt: datetime) -> str:
+    """'ДД.ММ.РРРР ГГ:ХХ' — формат періоду, який чекають генератори звітів."""
+    return dt.strftime("%d.%m.%Y %H:%M")
+
+
+def parse_window_bound(text: str) -> datetime:
+    """
+    Межа вікна з CLI: '2025-10-01T12-00' (як у назві файлу), '01.10.2025 12:00',
+    '2025-10-01 12:00' або лише дата ('01.10.2025' / '2025-10-01' -> 00:00).
+    """
+    s = str(text).strip()
+    for fmt in ("%Y-%m-%dT%H-%M", "%d.%m.%Y %H:%M", "%Y-%m-%d %H:%M", "%d.%m.%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Невідомий формат межі вікна: {text!r}")
 
 
 def combine_date_time(date_val, time_val) -> pd.Timestamp | None:
@@ -37,6 +62,122 @@ def combine_date_time(date_val, time_val) -> pd.Timestamp | None:
         return None
     
     
+# -----------------------
+# Дата/Час перехоплень -> один datetime64 (векторно, раз на завантаження)
+# -----------------------
+# колонка з готовим datetime у intercepts_df (додається при завантаженні)
+DT_COL = "__dt"
+
+# формати дати, які реально трапляються у вивантаженнях (швидкий шлях без вгадування)
+_DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d.%m.%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S")
+_TIME_RE = r"^\s*(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?"
+# запасні формати часу: 'ГГ.ХХ[.СС]' і 'ГГХХ[СС]' без роздільника
+_TIME_ALT_RE = r"^\s*(?:(\d{1,2})\.(\d{2})(?:\.(\d{2}))?|(\d{1,2})(\d{2})(\d{2})?)\s*$"
+
+
+def _dates_column(values: pd.Series) -> pd.Series:
+    """Дата -> datetime64 (лише дата, 00:00)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype("datetime64[ns]").dt.normalize()
+    ser = values.astype("object")
+    uniq = pd.Series(pd.unique(ser[ser.notna()]), dtype="object")
+    if uniq.empty:
+        # порожній lookup pandas зводить до float64 — і map далі не приводиться до datetime
+        return pd.Series(pd.NaT, index=ser.index, dtype="datetime64[ns]")
+    out = pd.Series(pd.NaT, index=uniq.index, dtype="datetime64[ns]")
+
+    is_dt = uniq.map(lambda v: isinstance(v, datetime)).astype(bool)
+    if is_dt.any():
+        out[is_dt] = pd.to_datetime(uniq[is_dt].tolist()).astype("datetime64[ns]")
+    text = uniq[~is_dt].astype(str).str.strip()
+    todo = ~is_dt
+    for fmt in _DATE_FORMATS:
+        if not todo.any():
+            break
+        parsed = pd.to_datetime(text.reindex(uniq.index)[todo], format=fmt, errors="coerce")
+        hit = parsed.notna()
+        out[parsed.index[hit]] = parsed[hit].astype("datetime64[ns]")
+        todo = todo & out.isna()
+    if todo.any():
+        # «брудні» значення — повільний, але терпимий шлях (лише унікальні)
+        rest = pd.to_datetime(text.reindex(uniq.index)[todo], dayfirst=True, errors="coerce", format="mixed")
+        out[rest.index] = rest.astype("datetime64[ns]")
+
+    lookup = pd.Series(out.dt.normalize().to_numpy(), index=pd.Index(uniq, dtype="object"))
+    return ser.map(lookup).astype("datetime64[ns]")
+
+
+def parse_time_column(values: pd.Series) -> pd.Series:
+    """
+    Час доби -> timedelta64; порожні й нерозпізнані значення -> NaT.
+    'ГГ:ХХ[:СС]', далі запасні 'ГГ.ХХ', 'ГГХХ' і pd.to_datetime(format="mixed") ('12:05 PM').
+    """
+    if pd.api.types.is_timedelta64_dtype(values):
+        return values.astype("timedelta64[ns]")
+    ser = values.astype("object")
+
+    def _as_text(v):
+        if isinstance(v, datetime):
+            v = v.time()
+        if isinstance(v, time):
+            return f"{v.hour:02d}:{v.minute:02d}:{v.second:02d}"
+        if isinstance(v, timedelta):
+            secs = int(v.total_seconds())
+            return f"{secs // 3600:02d}:{secs % 3600 // 60:02d}:{secs % 60:02d}"
+        return None if pd.isna(v) else str(v)
+
+    uniq = pd.Series(pd.unique(ser[ser.notna()]), dtype="object")
+    if uniq.empty:
+        return pd.Series(pd.NaT, index=ser.index, dtype="timedelta64[ns]")
+    text = uniq.map(_as_text)
+    parts = text.str.extract(_TIME_RE).astype("float64")
+    todo = parts[0].isna()
+    if todo.any():
+        alt = text[todo].str.extract(_TIME_ALT_RE).astype("float64")
+        for k in range(3):
+            parts.loc[todo, k] = alt[k].fillna(alt[k + 3])
+        # «брудні» значення — повільний, але терпимий шлях (лише унікальні); голі цифри тут не вгадуємо
+        for i in parts.index[parts[0].isna()]:
+            t = str(text[i]).strip()
+            ts = pd.NaT if t.isdigit() else pd.to_datetime(t, format="mixed", errors="coerce")
+            if pd.notna(ts):
+                parts.loc[i] = [ts.hour, ts.minute, ts.second]
+    ok = (parts[0] < 24) & (parts[1] < 60) & (parts[2].fillna(0) < 60)
+    secs = (parts[0] * 3600 + parts[1] * 60 + parts[2].fillna(0)).where(ok)
+    lookup = pd.Series(pd.to_timedelta(secs, unit="s").to_numpy(), index=pd.Index(uniq, dtype="object"))
+    return ser.map(lookup).astype("timedelta64[ns]")
+
+
+def _times_column(values: pd.Series) -> pd.Series:
+    """Час доби -> timedelta64: порожньо -> 0 (як '00:00' у combine_date_time), нерозпізнане -> NaT."""
+    td = parse_time_column(values)
+    ser = values.astype("object")
+    blank = ser.isna() | ser.map(lambda v: isinstance(v, str) and not v.strip()).astype(bool)
+    return td.mask(blank.to_numpy(), pd.Timedelta(0))
+
+
+def parse_datetime_columns(dates: pd.Series, times: pd.Series | None = None) -> pd.Series:
+    """
+    Пара колонок Дата/Час -> один datetime64[ns] за один векторний прохід.
+      - Дата: datetime64 / datetime-об'єкти / рядки (ДД.ММ.РРРР, РРРР-ММ-ДД, ...),
+        невідомі формати — через pd.to_datetime(dayfirst=True);
+      - Час: timedelta64 / time / 'ГГ:ХХ' / 'ГГ:ХХ:СС' (запасні формати — parse_time_column);
+        порожній — 00:00, нерозпізнаний — NaT.
+    Кожне унікальне значення розбирається один раз. Без дати -> NaT.
+    """
+    dt = _dates_column(dates)
+    if times is not None:
+        dt = dt + _times_column(times).to_numpy()
+    return dt
+
+
+def add_datetime_column(df: pd.DataFrame, date_col: str = "Дата", time_col: str = "Час") -> pd.DataFrame:
+    """Додає DT_COL (datetime64) до перехоплень, якщо є колонка дати. Змінює df на місці."""
+    if date_col in df.columns:
+        df[DT_COL] = parse_datetime_columns(df[date_col], df[time_col] if time_col in df.columns else None)
+    return df
+
+
 def format_for_filename(dt_obj) -> str:
         """
         Приймає або datetime, або рядок дати/часу і повертає
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+import logging
+import os
+import pickle
+
+from .merge import Fragment, fragment_size
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+class FragmentCache:
+    """
+    Кеш відрендерених XML-фрагментів (merge.Fragment) за ключем-хешем вхідних даних.
+    Обмежений сумарним розміром; при переповненні викидаються найдавніше використані (LRU).
+    path — файл для збереження між запусками (None — лише в пам'яті);
+    version — змінюється разом із логікою рендеру: збережені записи іншої версії ігноруються.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, path: str | Path | None = None, version: int = 0):
+        self.max_bytes = max_bytes
+        self.path = Path(path) if path else None
+        self.version = version
+        self._items: OrderedDict[str, Fragment] = OrderedDict()
+        self._bytes = 0
+        self._dirty = False
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Fragment | None:
+        frag = self._items.get(key)
+        if frag is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return frag
+
+    def put(self, key: str, fragment: Fragment) -> None:
+        size = fragment_size(fragment)
+        if size > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= fragment_size(old)
+        self._items[key] = fragment
+        self._bytes += size
+        self._dirty = True
+        while self._bytes > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self._bytes -= fragment_size(evicted)
+            self.evictions += 1
+
+    # ---------- статистика ----------
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        return (f"влучань {self.hits}, промахів {self.misses} ({rate:.0f}% з кешу), "
+                f"витіснено {self.evictions}; записів {len(self)}, {self._bytes / (1 << 20):.1f} МБ")
+
+    # ---------- диск ----------
+    @classmethod
+    def load(cls, path: str | Path, max_bytes: int = DEFAULT_MAX_BYTES, version: int = 0) -> "FragmentCache":
+        """Кеш з файлу (порожній, якщо файлу немає, він пошкоджений або іншої версії)."""
+        cache = cls(max_bytes, path, version)
+        try:
+            with open(path, "rb") as f:
+                saved_version, items = pickle.load(f)
+        except FileNotFoundError:
+            return cache
+        except Exception as e:
+            log.warning("Кеш фрагментів пошкоджено (%s): %s — починаємо з порожнього.", path, e)
+            return cache
+        if saved_version != version:
+            return cache
+        for key, frag in items:
+            cache.put(key, frag)
+        cache._dirty = False
+        cache.reset_stats()
+        return cache
+
+    def save(self) -> None:
+        """Записує кеш на диск (атомарно), якщо з моменту завантаження були зміни."""
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((self.version, list(self._items.items())), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._dirty = False
@@ -0,0 +1,50 @@
+from typing import Tuple
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from lxml import etree
+
+# -----------------------
+# Перенесення вмісту body між документами (XML-фрагментами)
+# -----------------------
+# Фрагмент — кортеж серіалізованих елементів body (без <w:sectPr>), кожен зі своїми
+# оголошеннями просторів імен. При вклеюванні кожен елемент парситься як окремий корінь:
+# переносити дітей з чужого кореня в lxml у рази повільніше (перепідв'язка ns по всьому піддереву).
+# Закладки/внутрішні гіперпосилання (w:bookmarkStart, w:hyperlink w:anchor) живуть у
+# body і переносяться як є. Частини зі зв'язками (r:id — картинки, зовнішні лінки)
+# не підтримуються: їхні rId не існують у цільовому документі.
+
+Fragment = Tuple[bytes, ...]
+
+
+def body_length(doc: Document) -> int:
+    """Кількість елементів body без sectPr — звідси почнеться те, що буде додано далі."""
+    body = doc.element.body
+    n = len(body)
+    return n - 1 if n and body[-1].tag == qn("w:sectPr") else n
+
+
+def body_fragment_xml(doc: Document, start: int = 0) -> Fragment:
+    """
+    Серіалізує вміст body документа (без sectPr) у XML-фрагмент; start — з якого елемента
+    (body_length до рендеру: так кілька секцій одного документа ріжуться на окремі фрагменти).
+    """
+    sect_tag = qn("w:sectPr")
+    return tuple(etree.tostring(child) for child in doc.element.body[start:] if child.tag != sect_tag)
+
+
+def fragment_size(fragment: Fragment) -> int:
+    return sum(len(x) for x in fragment)
+
+
+def splice_body_xml(doc: Document, fragment: Fragment) -> None:
+    """Вклеює XML-фрагмент у кінець body документа (перед sectPr)."""
+    body = doc.element.body
+    sect = body.find(qn("w:sectPr"))
+    for xml in fragment:
+        child = parse_xml(xml)
+        if sect is not None:
+            sect.addprevious(child)
+        else:
+            body.append(child)
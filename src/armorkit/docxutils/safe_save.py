@@ -4,6 +4,8 @@ import re
 from datetime import datetime
 from typing import Callable
 
+from ..instrument import timed
+
 def next_available_path(p: Path, reason_suffix: str = "") -> Path:
     """
     Якщо p зайнятий/недоступний, повертає новий шлях:
@@ -21,6 +23,7 @@ def next_available_path(p: Path, reason_suffix: str = "") -> Path:
         i += 1
     return candidate
 
+@timed()
 def safe_save_docx(doc, path: str | Path) -> Path:
     """
     Пробує зберегти DOCX. Якщо файл відкритий користувачем (PermissionError),
@@ -1,8 +1,16 @@
 import logging
+import re
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
 from docx import Document   
 from docx.shared import Inches, Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_ROW_HEIGHT, WD_ALIGN_VERTICAL
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.table import Table
 
 
 def set_col_widths(table, factors):
@@ -22,4 +30,157 @@ def vcenter(cell):
 
 def set_row_min_height(row, cm: float = 0.9):
     row.height = Cm(cm)
-    row.height_rule = WD_ROW_HEIGHT.AT_LEAST
\ No newline at end of file
+    row.height_rule = WD_ROW_HEIGHT.AT_LEAST
+
+
+# -----------------------
+# Швидкі таблиці: увесь w:tbl збирається одним XML-рядком і парситься ОДИН раз
+# -----------------------
+# add_row()/cell.text/center_cell/set_col_widths створюють lxml-елементи по одному
+# і обходять усі рядки на кожну колонку — на тисячах перехоплень це домінує у часі
+# рендеру. Тут таблиця описується даними: специфікація колонок + кортежі рядків.
+
+_JC = {"center": "center", "left": "left", "right": "right"}
+# керуючі символи, недопустимі в XML (\t, \n, \r обробляються окремо)
+_BAD_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_LINE_SPLIT = re.compile(r"\r\n|\r|\n")
+
+
+@dataclass(frozen=True)
+class Col:
+    """Колонка: відносна ширина (як у set_col_widths), вирівнювання, жирність."""
+    width: float = 1.0
+    align: str | None = None      # "center" | "left" | "right" | None (як у стилі)
+    vcenter: bool = False
+    bold: bool = False
+
+
+@dataclass(frozen=True)
+class Cell:
+    """
+    Комірка з особливим оформленням. Поля None беруться зі специфікації колонки.
+    span   — скільки колонок займає (злиття по горизонталі, w:gridSpan)
+    anchor — внутрішнє посилання на закладку (як add_internal_link)
+    """
+    text: str = ""
+    span: int = 1
+    bold: bool | None = None
+    italic: bool = False
+    align: str | None = None
+    vcenter: bool | None = None
+    anchor: str | None = None
+
+
+def _text_xml(line: str) -> str:
+    """Вміст run для одного рядка: w:t (+ w:tab замість табуляцій)."""
+    parts = []
+    for i, chunk in enumerate(line.split("\t")):
+        if i:
+            parts.append("<w:tab/>")
+        if chunk:
+            space = ' xml:space="preserve"' if chunk != chunk.strip() else ""
+            parts.append(f"<w:t{space}>{escape(chunk)}</w:t>")
+    return "".join(parts)
+
+
+def _cell_xml(cell: Cell, col: Col, width_tw: int, split_lines: bool) -> str:
+    align = cell.align if cell.align is not None else col.align
+    vcenter_ = cell.vcenter if cell.vcenter is not None else col.vcenter
+    bold = cell.bold if cell.bold is not None else col.bold
+
+    tcpr = f'<w:tcW w:type="dxa" w:w="{width_tw}"/>'
+    if cell.span > 1:
+        tcpr += f'<w:gridSpan w:val="{cell.span}"/>'
+    if vcenter_:
+        tcpr += '<w:vAlign w:val="center"/>'
+
+    ppr = f'<w:pPr><w:jc w:val="{_JC[align]}"/></w:pPr>' if align else ""
+    rpr = ""
+    if bold or cell.italic or cell.anchor:
+        rpr = "<w:rPr>" + ("<w:b/>" if bold else "") + ("<w:i/>" if cell.italic else "")
+        if cell.anchor:
+            # без синього кольору/підкреслення — як у add_internal_link
+            rpr += '<w:color w:val="000000"/><w:u w:val="none"/>'
+        rpr += "</w:rPr>"
+
+    text = _BAD_XML_CHARS.sub("", "" if cell.text is None else str(cell.text))
+    lines = _LINE_SPLIT.split(text)
+    if split_lines:
+        # кожен рядок — окремий абзац (як cell.add_paragraph у pelengreport)
+        paras = [f"<w:p>{ppr}{f'<w:r>{rpr}{_text_xml(ln)}</w:r>' if ln else ''}</w:p>" for ln in lines]
+    else:
+        # переноси — w:br в одному run (як cell.text = "...\n...")
+        run = f"<w:r>{rpr}{'<w:br/>'.join(_text_xml(ln) for ln in lines)}</w:r>" if text else ""
+        if cell.anchor:
+            run = f"<w:hyperlink w:anchor={quoteattr(cell.anchor)}>{run}</w:hyperlink>"
+        paras = [f"<w:p>{ppr}{run}</w:p>"]
+    return f"<w:tc><w:tcPr>{tcpr}</w:tcPr>{''.join(paras)}</w:tc>"
+
+
+def add_xml_table(doc: Document,
+                  columns: Sequence[Col],
+                  rows: Iterable[Sequence],
+                  header: Sequence | None = None,
+                  style: str | None = "Table Grid",
+                  row_height_cm: float | None = None,
+                  split_lines: bool = False,
+                  total_inches: float = 6.5) -> Table:
+    """
+    Додає таблицю в кінець документа одним проходом.
+      columns — специфікація колонок (ширини — відносні частки від total_inches)
+      rows    — кортежі значень; елемент — str (оформлення з колонки) або Cell
+      header  — рядок заголовка; за замовчуванням по центру (гор./верт.)
+      row_height_cm — мінімальна висота КОЖНОГО рядка (як set_row_min_height)
+      split_lines   — '\\n' у тексті дає окремі абзаци замість w:br
+    Повертає docx Table (для подальших точкових правок, якщо треба).
+    """
+    total = sum(c.width for c in columns)
+    widths = [Inches(total_inches * c.width / total).twips for c in columns]
+    n_cols = len(columns)
+
+    trpr = ""
+    if row_height_cm is not None:
+        trpr = f'<w:trPr><w:trHeight w:val="{Cm(row_height_cm).twips}" w:hRule="atLeast"/></w:trPr>'
+
+    def row_xml(values: Sequence, defaults: Cell | None = None) -> str:
+        out, j = [], 0
+        for v in values:
+            if j >= n_cols:
+                raise ValueError(f"Рядок таблиці ширший за {n_cols} колонок: {values!r}")
+            cell = v if isinstance(v, Cell) else Cell(text="" if v is None else str(v))
+            if defaults is not None:
+                cell = Cell(text=cell.text, span=cell.span, italic=cell.italic, anchor=cell.anchor,
+                            bold=cell.bold if cell.bold is not None else defaults.bold,
+                            align=cell.align or defaults.align,
+                            vcenter=cell.vcenter if cell.vcenter is not None else defaults.vcenter)
+            span = max(1, min(cell.span, n_cols - j))
+            out.append(_cell_xml(cell, columns[j], sum(widths[j:j + span]), split_lines))
+            j += span
+        # короткий рядок добиваємо порожніми комірками — сітка має бути повною
+        for k in range(j, n_cols):
+            out.append(_cell_xml(Cell(), columns[k], widths[k], split_lines))
+        return f"<w:tr>{trpr}{''.join(out)}</w:tr>"
+
+    parts = [f"<w:tbl {nsdecls('w')}><w:tblPr>"]
+    if style:
+        parts.append(f'<w:tblStyle w:val="{doc.styles[style].style_id}"/>')
+    parts.append('<w:tblW w:type="auto" w:w="0"/>'
+                 '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+                 'w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>')
+    parts.extend(f'<w:gridCol w:w="{w}"/>' for w in widths)
+    parts.append("</w:tblGrid>")
+    if header is not None:
+        parts.append(row_xml(header, Cell(align="center", vcenter=True)))
+    parts.extend(row_xml(r) for r in rows)
+    parts.append("</w:tbl>")
+
+    # парсимо w:tbl як корінь: перенесення готового кореня в документ — O(1) щодо namespace,
+    # а переміщення дочірніх елементів з обгортки коштує на кожен вузол
+    tbl = parse_xml("".join(parts))
+    body = doc.element.body
+    sect = body.find(qn("w:sectPr"))
+    if sect is not None:
+        sect.addprevious(tbl)
+    else:
+        body.append(tbl)
+    return Table(tbl, doc._body)
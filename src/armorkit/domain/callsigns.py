@@ -1,86 +1,78 @@
 import re
+from typing import Dict, Iterable, List
 import pandas as pd
 from src.armorkit.domain.freqnorm import freq4_str
 
+# колонки з позивними у вивантаженні (зустрічаються в обох регістрах)
+CALLSIGN_COLUMNS = ("хто", "кому", "Хто", "Кому")
+# розділювач позивних у клітинці — кома або крапка з комою
+_SPLIT_RE = r"[;,]"
+# лапки/дужки/тире, які не є частиною позивного
+_STRIP_CHARS_RE = r"[\"'«»\[\]()–—]"
+_IGNORED = {"", "НВ"}
+
+
 def normalize_callsign(s: str) -> str:
-    # верхній регістр, пробіли -> дефіс, прибираємо повторні дефіси
-    x = str(s).strip().upper().replace(" ", "-")
-    while "--" in x:
-        x = x.replace("--", "-")
-    return x
+    # верхній регістр, пробіли -> дефіс, без лапок/дужок, прибираємо повторні дефіси
+    x = str(s).strip().upper()
+    x = x.replace(" ", "-")
+    x = re.sub(_STRIP_CHARS_RE, "", x)
+    return re.sub(r"-{2,}", "-", x)
 
 
-def extract_callsigns_for_freq(df: pd.DataFrame, freq4: str, aliases: dict[str, str] | None) -> list[str]:
+def normalize_callsigns(ser: pd.Series) -> pd.Series:
+    """normalize_callsign для цілої колонки (векторно)."""
+    return (ser.astype(str).str.strip().str.upper()
+               .str.replace(" ", "-", regex=False)
+               .str.replace(_STRIP_CHARS_RE, "", regex=True)
+               .str.replace(r"-{2,}", "-", regex=True))
+
+
+def callsign_table(df: pd.DataFrame, aliases: dict[str, str] | None = None,
+                   columns: Iterable[str] = CALLSIGN_COLUMNS,
+                   freq_col: str = "Частота") -> Dict[str, List[str]]:
     """
-    Збирає унікальні позивні з колонок 'Хто' та 'Кому' для заданої частоти.
-    Розділювач у клітинці — кома або крапка з комою. Ігнорує 'НВ'.
-    Застосовує aliases (cfg.callsign_aliases), якщо задані.
+    Позивні для ВСІХ частот за один прохід: freq4 -> відсортовані унікальні позивні.
+    Клітинки 'хто'/'кому' діляться за , або ; , нормалізуються (normalize_callsign),
+    'НВ' і порожні відкидаються, далі застосовуються aliases (cfg.callsign_aliases).
     """
-    alias = aliases or {}
-    work = df.copy()
-    work["__f4"] = work["Частота"].map(freq4_str)
-    part = work[work["__f4"] == freq4]
-
-    calls: set[str] = set()
-    for col in ("Хто", "Кому"):
-        if col not in part.columns:
-            continue
-        for raw in part[col].dropna().astype(str):
-            # розбиваємо за , або ; 
-            for token in re.split(r"[;,]", raw):
-                t = normalize_callsign(token)
-                if not t or t == "НВ":
-                    continue
-                t = alias.get(t, t)  # виправлення опечаток
-                calls.add(t)
-
-    return sorted(calls)
-
-
-def build_callsign_str_for_freq(df: pd.DataFrame, freq4: str) -> str:
+    cols = [c for c in columns if c in df.columns]
+    if freq_col not in df.columns or not cols:
+        return {}
+
+    freqs = df[freq_col].astype("object")
+    f4 = freqs.map({u: freq4_str(u) for u in pd.unique(freqs.dropna())})
+    tokens = pd.concat(
+        [pd.DataFrame({"f4": f4, "raw": df[c].astype("object")}) for c in cols],
+        ignore_index=True,
+    ).dropna()
+    if tokens.empty:
+        return {}
+
+    tokens["raw"] = tokens["raw"].astype(str).str.split(_SPLIT_RE)
+    tokens = tokens.explode("raw")
+    tokens["call"] = normalize_callsigns(tokens["raw"])
+    tokens = tokens[~tokens["call"].isin(_IGNORED)]
+    if aliases:
+        tokens["call"] = tokens["call"].replace(aliases)  # виправлення опечаток
+
+    uniq = tokens[["f4", "call"]].drop_duplicates().sort_values(["f4", "call"], kind="stable")
+    return {f: list(calls) for f, calls in uniq.groupby("f4", sort=False)["call"]}
+
+
+def format_callsigns(calls: List[str] | None) -> str:
+    """Рядок для звіту: 'А, Б, В' або '—'."""
+    return ", ".join(calls) if calls else "—"
+
+
+def extract_callsigns_for_freq(df: pd.DataFrame, freq4: str, aliases: dict[str, str] | None) -> list[str]:
     """
-    Повертає рядок позивних для заданої частоти:
-    - фільтр по 'Частота' (формат ###.####)
-    - беремо колонки 'хто' та 'кому'
-    - ділимо тільки за комою
-    - UPPERCASE, пробіли -> дефіс
-    - прибираємо 'НВ'
-    - унікалізуємо
+    Унікальні позивні з колонок 'хто'/'кому' для заданої частоти.
+    Для всіх частот одразу — callsign_table.
     """
-    # 1) фільтр по частоті
-    tmp = df.copy()
-    tmp["__f4"] = tmp["Частота"].map(freq4_str)
-    part = tmp[tmp["__f4"] == freq4]
-
-    # 2) збираємо токени з 'хто' і 'кому'
-    items: list[str] = []
-    for col in ("хто", "кому"):
-        if col not in part.columns:
-            continue  # (мінімальний захист)
-        for v in part[col].dropna().astype(str):
-            v = v.strip()
-            if "," in v:
-                items.extend([t.strip() for t in v.split(",") if t.strip()])
-            else:
-                items.append(v)
-
-    # 3) нормалізація + множина
-    norm = []
-    for t in items:
-        t = t.upper().replace(" ", "-")
-        if t and t != "НВ":
-            norm.append(t)
-
-    uniq = sorted(set(norm))
-    # 5) у рядок
-    return ", ".join(uniq) if uniq else "—"
+    return callsign_table(df, aliases).get(freq4, [])
 
 
-def normalize_callsign(s: str) -> str:
-    x = str(s).strip().upper()
-    x = x.replace(" ", "-")
-    for ch in ['"', "'", "«", "»", "[", "]", "(", ")", "–", "—"]:
-        x = x.replace(ch, "")
-    while "--" in x:
-        x = x.replace("--", "-")
-    return x
\ No newline at end of file
+def build_callsign_str_for_freq(df: pd.DataFrame, freq4: str, aliases: dict[str, str] | None = None) -> str:
+    """Рядок позивних для заданої частоти ('—', якщо немає)."""
+    return format_callsigns(extract_callsigns_for_freq(df, freq4, aliases))
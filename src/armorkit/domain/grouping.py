@@ -2,6 +2,7 @@ import pandas as pd
 from typing import Dict, List
 
 from src.armorkit.domain.freqnorm import freq4_str
+from src.armorkit.domain.reference_index import ReferenceIndex, as_reference_index
 
 
 def unique_freq_counts(df: pd.DataFrame) -> Dict[str, int]:
@@ -10,16 +11,17 @@ def unique_freq_counts(df: pd.DataFrame) -> Dict[str, int]:
     return f4.value_counts().sort_index().to_dict()
 
 
-def group_by_tag(freqs: List[str], ref_df: pd.DataFrame, order: List[str]) -> Dict[str, List[str]]:
+def group_by_tag(freqs: List[str], ref: ReferenceIndex | pd.DataFrame, order: List[str]) -> Dict[str, List[str]]:
     """
     Групує частоти за колонкою 'Хто' у довіднику. Ті, що не увійшли в список order — у 'Інші радіомережі'.
     """
+    idx = as_reference_index(ref)
+    has_tag = "Хто" in idx.frame.columns
     tag_map = {}
     for f in freqs:
         # шукаємо у довіднику запис по частоті (точній)
-        row = ref_df.loc[ref_df["Частота"].map(freq4_str) == f]
-        tag = row["Хто"].iloc[0] if not row.empty and "Хто" in row.columns else None
-        tag_map[f] = tag
+        row = idx.row(f)
+        tag_map[f] = row["Хто"] if row is not None and has_tag else None
 
     groups: Dict[str, List[str]] = {k: [] for k in order}
     groups["Інші радіомережі"] = []
@@ -1,6 +1,7 @@
 # src/armorkit/domain/intercepts.py
 from __future__ import annotations
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 import pandas as pd
 
 from pathlib import Path
@@ -8,6 +9,10 @@ from src.armorkit.domain.reference import get_network_name_by_freq, read_referen
 
 from src.armorkit.domain.schema import message_columns
 from src.armorkit.domain.freqnorm import freq4_str
+from src.armorkit.dates import DT_COL, parse_datetime_columns
+
+# значення коментаря, які вважаються порожніми
+_EMPTY_COMMENTS = {"", "nan", "None", "NONE"}
 
 
 def _resolve_comment_col(df: pd.DataFrame, comment_col: Optional[str]) -> str:
@@ -37,12 +42,61 @@ def filter_with_comments(df: pd.DataFrame, comment_col: Optional[str] = None) ->
     return out
 
 
-def network_is_empty(df: pd.DataFrame, freq4: str,
+@dataclass
+class InterceptSlices:
+    """
+    Перехоплення, розбиті ОДИН раз по freq4 (###.####):
+      by_freq   — freq4 -> усі рядки частоти (порядок як у вихідній таблиці)
+      commented — freq4 -> лише рядки з коментарем, відсортовані за '__dt'
+                  (з load_inputs колонка вже є; інакше збирається тут векторно)
+                  (є тільки для частот, де такі рядки існують)
+    """
+    msg_col: Optional[str]
+    cmt_col: Optional[str]
+    by_freq: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    commented: Dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, freq_col: str = "Частота") -> "InterceptSlices":
+        msg_col, cmt_col = message_columns(df)
+        out = cls(msg_col=msg_col, cmt_col=cmt_col)
+
+        work = df.copy()
+        work["__f4"] = work[freq_col].map(freq4_str)
+
+        if cmt_col:
+            cm = work[cmt_col].astype(str).fillna("").str.strip()
+            has_cmt = work[cmt_col].notna() & ~cm.isin(_EMPTY_COMMENTS)
+        else:
+            has_cmt = pd.Series(False, index=work.index)
+
+        commented = work[has_cmt].copy()
+        if DT_COL not in commented.columns and all(c in commented.columns for c in ("Дата", "Час")):
+            commented[DT_COL] = parse_datetime_columns(commented["Дата"], commented["Час"])
+
+        out.by_freq = {f: part for f, part in work.groupby("__f4", sort=False)}
+        for f, part in commented.groupby("__f4", sort=False):
+            if DT_COL in part.columns:
+                part = part.sort_values(DT_COL, kind="stable")
+            out.commented[f] = part
+        return out
+
+    def has_comments(self, freq4: str) -> bool:
+        return freq4 in self.commented
+
+    def rows(self, freq4: str) -> pd.DataFrame | None:
+        return self.by_freq.get(freq4)
+
+
+def network_is_empty(df: pd.DataFrame | InterceptSlices, freq4: str,
                      freq_col: str = "Частота",
                      comment_col: Optional[str] = None) -> bool:
     """
     True, якщо для частоти немає жодного перехоплення з коментарем.
+    Для InterceptSlices — O(1) перевірка без копіювання таблиці.
     """
+    if isinstance(df, InterceptSlices):
+        return not df.has_comments(freq4)
     # нормалізуємо частоту у фреймі до ###.####
     tmp = df.copy()
     tmp["__f4"] = tmp[freq_col].map(freq4_str)
@@ -51,8 +105,8 @@ def network_is_empty(df: pd.DataFrame, freq4: str,
     return with_comments.empty
 
 
-def resolve_network_title(freq4: str, reference_df, ref_xlsx_path: str | Path) -> str:
-    name = get_network_name_by_freq(freq4, reference_df)
+def resolve_network_title(freq4: str, ref_idx, ref_xlsx_path: str | Path) -> str:
+    name = get_network_name_by_freq(freq4, ref_idx)
     if name and str(name).strip() != "—":
         return name
     meta = read_reference_sheet(freq4, ref_xlsx_path)
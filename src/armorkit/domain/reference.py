@@ -4,52 +4,29 @@ from typing import Optional
 import pandas as pd
 from typing import Dict, Any
 
+from src.armorkit.xlsxutils.workbook import WorkbookSheets, as_workbook
+from src.armorkit.domain.reference_index import (
+    ReferenceIndex,
+    as_reference_index,
+)
+
 log = logging.getLogger(__name__)  # => 'armorkit.domain.reference'
 
 # -----------------------
 # Довідник: назва мережі
 # -----------------------
-_NET_NAME_CANDIDATES = [
-    "Назва радіомережі", "Назва мережі", "Радіомережа",
-    "Назва", "Мережа", "Опис", "Призначення"
-]
-
-
-def get_network_name_by_freq(freq4: str, ref_df: pd.DataFrame) -> str:
-    if "Частота" not in ref_df.columns:
-        return "—"
-    df = ref_df.copy()
-    def _f4(x):
-        try: return f"{float(str(x).replace(',', '.')):.4f}"
-        except: return None
-    df["__f4"] = df["Частота"].map(_f4)
-    m = df[df["__f4"] == freq4]
-    if m.empty: return "—"
-    row = m.iloc[0]
-    for c in _NET_NAME_CANDIDATES:
-        if c in row.index and pd.notna(row[c]) and str(row[c]).strip():
-            return str(row[c]).strip()
-    return "—"
+def get_network_name_by_freq(freq4: str, ref: ReferenceIndex | pd.DataFrame) -> str:
+    return as_reference_index(ref).name(freq4)
 
 
 # -----------------------
 # Довідник: повна «Хто» для групи
 # -----------------------
-def full_tag_for_group(freq_list, ref_df: pd.DataFrame, fallback_short: str) -> str:
+def full_tag_for_group(freq_list, ref: ReferenceIndex | pd.DataFrame, fallback_short: str) -> str:
     if not freq_list:
         return fallback_short
-    tmp = ref_df.copy()
-    def _f4(x):
-        try: return f"{float(str(x).replace(',', '.')):.4f}"
-        except: return None
-    tmp["__f4"] = tmp["Частота"].map(_f4)
-    vals = []
-    if "Хто" not in tmp.columns:
-        return fallback_short
-    for f in freq_list:
-        m = tmp[tmp["__f4"] == f]
-        if not m.empty and pd.notna(m.iloc[0]["Хто"]):
-            vals.append(str(m.iloc[0]["Хто"]).strip())
+    idx = as_reference_index(ref)
+    vals = [idx.raw_tags[f] for f in freq_list if f in idx.raw_tags]
     if not vals:
         return fallback_short
     return Counter(vals).most_common(1)[0][0]
@@ -58,25 +35,27 @@ def full_tag_for_group(freq_list, ref_df: pd.DataFrame, fallback_short: str) ->
 # -----------------------
 # Еталонні вкладки: 'Призначення', 'Склад кореспондентів'
 # -----------------------
-def read_reference_sheet(freq4: str, ref_xlsx_path: str) -> dict:
+def read_reference_sheet(freq4: str, ref_xlsx_path: str | WorkbookSheets) -> dict:
     """
     Повертає {'Призначення': str|None, 'Склад кореспондентів': str|None}
     з аркуша, названого freq4 (наприклад '145.9500').
     Очікується таблиця з колонками 'Категорія'/'Значення' (регістро-незалежно).
+    Книга відкривається один раз на запуск (спільний WorkbookSheets).
     """
     result = {"Призначення": None, "Склад кореспондентів": None}
     try:
-        xls = pd.ExcelFile(ref_xlsx_path, engine="openpyxl")
+        book = as_workbook(ref_xlsx_path)
+        sheet_names = book.sheet_names
     except Exception as e:
         log.warning("Не вдалося відкрити довідник '%s': %s", ref_xlsx_path, e)
         return result
 
-    if freq4 not in xls.sheet_names:
+    if freq4 not in sheet_names:
         log.info("Еталонний аркуш для %s не знайдено у файлі довідника.", freq4)
         return result
 
     try:
-        df = pd.read_excel(xls, sheet_name=freq4)
+        df = book.sheet(freq4)
     except Exception as e:
         log.warning("Не вдалося зчитати аркуш '%s': %s", freq4, e)
         return result
@@ -0,0 +1,106 @@
+# src/armorkit/domain/reference_index.py
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+import pandas as pd
+
+from src.armorkit.domain.freqnorm import freq4_str
+from src.armorkit.normalize_freq import MaskIndex
+
+# колонки довідника, з яких береться назва мережі (у порядку пріоритету)
+NET_NAME_CANDIDATES = [
+    "Назва радіомережі", "Назва мережі", "Радіомережа",
+    "Назва", "Мережа", "Опис", "Призначення"
+]
+
+REF_FREQ_COL = "Частота"
+REF_TAG_COL = "Хто"
+
+
+def _network_name(row: pd.Series) -> str:
+    for c in NET_NAME_CANDIDATES:
+        if c in row.index and pd.notna(row[c]) and str(row[c]).strip():
+            return str(row[c]).strip()
+    return "—"
+
+
+def _mask3_of(row: pd.Series) -> str | None:
+    def _norm(val):
+        s = str(val).strip()
+        try: return f"{float(s.replace(',', '.')):.3f}"
+        except Exception: return s
+    for col in ("Маска_3", "Маска_Ш"):
+        if col in row.index and pd.notna(row[col]) and str(row[col]).strip():
+            return _norm(row[col])
+    return None
+
+
+@dataclass
+class ReferenceIndex:
+    """
+    Довідник частот, проіндексований ОДИН раз після завантаження.
+    Усі пошуки по частоті — O(1) dict-lookup без копіювання DataFrame.
+
+      rows       — freq4 -> позиція ПЕРШОГО рядка у frame
+      row_counts — freq4 -> кількість рядків з цією частотою
+      masks      — mask3 -> частота, текст-маска -> частота (MaskIndex)
+      mask3      — freq4 -> маска (Маска_3/Маска_Ш, 3 знаки)
+      names      — freq4 -> назва радіомережі ('—', якщо немає)
+      raw_tags   — freq4 -> «Хто» як у довіднику (лише непорожні)
+      tags       — freq4 -> нормалізована мітка «Хто» (за cfg.grouping)
+    """
+    frame: pd.DataFrame
+    rows: Dict[str, int] = field(default_factory=dict)
+    row_counts: Dict[str, int] = field(default_factory=dict)
+    masks: MaskIndex | None = None
+    mask3: Dict[str, Optional[str]] = field(default_factory=dict)
+    names: Dict[str, str] = field(default_factory=dict)
+    raw_tags: Dict[str, str] = field(default_factory=dict)
+    tags: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, ref_df: pd.DataFrame, cfg_grouping: dict | None = None) -> "ReferenceIndex":
+        # імпорт тут, щоб уникнути циклу armorkit.domain <-> reportgen.grouping
+        from src.reportgen.grouping import tag_normalizer
+
+        idx = cls(frame=ref_df, masks=MaskIndex.from_frame(ref_df))
+        if REF_FREQ_COL not in ref_df.columns:
+            return idx
+
+        f4 = ref_df[REF_FREQ_COL].map(freq4_str)
+        for pos, f in enumerate(f4):
+            if f is None:
+                continue
+            idx.row_counts[f] = idx.row_counts.get(f, 0) + 1
+            idx.rows.setdefault(f, pos)
+
+        has_tags = REF_TAG_COL in ref_df.columns
+        if has_tags:
+            # уся колонка «Хто» — один прохід скомпільованих правил
+            tags_raw = ref_df[REF_TAG_COL]
+            tags_norm = tag_normalizer(cfg_grouping).normalize_series(tags_raw)
+        for f, pos in idx.rows.items():
+            row = ref_df.iloc[pos]
+            idx.names[f] = _network_name(row)
+            idx.mask3[f] = _mask3_of(row)
+            if has_tags:
+                tag_raw = tags_raw.iloc[pos]
+                if pd.notna(tag_raw):
+                    idx.raw_tags[f] = str(tag_raw).strip()
+                idx.tags[f] = tags_norm.iloc[pos]
+        return idx
+
+    def row(self, freq4: str) -> pd.Series | None:
+        """Перший рядок довідника для частоти (або None)."""
+        pos = self.rows.get(freq4)
+        return None if pos is None else self.frame.iloc[pos]
+
+    def name(self, freq4: str) -> str:
+        return self.names.get(freq4, "—")
+
+
+def as_reference_index(ref, cfg_grouping: dict | None = None) -> ReferenceIndex:
+    """Приймає готовий ReferenceIndex або DataFrame довідника (тоді індекс будується тут)."""
+    if isinstance(ref, ReferenceIndex):
+        return ref
+    return ReferenceIndex.from_frame(ref, cfg_grouping)
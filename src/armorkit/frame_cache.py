@@ -0,0 +1,150 @@
+# src/armorkit/frame_cache.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Callable
+import hashlib
+import logging
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# змінюємо, якщо міняється формат/логіка парсингу — старі записи стануть недійсними
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = Path("build") / ".cache"
+
+try:  # Feather (Arrow) — опційно; без pyarrow пишемо pickle
+    import pyarrow  # noqa: F401
+    _HAS_ARROW = True
+except Exception:
+    _HAS_ARROW = False
+
+
+def _file_digest(path: Path, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class FrameCache:
+    """
+    Кеш розпарсених XLSX у двійковому форматі (Feather, або pickle без pyarrow).
+    Ключ: шлях + розмір + mtime + хеш вмісту файлу (+ вид даних).
+    Записи для того самого файлу, але старої версії, видаляються при записі нової.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, enabled: bool = True):
+        self.root = Path(root)
+        self.enabled = enabled
+
+    # ---------- ключі ----------
+    @staticmethod
+    def _path_id(path: Path, kind: str) -> str:
+        return hashlib.sha1(f"{path}|{kind}".encode("utf-8")).hexdigest()[:16]
+
+    def _fingerprint(self, path: Path) -> str:
+        st = path.stat()
+        raw = f"{CACHE_VERSION}|{st.st_size}|{st.st_mtime_ns}|{_file_digest(path)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def _entries(self, path_id: str) -> list[Path]:
+        if not self.root.exists():
+            return []
+        return list(self.root.glob(f"{path_id}-*"))
+
+    # ---------- читання/запис ----------
+    def get(self, path: str | Path, kind: str = "frame", fp: str | None = None) -> pd.DataFrame | None:
+        if not self.enabled:
+            return None
+        p = Path(path).resolve()
+        base = f"{self._path_id(p, kind)}-{fp or self._fingerprint(p)}"
+        for ext, reader in ((".feather", pd.read_feather), (".pkl", pd.read_pickle)):
+            cand = self.root / f"{base}{ext}"
+            if not cand.exists():
+                continue
+            try:
+                df = reader(cand)
+                log.debug("Кеш: %s <- %s", p.name, cand.name)
+                return df
+            except Exception as e:
+                log.warning("Кеш пошкоджено (%s): %s — перечитуємо XLSX.", cand.name, e)
+                cand.unlink(missing_ok=True)
+        return None
+
+    def put(self, path: str | Path, df: pd.DataFrame, kind: str = "frame", fp: str | None = None) -> Path | None:
+        if not self.enabled:
+            return None
+        p = Path(path).resolve()
+        path_id = self._path_id(p, kind)
+        base = f"{path_id}-{fp or self._fingerprint(p)}"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        # прибираємо попередні версії цього ж файлу
+        for old in self._entries(path_id):
+            old.unlink(missing_ok=True)
+
+        out = None
+        if _HAS_ARROW:
+            out = self.root / f"{base}.feather"
+            try:
+                # Feather вимагає рядкові імена колонок і стандартний індекс
+                if df.index.equals(pd.RangeIndex(len(df))) and all(isinstance(c, str) for c in df.columns):
+                    df.to_feather(out)
+                    # лише якщо типи колонок переживають round-trip без змін
+                    if not pd.read_feather(out).dtypes.equals(df.dtypes):
+                        raise TypeError("dtype mismatch after round-trip")
+                else:
+                    out = None
+            except Exception as e:
+                log.debug("Feather недоступний для %s (%s) — пишемо pickle.", p.name, e)
+                out.unlink(missing_ok=True)
+                out = None
+        if out is None:
+            out = self.root / f"{base}.pkl"
+            df.to_pickle(out)
+        return out
+
+    def load(self, path: str | Path, loader: Callable[[Path], pd.DataFrame], kind: str = "frame") -> pd.DataFrame:
+        """Повертає DataFrame з кешу або викликає loader(path) і кешує результат."""
+        p = Path(path)
+        if not self.enabled:
+            return loader(p)
+        fp = self._fingerprint(p.resolve())  # хешуємо файл один раз на get+put
+        hit = self.get(p, kind, fp)
+        if hit is not None:
+            return hit
+        df = loader(p)
+        try:
+            self.put(p, df, kind, fp)
+        except Exception as e:
+            log.warning("Не вдалося записати кеш для %s: %s", p.name, e)
+        return df
+
+    def purge(self) -> int:
+        """Видаляє всі записи кешу. Повертає кількість видалених файлів."""
+        n = 0
+        if self.root.exists():
+            for f in self.root.iterdir():
+                if f.is_file() and f.suffix in (".feather", ".pkl"):
+                    f.unlink(missing_ok=True)
+                    n += 1
+        return n
+
+
+# ---------- глобальні налаштування (керуються з main.py) ----------
+_settings: dict = {"enabled": True, "root": None}
+
+
+def configure_frame_cache(enabled: bool | None = None, root: str | Path | None = None) -> None:
+    """--no-cache вимикає кеш; root перекриває каталог з config.yml."""
+    if enabled is not None:
+        _settings["enabled"] = enabled
+    if root is not None:
+        _settings["root"] = Path(root)
+
+
+def frame_cache(default_root: str | Path | None = None) -> FrameCache:
+    """Кеш з поточними налаштуваннями (каталог: явний -> з конфіга -> build/.cache)."""
+    root = _settings["root"] or (Path(default_root) if default_root else DEFAULT_CACHE_DIR)
+    return FrameCache(root, enabled=_settings["enabled"])
@@ -0,0 +1,92 @@
+# src/armorkit/images.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = (".png",)
+# як часто (с) перевіряти mtime каталогу; між перевірками пошук — лише dict
+RECHECK_SECONDS = 2.0
+
+
+class ImageIndex:
+    """
+    Індекс картинок каталогу (пеленги beamshots_dir, images артилерії): ім'я без розширення -> файл.
+    Каталог читається одним scandir. Які імена пробувати і в якому порядку (4 знаки, запасні
+    3 знаки) — вирішує виклик, як раніше з Path.exists(); індекс лише замінює stat на dict.
+    Перечитується, коли змінився mtime каталогу (додали/видалили файл), а сам mtime
+    перевіряється не частіше за recheck_s — на мережевій шарі пошук для кожної секції без stat.
+    """
+
+    def __init__(self, folder: str | Path, suffixes: Iterable[str] = IMAGE_SUFFIXES,
+                 recheck_s: float = RECHECK_SECONDS):
+        self.folder = Path(folder)
+        self.suffixes = tuple(s.lower() for s in suffixes)
+        self.recheck_s = recheck_s
+        self._mtime: int | None = None
+        self._checked = float("-inf")
+        self._by_stem: Dict[str, Path] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_stem)
+
+    # ---------- сканування ----------
+    def _scan(self) -> None:
+        by_stem: Dict[str, Path] = {}
+        try:
+            with os.scandir(self.folder) as it:
+                entries = [e for e in it if os.path.splitext(e.name)[1].lower() in self.suffixes]
+        except OSError as e:
+            log.debug("Каталог картинок недоступний (%s): %s", self.folder, e)
+            entries = []
+        for e in sorted(entries, key=lambda e: e.name):
+            try:
+                if not e.is_file():
+                    continue
+            except OSError:
+                continue
+            by_stem.setdefault(os.path.splitext(e.name)[0], self.folder / e.name)
+        self._by_stem = by_stem
+        log.debug("Індекс картинок %s: %d файл(ів)", self.folder, len(by_stem))
+
+    def refresh(self, force: bool = False) -> bool:
+        """Перечитує каталог, якщо змінився його mtime (або force). True — якщо перечитано."""
+        now = time.monotonic()
+        if not force and now - self._checked < self.recheck_s:
+            return False
+        self._checked = now
+        try:
+            mtime = self.folder.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if not force and mtime == self._mtime and self._mtime is not None:
+            return False
+        self._mtime = mtime
+        self._scan()
+        return True
+
+    # ---------- пошук ----------
+    def get(self, *stems: str) -> Path | None:
+        """Перший наявний файл серед імен stems (без розширення) — аналог циклу з p.exists()."""
+        self.refresh()
+        for stem in stems:
+            hit = self._by_stem.get(stem)
+            if hit is not None:
+                return hit
+        return None
+
+
+_indexes: Dict[Path, ImageIndex] = {}
+
+
+def image_index(folder: str | Path) -> ImageIndex:
+    """Спільний індекс на каталог (на весь прогін, зокрема між циклами --watch)."""
+    key = Path(folder).absolute()
+    idx = _indexes.get(key)
+    if idx is None:
+        idx = _indexes[key] = ImageIndex(key)
+    return idx
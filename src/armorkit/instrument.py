@@ -0,0 +1,162 @@
+# src/armorkit/instrument.py
+"""
+Легкий профайлер етапів конвеєра: час (perf_counter) і пік пам'яті (tracemalloc).
+За замовчуванням вимкнений — @timed/stage() тоді коштують одну перевірку прапорця.
+Вмикається з main.py (--profile); підсумок — таблиця по етапах і, за бажанням, JSON-трейс
+з кожною подією (зокрема час секції на кожну частоту).
+Примітка: етапи, що виконуються в дочірніх процесах (--section-workers), не записуються.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import json
+import time
+import tracemalloc
+
+
+@dataclass
+class StageEvent:
+    """Один виклик етапу. label — уточнення (напр. частота секції); peak_bytes — None без tracemalloc."""
+    name: str
+    seconds: float
+    depth: int
+    label: Optional[str] = None
+    peak_bytes: Optional[int] = None
+
+
+@dataclass
+class StageStats:
+    name: str
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    peak_bytes: Optional[int] = None
+
+    def add(self, ev: StageEvent) -> None:
+        self.calls += 1
+        self.total += ev.seconds
+        self.max = max(self.max, ev.seconds)
+        if ev.peak_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes or 0, ev.peak_bytes)
+
+
+@dataclass
+class _Frame:
+    start_bytes: int = 0
+    peak_abs: int = 0
+
+
+@dataclass
+class Profiler:
+    enabled: bool = False
+    memory: bool = False
+    events: List[StageEvent] = field(default_factory=list)
+    _stack: List[_Frame] = field(default_factory=list)
+    _started_tracemalloc: bool = False
+
+    # ---------- керування ----------
+    def enable(self, memory: bool = True) -> None:
+        self.enabled, self.memory = True, memory
+        self.events.clear()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ---------- заміри ----------
+    @contextmanager
+    def stage(self, name: str, label: str | None = None):
+        if not self.enabled:
+            yield
+            return
+        frame = _Frame()
+        # подію додаємо на вході — у трейсі батьківський етап іде перед вкладеними
+        ev = StageEvent(name, 0.0, len(self._stack), label)
+        self.events.append(ev)
+        if self.memory:
+            cur, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # пік батьківського етапу до цього моменту, бо нижче лічильник піку скидається
+                self._stack[-1].peak_abs = max(self._stack[-1].peak_abs, peak)
+            tracemalloc.reset_peak()
+            frame.start_bytes = frame.peak_abs = cur
+        self._stack.append(frame)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            ev.seconds = time.perf_counter() - t0
+            self._stack.pop()
+            if self.memory:
+                frame.peak_abs = max(frame.peak_abs, tracemalloc.get_traced_memory()[1])
+                ev.peak_bytes = frame.peak_abs - frame.start_bytes
+                if self._stack:
+                    self._stack[-1].peak_abs = max(self._stack[-1].peak_abs, frame.peak_abs)
+
+    # ---------- підсумки ----------
+    def stats(self) -> Dict[str, StageStats]:
+        """Агрегати по назві етапу в порядку першої появи."""
+        out: Dict[str, StageStats] = {}
+        for ev in self.events:
+            out.setdefault(ev.name, StageStats(ev.name)).add(ev)
+        return out
+
+    def table(self) -> str:
+        lines = [f"{'етап':<38}{'викл.':>7}{'всього, с':>11}{'макс, с':>10}{'пік, МБ':>10}"]
+        for s in self.stats().values():
+            peak = f"{s.peak_bytes / (1 << 20):.1f}" if s.peak_bytes is not None else "—"
+            lines.append(f"{s.name:<38}{s.calls:>7}{s.total:>11.3f}{s.max:>10.3f}{peak:>10}")
+        return "\n".join(lines)
+
+    def write_trace(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        trace = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "memory": self.memory,
+            "stages": [asdict(s) for s in self.stats().values()],
+            "events": [asdict(ev) for ev in self.events],
+        }
+        path.write_text(json.dumps(trace, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+PROFILER = Profiler()
+
+
+def enable_profiling(memory: bool = True) -> Profiler:
+    PROFILER.enable(memory)
+    return PROFILER
+
+
+def stage(name: str, label: str | None = None):
+    """with stage("назва"): ... — запис етапу, якщо профайлер увімкнено."""
+    return PROFILER.stage(name, label)
+
+
+def timed(name: str | None = None, label: Callable[..., object] | None = None):
+    """
+    Декоратор: кожен виклик функції — етап name (за замовчуванням — ім'я функції).
+    label(*args, **kwargs) -> уточнення події (напр. частота секції).
+    """
+    def deco(fn):
+        stage_name = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            lbl = label(*args, **kwargs) if label else None
+            with PROFILER.stage(stage_name, None if lbl is None else str(lbl)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
@@ -1,15 +1,21 @@
 # src/reportgen/normalize_freq.py
 from __future__ import annotations
-from typing import Optional
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
 import math
 import logging
+import numpy as np
 import pandas as pd
 
+from .instrument import timed
+
 log = logging.getLogger(__name__)
 
 MASK_PREFIXES = ("100", "200", "300")
 FREQ_NOT_FOUND = "111.1111"
 COL_TEXT = "р\\обмін"
+MASK3_COLS = ("Маска_3", "Маска_Ш")
+TEXT_MASK_COLS = ("Маска_А", "Маска_Акв")
 
 def _to_float_safe(x) -> Optional[float]:
     if x is None or (isinstance(x, float) and math.isnan(x)):
@@ -32,41 +38,6 @@ def is_real_freq(value) -> bool:
         return False
     return not s.startswith(MASK_PREFIXES)
 
-def _match_in_columns_exact(ref_df: pd.DataFrame, col_names: list[str], target: str) -> pd.DataFrame:
-    if not target:
-        return ref_df.iloc[0:0]
-    mask = False
-    for c in col_names:
-        if c in ref_df.columns:
-            mask = mask | (ref_df[c].astype(str).str.strip() == target)
-    return ref_df[mask]
-
-def get_true_freq_by_mask(mask_like, ref_df: pd.DataFrame) -> str:
-    mask3 = _format_mask3(mask_like)
-    if mask3 is None:
-        log.warning("WARN: Маска %r некоректна -> %s", mask_like, FREQ_NOT_FOUND)
-        return FREQ_NOT_FOUND
-
-    tmp = ref_df.copy()
-    for col in ("Маска_3", "Маска_Ш"):
-        if col in tmp.columns:
-            tmp[col] = tmp[col].apply(_format_mask3)
-
-    matches = _match_in_columns_exact(tmp, ["Маска_3", "Маска_Ш"], mask3)
-
-    if len(matches) == 0:
-        log.warning("WARN: Маска %s не знайдена у Маска_3/Маска_Ш -> %s", mask3, FREQ_NOT_FOUND)
-        return FREQ_NOT_FOUND
-    if len(matches) > 1:
-        log.warning("WARN: Маска %s має декілька збігів (%d). Узято перший.", mask3, len(matches))
-
-    row = matches.iloc[0]
-    if "Частота" not in row.index or pd.isna(row["Частота"]):
-        log.warning("WARN: У збігу для маски %s відсутня 'Частота' -> %s", mask3, FREQ_NOT_FOUND)
-        return FREQ_NOT_FOUND
-
-    return str(row["Частота"]).strip()
-
 def _first_nonempty_line(text: str) -> str:
     if text is None or (isinstance(text, float) and math.isnan(text)):
         return ""
@@ -76,48 +47,165 @@ def _first_nonempty_line(text: str) -> str:
             return st
     return ""
 
-def get_true_freq_by_text(text, ref_df: pd.DataFrame) -> str:
-    line = _first_nonempty_line(text)
-    if not line:
-        log.warning("WARN: Порожній текст для пошуку маски за 'р\\обмін' -> %s", FREQ_NOT_FOUND)
-        return FREQ_NOT_FOUND
-
-    matches = _match_in_columns_exact(ref_df, ["Маска_А", "Маска_Акв"], line)
-    if len(matches) == 0:
-        log.warning("WARN: Маска за текстом '%s' не знайдена у Маска_А/Маска_Акв -> %s", line, FREQ_NOT_FOUND)
-        return FREQ_NOT_FOUND
-    if len(matches) > 1:
-        log.warning("WARN: Текстова маска '%s' має декілька збігів (%d). Узято перший.", line, len(matches))
-
-    row = matches.iloc[0]
-    if "Частота" not in row.index or pd.isna(row["Частота"]):
-        log.warning("WARN: Для текстової маски '%s' відсутня 'Частота' -> %s", line, FREQ_NOT_FOUND)
-        return FREQ_NOT_FOUND
-
-    return str(row["Частота"]).strip()
-
-def normalize_frequency_column(intercepts_df: pd.DataFrame, ref_df: pd.DataFrame) -> pd.DataFrame:
+def _map_unique(ser: pd.Series, fn) -> pd.Series:
+    """Застосовує fn до кожного УНІКАЛЬНОГО значення і розносить результат join'ом."""
+    if ser.empty:
+        return ser.astype("object")
+    uniq = pd.unique(ser)
+    lookup = pd.Series([fn(v) for v in uniq], index=pd.Index(uniq, dtype="object"), dtype="object")
+    return ser.map(lookup).astype("object")
+
+def _freq_values(ref_df: pd.DataFrame) -> list[str]:
+    """'Частота' кожного рядка довідника у тому вигляді, який повертає пошук (або FREQ_NOT_FOUND)."""
+    if "Частота" not in ref_df.columns:
+        return [FREQ_NOT_FOUND] * len(ref_df)
+    return [FREQ_NOT_FOUND if pd.isna(v) else str(v).strip() for v in ref_df["Частота"]]
+
+def _first_match_lookup(ref_df: pd.DataFrame, keys_by_col: dict[str, pd.Series]) -> tuple[dict[str, str], dict[str, int]]:
+    """
+    Будує ключ -> частота за правилом «перший рядок довідника виграє»
+    (як ref_df[mask].iloc[0] у колонках, об'єднаних через OR).
+    Повертає (lookup, кількість рядків-збігів для кожного ключа).
+    """
+    parts = [
+        pd.DataFrame({"key": keys.to_numpy(dtype=object), "pos": np.arange(len(ref_df))})
+        for keys in keys_by_col.values()
+    ]
+    if not parts:
+        return {}, {}
+    long = pd.concat(parts, ignore_index=True)
+    long = long[long["key"].notna()]
+    long = long.drop_duplicates(["key", "pos"]).sort_values("pos", kind="stable")
+    counts = long["key"].value_counts().to_dict()
+    first = long.drop_duplicates("key", keep="first")
+    freqs = _freq_values(ref_df)
+    lookup = {k: freqs[p] for k, p in zip(first["key"], first["pos"])}
+    return lookup, counts
+
+@dataclass
+class MaskIndex:
+    """
+    Індекс масок довідника, побудований ОДИН раз на DataFrame:
+      by_mask3 — '100.107' (Маска_3/Маска_Ш, 3 знаки) -> 'Частота'
+      by_text  — перший рядок тексту (Маска_А/Маска_Акв) -> 'Частота'
+    """
+    by_mask3: dict[str, str]
+    by_text: dict[str, str]
+    mask3_hits: dict[str, int]
+    text_hits: dict[str, int]
+
+    @classmethod
+    def from_frame(cls, ref_df: pd.DataFrame) -> "MaskIndex":
+        mask_keys = {
+            c: _map_unique(ref_df[c], _format_mask3)
+            for c in MASK3_COLS if c in ref_df.columns
+        }
+        text_keys = {
+            c: ref_df[c].astype(str).str.strip()
+            for c in TEXT_MASK_COLS if c in ref_df.columns
+        }
+        by_mask3, mask3_hits = _first_match_lookup(ref_df, mask_keys)
+        by_text, text_hits = _first_match_lookup(ref_df, text_keys)
+        return cls(by_mask3=by_mask3, by_text=by_text, mask3_hits=mask3_hits, text_hits=text_hits)
+
+    def freq_by_mask(self, mask_like) -> str:
+        mask3 = _format_mask3(mask_like)
+        if mask3 is None:
+            log.warning("WARN: Маска %r некоректна -> %s", mask_like, FREQ_NOT_FOUND)
+            return FREQ_NOT_FOUND
+        if mask3 not in self.by_mask3:
+            log.warning("WARN: Маска %s не знайдена у Маска_3/Маска_Ш -> %s", mask3, FREQ_NOT_FOUND)
+            return FREQ_NOT_FOUND
+        hits = self.mask3_hits.get(mask3, 1)
+        if hits > 1:
+            log.warning("WARN: Маска %s має декілька збігів (%d). Узято перший.", mask3, hits)
+        true_f = self.by_mask3[mask3]
+        if true_f == FREQ_NOT_FOUND:
+            log.warning("WARN: У збігу для маски %s відсутня 'Частота' -> %s", mask3, FREQ_NOT_FOUND)
+        return true_f
+
+    def freq_by_text(self, text) -> str:
+        line = _first_nonempty_line(text)
+        if not line:
+            log.warning("WARN: Порожній текст для пошуку маски за 'р\\обмін' -> %s", FREQ_NOT_FOUND)
+            return FREQ_NOT_FOUND
+        if line not in self.by_text:
+            log.warning("WARN: Маска за текстом '%s' не знайдена у Маска_А/Маска_Акв -> %s", line, FREQ_NOT_FOUND)
+            return FREQ_NOT_FOUND
+        hits = self.text_hits.get(line, 1)
+        if hits > 1:
+            log.warning("WARN: Текстова маска '%s' має декілька збігів (%d). Узято перший.", line, hits)
+        true_f = self.by_text[line]
+        if true_f == FREQ_NOT_FOUND:
+            log.warning("WARN: Для текстової маски '%s' відсутня 'Частота' -> %s", line, FREQ_NOT_FOUND)
+        return true_f
+
+def as_mask_index(ref) -> MaskIndex:
+    """
+    Приймає готовий MaskIndex, ReferenceIndex (береться його .masks)
+    або DataFrame довідника (тоді індекс будується тут).
+    """
+    if isinstance(ref, MaskIndex):
+        return ref
+    masks = getattr(ref, "masks", None)
+    if isinstance(masks, MaskIndex):
+        return masks
+    return MaskIndex.from_frame(ref)
+
+def get_true_freq_by_mask(mask_like, ref_df: pd.DataFrame | MaskIndex) -> str:
+    return as_mask_index(ref_df).freq_by_mask(mask_like)
+
+def get_true_freq_by_text(text, ref_df: pd.DataFrame | MaskIndex) -> str:
+    return as_mask_index(ref_df).freq_by_text(text)
+
+def _raw_freq_str(raw) -> str:
+    if raw is None or (isinstance(raw, float) and math.isnan(raw)):
+        return ""
+    return str(raw).strip()
+
+@timed()
+def normalize_frequency_column(intercepts_df: pd.DataFrame, ref_df: pd.DataFrame | MaskIndex) -> pd.DataFrame:
+    """
+    Замінює маски у 'Частота' на справжні частоти (пакетно, без циклу по рядках):
+      - реальна частота -> лишається як є;
+      - маска (100/200/300...) -> пошук у Маска_3/Маска_Ш;
+      - порожньо -> пошук першого рядка 'р\\обмін' у Маска_А/Маска_Акв;
+      - не знайдено -> FREQ_NOT_FOUND.
+    Кожне унікальне значення резолвиться один раз (і попередження пишеться один раз).
+    """
     if "Частота" not in intercepts_df.columns:
         raise KeyError("У перехопленнях відсутня колонка 'Частота'")
     if COL_TEXT not in intercepts_df.columns:
         log.warning("WARN: Відсутня колонка '%s' — пошук за текстом буде обмежений.", COL_TEXT)
 
+    index = as_mask_index(ref_df)
+
     # ВАЖЛИВО: дозволяємо писати '111.1111' як str
-    intercepts_df["Частота"] = intercepts_df["Частота"].astype("object")
-
-    for i in range(len(intercepts_df)):
-        raw = intercepts_df.at[i, "Частота"] if "Частота" in intercepts_df.columns else None
-        raw_str = None if (raw is None or (isinstance(raw, float) and math.isnan(raw))) else str(raw).strip()
-
-        if raw_str:
-            if is_real_freq(raw_str):
-                continue
-            else:
-                true_f = get_true_freq_by_mask(raw_str, ref_df)
-                intercepts_df.at[i, "Частота"] = true_f
+    was_categorical = isinstance(intercepts_df["Частота"].dtype, pd.CategoricalDtype)
+    col = intercepts_df["Частота"].astype("object")
+
+    raw_str = _map_unique(col, _raw_freq_str)
+    by_text = raw_str.eq("")
+    by_mask = ~by_text & raw_str.str.startswith(MASK_PREFIXES).astype(bool)
+
+    if by_mask.any():
+        col.loc[by_mask] = _map_unique(raw_str[by_mask], index.freq_by_mask)
+    if by_text.any():
+        if COL_TEXT in intercepts_df.columns:
+            texts = intercepts_df.loc[by_text, COL_TEXT]
         else:
-            text_val = intercepts_df.at[i, COL_TEXT] if COL_TEXT in intercepts_df.columns else None
-            true_f = get_true_freq_by_text(text_val, ref_df)
-            intercepts_df.at[i, "Частота"] = true_f
+            texts = pd.Series(None, index=col.index[by_text], dtype="object")
+        col.loc[by_text] = _map_unique(texts, index.freq_by_text)
 
+    # потоковий читач дає category — зберігаємо тип (пам'ять на великих файлах)
+    intercepts_df["Частота"] = col.astype("category") if was_categorical else col
     return intercepts_df
+
+def normalize_frequency_chunks(chunks: Iterable[pd.DataFrame], ref_df: pd.DataFrame | MaskIndex) -> Iterator[pd.DataFrame]:
+    """
+    Нормалізує 'Частота' у кожному шматку потокового читання (iter_excel_chunks).
+    Індекс масок будується один раз; попередження — раз на значення в межах шматка.
+    """
+    index = as_mask_index(ref_df)
+    for chunk in chunks:
+        yield normalize_frequency_column(chunk, index)
@@ -1,14 +1,19 @@
 from pathlib import Path
 import pandas as pd
 
-def load_sheet_df(freq4: str, xlsx_path: Path) -> pd.DataFrame | None:
+from src.armorkit.xlsxutils.workbook import WorkbookSheets, as_workbook
+
+def load_sheet_df(freq4: str, xlsx_path: Path | WorkbookSheets) -> pd.DataFrame | None:
     """
     Читає вкладку Excel з назвою == freq4 (4 знаки після крапки).
     Очікує колонки: '№', 'Категорія', 'Значення'.
     Повертає DataFrame або None (якщо вкладки немає/структура неочікувана).
     """
     try:
-        df = pd.read_excel(xlsx_path, sheet_name=freq4, dtype=str)
+        book = as_workbook(xlsx_path)
+        if freq4 not in book:
+            return None
+        df = book.sheet(freq4, dtype=str)
     except Exception:
         return None
 
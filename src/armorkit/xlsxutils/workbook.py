@@ -0,0 +1,115 @@
+from __future__ import annotations
+from pathlib import Path
+import logging
+import os
+import threading
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+
+class WorkbookSheets:
+    """
+    Книга XLSX, відкрита ОДИН раз: аркуші парсяться ліниво і кешуються за назвою.
+    Для довідника Frequencies_63.xlsx (сотні еталонних вкладок) це означає, що
+    час звіту залежить від кількості реально прочитаних аркушів, а не аркушів × частот.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._xls: pd.ExcelFile | None = None
+        self._pid: int | None = None
+        self._frames: dict[tuple, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _book(self) -> pd.ExcelFile:
+        # openpyxl читає аркуші ліниво з відкритого zip; після fork дескриптор (і позиція в ньому)
+        # спільні з батьківським процесом — паралельне читання псує дані (Bad CRC-32).
+        # Тому в кожному процесі книга відкривається заново; вже розпарсені аркуші лишаються.
+        if self._xls is None or self._pid != os.getpid():
+            self._xls = pd.ExcelFile(self.path, engine="openpyxl")
+            self._pid = os.getpid()
+        return self._xls
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return list(self._book().sheet_names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._book().sheet_names
+
+    def sheet(self, name: str | int, dtype=None) -> pd.DataFrame:
+        """
+        Повертає аркуш як DataFrame (копію з кешу, тож викликач може її змінювати).
+        Помилки читання пробрасуються як є — обробляє викликач.
+        """
+        key = (name, dtype)
+        with self._lock:
+            df = self._frames.get(key)
+            if df is None:
+                df = self._book().parse(sheet_name=name, dtype=dtype)
+                self._frames[key] = df
+        return df.copy()
+
+    def release(self) -> None:
+        """Закриває дескриптор файлу; розпарсені аркуші лишаються, книга перевідкриється за потреби."""
+        with self._lock:
+            if self._xls is not None and self._pid == os.getpid():
+                self._xls.close()
+            self._xls = None
+
+    def close(self) -> None:
+        self.release()
+        self._frames.clear()
+
+
+# одна відкрита книга на шлях (і версію файлу) на весь запуск — спільна для всіх режимів
+_OPEN: dict[str, tuple[float, WorkbookSheets]] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_workbook(path: str | Path) -> WorkbookSheets:
+    """
+    Повертає спільний WorkbookSheets для файлу.
+    Якщо файл змінився (mtime) — книга перевідкривається.
+    """
+    p = Path(path).resolve()
+    mtime = p.stat().st_mtime
+    key = str(p)
+    with _OPEN_LOCK:
+        hit = _OPEN.get(key)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        if hit is not None:
+            hit[1].close()
+        wb = WorkbookSheets(p)
+        _OPEN[key] = (mtime, wb)
+        return wb
+
+
+def as_workbook(book: WorkbookSheets | str | Path) -> WorkbookSheets:
+    """Приймає готовий WorkbookSheets або шлях до XLSX."""
+    if isinstance(book, WorkbookSheets):
+        return book
+    return open_workbook(book)
+
+
+def release_workbooks() -> None:
+    """
+    Закриває дескриптори всіх спільних книг (кеш аркушів зберігається).
+    Для довгоживучих процесів (--watch): між циклами файл не тримається відкритим,
+    тож його можна перезаписати/перемістити (Windows) і нова версія підхопиться за mtime.
+    """
+    with _OPEN_LOCK:
+        books = [wb for _, wb in _OPEN.values()]
+    for wb in books:
+        wb.release()
+
+
+def close_workbooks() -> None:
+    """Закриває і забуває всі спільні книги разом із розпарсеними аркушами — наступне читання холодне."""
+    with _OPEN_LOCK:
+        books = [wb for _, wb in _OPEN.values()]
+        _OPEN.clear()
+    for wb in books:
+        wb.close()
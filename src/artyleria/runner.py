@@ -6,9 +6,13 @@ import pandas as pd
 
 # 1) вхідні дані беремо з armorkit (єдиний шар)
 from src.armorkit.data_loader import load_inputs
+from src.armorkit.dates import DT_COL
+from src.armorkit.images import image_index
 # 2) нормалізація частоти — та сама, що у попередніх звітах
 from src.armorkit.normalize_freq import normalize_frequency_column
 
+from src.reportgen.report_pipeline import PreparedInputs
+
 from .report import build_docx
 
 
@@ -23,14 +27,13 @@ def _image_for(freq4: str) -> Path | None:
     """
     Картинки шукаємо в локальній теці images (поруч із runner.py / report.py).
     Ім’я файлу = частота з 4 знаками після крапки (наприклад 136.5600.png).
+    Тека індексується один раз за прогін (src.armorkit.images), пошук — dict.
     """
-    folder = Path(__file__).parent / "images"
     try:
-        filename = f"{float(str(freq4).replace(',', '.')):.4f}.png"
+        stem = f"{float(str(freq4).replace(',', '.')):.4f}"
     except Exception:
-        filename = f"{freq4}.png"
-    path = folder / filename
-    return path if path.exists() else None
+        stem = f"{freq4}"
+    return image_index(Path(__file__).parent / "images").get(stem)
 
 
 def _next_free(path: Path) -> Path:
@@ -44,20 +47,8 @@ def _next_free(path: Path) -> Path:
         i += 1
 
 
-def run() -> Path:
-    # ---- 1) Завантаження (довідник + свіжа вибірка перехоплень) ----
-    loaded = load_inputs("config.yml")
-    ref_df: pd.DataFrame = getattr(loaded, "reference_df")
-    inter_df: pd.DataFrame = (
-        getattr(loaded, "report_df", None)
-        if getattr(loaded, "report_df", None) is not None
-        else getattr(loaded, "intercepts_df")
-    )
-
-    # ---- 2) Нормалізація частот у перехопленнях ----
-    inter_df = normalize_frequency_column(inter_df, ref_df)
-
-    # ---- 3) Перелік артмереж із довідника ----
+def art_reference(ref_df: pd.DataFrame) -> pd.DataFrame:
+    """Рядки довідника артмереж (Теги містять «Арта») з колонкою freq4."""
     need_cols = {"Частота", "Теги"}
     miss = need_cols - set(ref_df.columns)
     if miss:
@@ -66,7 +57,27 @@ def run() -> Path:
     art_ref = ref_df.copy()
     art_ref["__is_arta"] = art_ref["Теги"].astype(str).str.contains("Арта", case=False, na=False)
     art_ref["freq4"] = art_ref["Частота"].map(_to4)
-    art_ref = art_ref[art_ref["__is_arta"] & art_ref["freq4"].notna()]
+    return art_ref[art_ref["__is_arta"] & art_ref["freq4"].notna()]
+
+
+def run(prepared: PreparedInputs | None = None) -> Path:
+    # ---- 1-2) Завантаження + нормалізація частот у перехопленнях ----
+    # (у режимі run приходить готовий спільний стан — вже нормалізований)
+    if prepared is not None:
+        ref_df: pd.DataFrame = prepared.li.reference_df
+        inter_df: pd.DataFrame = prepared.li.intercepts_df
+    else:
+        loaded = load_inputs("config.yml")
+        ref_df = getattr(loaded, "reference_df")
+        inter_df = (
+            getattr(loaded, "report_df", None)
+            if getattr(loaded, "report_df", None) is not None
+            else getattr(loaded, "intercepts_df")
+        )
+        inter_df = normalize_frequency_column(inter_df, ref_df)
+
+    # ---- 3) Перелік артмереж із довідника ----
+    art_ref = art_reference(ref_df)
 
     names = (
         art_ref.set_index("freq4")["Радіомережа"]
@@ -84,7 +95,9 @@ def run() -> Path:
 
     if not {"Дата", "Час"}.issubset(df.columns):
         raise KeyError("Очікуються колонки 'Дата' та 'Час' у перехопленнях.")
-    df = df.sort_values(by=["Дата", "Час"], ascending=True)
+    # хронологічно за готовою колонкою з load_inputs; без неї — як раніше, по рядках
+    sort_by = [DT_COL] if DT_COL in df.columns else ["Дата", "Час"]
+    df = df.sort_values(by=sort_by, ascending=True, kind="stable")
 
     # ---- 5) Сформувати групи для рендера ----
     groups = []
@@ -18,14 +18,17 @@ log.info("=== ENEMIES v3: запуск модуля ===")
 from src.armorkit.data_loader import load_inputs
 from src.armorkit.normalize_freq import is_real_freq, get_true_freq_by_mask, normalize_frequency_column
 from src.armorkit.domain.freqnorm import freq4_str
-from src.armorkit.domain.reference import get_network_name_by_freq
+from src.armorkit.dates import DT_COL, parse_datetime_columns, parse_time_column
+from src.armorkit.domain.reference_index import ReferenceIndex
 from src.armorkit.docxutils.safe_save import safe_save_docx
+from src.armorkit.xlsxutils.workbook import WorkbookSheets, as_workbook
+from src.reportgen.report_pipeline import PreparedInputs
 
 # DOCX
 from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from src.armorkit.docxutils.tables import center_cell, vcenter, set_col_widths, set_row_min_height
+from src.armorkit.docxutils.tables import Col, add_xml_table
 
 
 # ---------- допоміжні ----------
@@ -35,69 +38,90 @@ def read_freq_tokens(freq_file: Path) -> list[str]:
     return [t for t in toks if t]
 
 
-def tokens_to_freq4(tokens: list[str], reference_df: pd.DataFrame) -> list[str]:
+def tokens_to_freq4(tokens: list[str], ref_idx: ReferenceIndex) -> list[str]:
     out = OrderedDict()
     for tok in tokens:
-        true_f = tok if is_real_freq(tok) else get_true_freq_by_mask(tok, reference_df)
+        true_f = tok if is_real_freq(tok) else get_true_freq_by_mask(tok, ref_idx)
         out[freq4_str(true_f)] = None
     return list(out.keys())
 
 
-def activity_period_for_freq4(intercepts_df: pd.DataFrame, f4: str) -> tuple[str, str]:
+# список частот звіту (частоти або маски, через кому/новий рядок)
+FREQ_FILE = Path(__file__).resolve().parent / "data" / "freq.txt"
+
+
+def watch_list(ref_idx: ReferenceIndex, freq_file: Path = FREQ_FILE) -> list[str]:
+    """Частоти звіту (freq4) з data/freq.txt; маски розгортаються через довідник."""
+    return tokens_to_freq4(read_freq_tokens(freq_file), ref_idx)
+
+
+# колонки результату network_activity
+ACTIVITY_COLUMNS = ["period_start", "period_end", "count", "mask3", "network_name"]
+
+
+def _freq4_column(freqs: pd.Series) -> pd.Series:
+    # freq4_str — лише для унікальних значень, далі векторний map
+    uniq = pd.unique(freqs.astype("object"))
+    return freqs.astype("object").map({u: freq4_str(u) for u in uniq})
+
+
+def network_activity(intercepts_df: pd.DataFrame, freq4_list: list[str],
+                     ref_idx: ReferenceIndex | None = None) -> pd.DataFrame:
     """
-    Повертає (перший час, останній час) для частоти f4 у форматі HH:MM.
-    Якщо перехоплень немає — ('-', '-').
-    Очікує колонки: 'Частота', 'Дата', 'Час'.
+    Один groupby по перехопленнях для всього списку частот.
+    Повертає DataFrame (індекс — freq4 у порядку freq4_list) з колонками ACTIVITY_COLUMNS:
+      period_start/period_end — перший/останній час (HH:MM) або '-',
+      count — кількість перехоплень частоти (зокрема без часу), 0 — якщо немає,
+      mask3/network_name — з ReferenceIndex (None/'—', якщо індексу немає).
+    Час — з DT_COL (load_inputs), інакше збирається з 'Дата'/'Час'. Перехоплення з порожнім
+    або нерозпізнаним 'Час' у період не входять (як і раніше: без часу — без моменту активності).
     """
-    need = {"Частота", "Дата", "Час"}
-    if not need.issubset(intercepts_df.columns):
-        return "-", "-"
-
-    df = intercepts_df.copy()
-    df["__f4"] = df["Частота"].map(freq4_str)
-    part = df.loc[df["__f4"] == f4].copy()
-    if part.empty:
-        return "-", "-"
-
-    # нормалізуємо дату/час і збираємо єдиний datetime
-    part["__date"] = pd.to_datetime(part["Дата"], dayfirst=True, errors="coerce")
-    part["__time"] = part["Час"].astype(str).str.strip()
-    part.loc[:, "__dt"] = pd.to_datetime(
-        part["__date"].dt.strftime("%Y-%m-%d") + " " + part["__time"], errors="coerce"
-    )
+    out = pd.DataFrame(index=pd.Index(freq4_list, name="freq4"), columns=ACTIVITY_COLUMNS, dtype=object)
+    out["period_start"] = out["period_end"] = "-"
+    out["count"] = 0
+    if ref_idx is not None:
+        out["mask3"] = pd.Series([ref_idx.mask3.get(f) for f in freq4_list], index=out.index, dtype=object)
+        out["network_name"] = [ref_idx.name(f) for f in freq4_list]
+    else:
+        out["mask3"] = None
+        out["network_name"] = "—"
+
+    if "Частота" not in intercepts_df.columns or not freq4_list:
+        return out
+    if DT_COL in intercepts_df.columns:
+        dt = intercepts_df[DT_COL]
+    elif {"Дата", "Час"}.issubset(intercepts_df.columns):
+        dt = parse_datetime_columns(intercepts_df["Дата"], intercepts_df["Час"])
+    else:
+        return out
+    if "Час" in intercepts_df.columns:
+        # у DT_COL порожній час — це 00:00; для періоду активності такі рядки відкидаємо
+        dt = dt.where(parse_time_column(intercepts_df["Час"]).notna())
 
-    part = part.loc[part["__dt"].notna()].sort_values("__dt", kind="stable")
-    if part.empty:
-        return "-", "-"
+    work = pd.DataFrame({"f4": _freq4_column(intercepts_df["Частота"]), "dt": dt})
+    work = work[work["f4"].isin(out.index)]
+    agg = work.groupby("f4", sort=False)["dt"].agg(["min", "max", "size"])
+    out.loc[agg.index, "count"] = agg["size"]
 
-    # ЛИШЕ ЧАСИ
+    # ЛИШЕ ЧАСИ; частоти без жодного валідного часу лишаються '-'
     tfmt = "%H:%M"
-    start_t = part.iloc[0]["__dt"].strftime(tfmt)
-    end_t   = part.iloc[-1]["__dt"].strftime(tfmt)
-    return start_t, end_t
-
+    timed = agg[agg["min"].notna()]
+    out.loc[timed.index, "period_start"] = timed["min"].dt.strftime(tfmt)
+    out.loc[timed.index, "period_end"] = timed["max"].dt.strftime(tfmt)
+    return out
 
 
-def mask3_from_reference(reference_df: pd.DataFrame, f4: str) -> str | None:
-    df = reference_df.copy()
-    if "Частота" not in df.columns:
-        return None
-    df["__f4"] = df["Частота"].map(freq4_str)
-    m = df[df["__f4"] == f4]
-    if m.empty:
-        return None
-    def _norm(val):
-        s = str(val).strip()
-        try: return f"{float(s.replace(',', '.')):.3f}"
-        except Exception: return s
-    for col in ("Маска_3", "Маска_Ш"):
-        if col in m.columns and pd.notna(m.iloc[0][col]) and str(m.iloc[0][col]).strip():
-            return _norm(m.iloc[0][col])
-    return None
+def activity_period_for_freq4(intercepts_df: pd.DataFrame, f4: str) -> tuple[str, str]:
+    """
+    Повертає (перший час, останній час) для частоти f4 у форматі HH:MM.
+    Якщо перехоплень немає — ('-', '-'). Для списку частот — network_activity.
+    """
+    row = network_activity(intercepts_df, [f4]).loc[f4]
+    return row["period_start"], row["period_end"]
 
 
 # ---------- ЕТАЛОНКИ: читаємо Категорія/Значення прямо з аркуша ----------
-def read_ref_fields(freq_book_path: Path, f4: str) -> tuple[str, str, str, str, str, str]:
+def read_ref_fields(freq_book_path: Path | WorkbookSheets, f4: str) -> tuple[str, str, str, str, str, str]:
     """
     Повертає: (modulation, nature, main_vz, sub_vz, area, period)
     Підтримує:
@@ -105,13 +129,13 @@ def read_ref_fields(freq_book_path: Path, f4: str) -> tuple[str, str, str, str,
       Б) таблицю «№ | Категорія | Значення» (порядок колонок довільний)
     """
     try:
-        xls = pd.ExcelFile(freq_book_path, engine="openpyxl")
+        book = as_workbook(freq_book_path)
+        sheet_names = [str(s).strip() for s in book.sheet_names]
     except Exception as e:
         log.warning("Довідник не відкрито: %s", e)
         return "—", "—", "—", "—", "—", "—"
 
     # 1) знайдемо аркуш: точний або «м’які» варіанти (145.9500 -> 145.95 тощо)
-    sheet_names = [str(s).strip() for s in xls.sheet_names]
     target = None
     if f4 in sheet_names:
         target = f4
@@ -125,7 +149,7 @@ def read_ref_fields(freq_book_path: Path, f4: str) -> tuple[str, str, str, str,
         return "—", "—", "—", "—", "—", "—"
 
     try:
-        df = pd.read_excel(xls, sheet_name=target, dtype=str)
+        df = book.sheet(target, dtype=str)
     except Exception as e:
         log.warning("Аркуш '%s' не зчитано: %s", target, e)
         return "—", "—", "—", "—", "—", "—"
@@ -218,26 +242,19 @@ def add_header(doc: Document, date_str: str, unit_name: str = "63 омсбр"):
 
 
 def add_overview_table(doc: Document, rows: list[dict]):
-    t = doc.add_table(rows=1, cols=6)
-    t.style = "Table Grid"
-    hdr = t.rows[0].cells
-    hdr[0].text = "№"; hdr[1].text = "Частота (МГц)"; hdr[2].text = "Вид модуляції"
-    hdr[3].text = "Період активності"; hdr[4].text = "Координати"; hdr[5].text = "Примітки"
-
-    for i, row in enumerate(rows, start=1):
-        c = t.add_row().cells
-        c[0].text = str(i)
-        c[1].text = row["freq4"]
-        c[2].text = row.get("modulation", "—")
-        c[3].text = "—" if (row.get("period_start") == "-" and row.get("period_end") == "-") \
-                    else f"{row['period_start']} — {row['period_end']}"
-        c[4].text = "—"; c[5].text = "—"
-
-    set_col_widths(t, [0.8, 1.4, 1.5, 2.6, 1.4, 1.2])
-    for row in t.rows:
-        set_row_min_height(row, cm=0.9)
-        for cell in row.cells:
-            center_cell(cell); vcenter(cell)
+    def _period(row: dict) -> str:
+        if row.get("period_start") == "-" and row.get("period_end") == "-":
+            return "—"
+        return f"{row['period_start']} — {row['period_end']}"
+
+    columns = [Col(w, align="center", vcenter=True) for w in (0.8, 1.4, 1.5, 2.6, 1.4, 1.2)]
+    add_xml_table(
+        doc, columns,
+        ((str(i), row["freq4"], row.get("modulation", "—"), _period(row), "—", "—")
+         for i, row in enumerate(rows, start=1)),
+        header=("№", "Частота (МГц)", "Вид модуляції", "Період активності", "Координати", "Примітки"),
+        row_height_cm=0.9,
+    )
     doc.add_paragraph()
 
 
@@ -259,28 +276,41 @@ def add_network_blocks(doc: Document, items: list[dict]):
 
 
 # ---------- основний сценарій ----------
-def main():
-    li = load_inputs()
-    reference_df = li.reference_df.copy()
-    intercepts_df = li.intercepts_df.copy()
+def main(prepared: PreparedInputs | None = None) -> Path:
+    if prepared is not None:
+        # спільний стан конвеєра: перехоплення вже нормалізовані, індекс готовий
+        li = prepared.li
+        ref_idx = prepared.ref_idx
+        intercepts_df = li.intercepts_df
+    else:
+        li = load_inputs()
+        ref_idx = ReferenceIndex.from_frame(li.reference_df)
+        intercepts_df = li.intercepts_df.copy()
     freq_book_path = Path(li.freq_path) if hasattr(li, "freq_path") else Path("Frequencies_63.xlsx")
 
-    freq_file = Path(__file__).resolve().parent / "data" / "freq.txt"
-    tokens = read_freq_tokens(freq_file)
-    freq4_list = tokens_to_freq4(tokens, reference_df)
+    freq4_list = watch_list(ref_idx)
+
+    if prepared is None:
+        normalize_frequency_column(intercepts_df, ref_idx)
 
-    normalize_frequency_column(intercepts_df, reference_df)
+    # активність/маски/назви — одним проходом; еталонки — з однієї відкритої книги (аркуші кешуються)
+    activity = network_activity(intercepts_df, freq4_list, ref_idx)
+    try:
+        book = as_workbook(freq_book_path)
+    except Exception as e:
+        log.warning("Довідник не відкрито: %s", e)
+        book = freq_book_path
 
     rows, items = [], []
-    for f4 in freq4_list:
-        net_name = get_network_name_by_freq(f4, reference_df) or "—"
-        modulation, nature, main_vz, sub_vz, area, period = read_ref_fields(freq_book_path, f4)
-        p_start, p_end = activity_period_for_freq4(intercepts_df, f4)
-        mask3 = mask3_from_reference(reference_df, f4)
+    # to_dict, а не iterrows: рядок-Series із str-колонками перетворив би None у mask3 на nan
+    for f4, act in activity.to_dict("index").items():
+        modulation, nature, main_vz, sub_vz, area, period = read_ref_fields(book, f4)
 
-        rows.append({"freq4": f4, "modulation": modulation, "period_start": p_start, "period_end": p_end})
-        items.append({"freq4": f4, "network_name": net_name, "nature": nature, "main_vz": main_vz,
-                      "sub_vz": sub_vz, "mask3": mask3, "area": area, "period": period})
+        rows.append({"freq4": f4, "modulation": modulation, "period_start": act["period_start"],
+                     "period_end": act["period_end"]})
+        items.append({"freq4": f4, "network_name": act["network_name"] or "—", "nature": nature,
+                      "main_vz": main_vz, "sub_vz": sub_vz, "mask3": act["mask3"], "area": area,
+                      "period": period})
 
     today_display = datetime.now().strftime("%d.%m.%Y")
     out_dir = Path.cwd() / "build"; out_dir.mkdir(parents=True, exist_ok=True)
@@ -293,7 +323,8 @@ def main():
     
     saved = safe_save_docx(doc, out_path)  # як і раніше використовуємо безпечне збереження
     # doc.save(out_path) 
-    log.info("[OK] Звіт збережено: %s", saved.resolve)
+    log.info("[OK] Звіт збережено: %s", saved.resolve())
+    return saved
 
 
 if __name__ == "__main__":
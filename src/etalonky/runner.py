@@ -6,6 +6,7 @@ import logging
 import pandas as pd
 
 from src.armorkit.data_loader import load_inputs
+from src.reportgen.report_pipeline import PreparedInputs
 from .report import build_docx
 from src.armorkit.domain.freqnorm import freq4_str
 from src.armorkit.xlsxutils.tables import load_sheet_df
@@ -40,9 +41,9 @@ def _next_free(path: Path) -> Path:
 
 
 # --------- основний сценарій ---------
-def run() -> Path:
-    # 1) завантаження
-    li = load_inputs("config.yml")  # очікуємо: li.reference_df, li.freq_path
+def run(prepared: PreparedInputs | None = None) -> Path:
+    # 1) завантаження (у режимі run — зі спільного стану конвеєра)
+    li = prepared.li if prepared is not None else load_inputs("config.yml")  # очікуємо: li.reference_df, li.freq_path
     ref: pd.DataFrame = li.reference_df.copy()
 
     if not {"Статус", "Частота"}.issubset(ref.columns):
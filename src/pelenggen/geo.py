@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+MGRS <-> UTM <-> WGS84 (lat/lon) пакетно на NumPy.
+
+Рядки MGRS розбираються по одному (regex), але все, що залежить лише від зони,
+смуги й 100-км квадрата, береться з невеликого lru-кешу (за добу — десятки різних
+квадратів на тисячі пеленгів); решта — векторна арифметика над масивами.
+Проекція — ряди Крюгера до n^4 (похибка — мікрометри у межах зони).
+Окремо від mgrs.py, щоб GUI (лише перевірка формату) не вантажив numpy на старті.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Mapping, Sequence, Tuple
+import re
+
+import numpy as np
+
+# ---------- WGS84 / UTM ----------
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+K0 = 0.9996
+FALSE_EASTING = 500_000.0
+FALSE_NORTHING_S = 10_000_000.0
+
+_N = WGS84_F / (2 - WGS84_F)
+_A = WGS84_A / (1 + _N) * (1 + _N ** 2 / 4 + _N ** 4 / 64)
+_ALPHA = (_N / 2 - 2 * _N ** 2 / 3 + 5 * _N ** 3 / 16 + 41 * _N ** 4 / 180,
+          13 * _N ** 2 / 48 - 3 * _N ** 3 / 5 + 557 * _N ** 4 / 1440,
+          61 * _N ** 3 / 240 - 103 * _N ** 4 / 140,
+          49561 * _N ** 4 / 161280)
+_BETA = (_N / 2 - 2 * _N ** 2 / 3 + 37 * _N ** 3 / 96 - _N ** 4 / 360,
+         _N ** 2 / 48 + _N ** 3 / 15 - 437 * _N ** 4 / 1440,
+         17 * _N ** 3 / 480 - 37 * _N ** 4 / 840,
+         4397 * _N ** 4 / 161280)
+_DELTA = (2 * _N - 2 * _N ** 2 / 3 - 2 * _N ** 3 + 116 * _N ** 4 / 45,
+          7 * _N ** 2 / 3 - 8 * _N ** 3 / 5 - 227 * _N ** 4 / 45,
+          56 * _N ** 3 / 15 - 136 * _N ** 4 / 35,
+          4279 * _N ** 4 / 630)
+_E2N = 2 * np.sqrt(_N) / (1 + _N)
+
+# ---------- MGRS ----------
+BANDS = "CDEFGHJKLMNPQRSTUVWX"                              # по 8°, від -80°; X — 72..84°
+COL_LETTERS = ("ABCDEFGH", "JKLMNPQR", "STUVWXYZ")          # набір за (zone - 1) % 3
+ROW_LETTERS = "ABCDEFGHJKLMNPQRSTUV"                        # 20 літер, цикл 2000 км
+ROW_CYCLE = 2_000_000.0
+# запас при виборі циклу 2000 км: на краю зони паралель нижче, ніж на осьовому меридіані
+BAND_TOLERANCE = 100_000.0
+
+MGRS_RE = re.compile(
+    r"^\s*(?P<zone>\d{1,2})\s*(?P<band>[C-HJ-NP-X])\s*(?P<col>[A-HJ-NP-Z])\s*(?P<row>[A-HJ-NP-V])"
+    r"\s*(?:(?P<e>\d{1,5})\s+(?P<n>\d{1,5})|(?P<digits>\d{2,10}))\s*$",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class UTM:
+    """Масиви однакової довжини; невалідні позиції — NaN у easting/northing, zone 0."""
+    zone: np.ndarray        # int
+    northern: np.ndarray    # bool
+    easting: np.ndarray     # float, м
+    northing: np.ndarray    # float, м
+
+    def __len__(self) -> int:
+        return len(self.zone)
+
+
+def central_meridian(zone) -> np.ndarray:
+    return np.asarray(zone) * 6.0 - 183.0
+
+
+def latlon_to_utm(lat, lon, zone=None) -> UTM:
+    """lat/lon (градуси, масиви) -> UTM. zone=None — стандартна зона (з винятками Норвегії/Шпіцбергена)."""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    if zone is None:
+        zone = utm_zone(lat, lon)
+    zone = np.broadcast_to(np.asarray(zone, dtype=int), lat.shape).copy()
+
+    phi = np.radians(lat)
+    dlam = np.radians(lon - central_meridian(zone))
+    s = np.sin(phi)
+    t = np.sinh(np.arctanh(s) - _E2N * np.arctanh(_E2N * s))
+    xi_p = np.arctan2(t, np.cos(dlam))
+    eta_p = np.arctanh(np.sin(dlam) / np.sqrt(1 + t * t))
+
+    xi, eta = xi_p.copy(), eta_p.copy()
+    for j, a in enumerate(_ALPHA, start=1):
+        xi += a * np.sin(2 * j * xi_p) * np.cosh(2 * j * eta_p)
+        eta += a * np.cos(2 * j * xi_p) * np.sinh(2 * j * eta_p)
+
+    northern = lat >= 0
+    easting = FALSE_EASTING + K0 * _A * eta
+    northing = K0 * _A * xi + np.where(northern, 0.0, FALSE_NORTHING_S)
+    return UTM(zone, northern, easting, northing)
+
+
+def utm_to_latlon(utm: UTM) -> Tuple[np.ndarray, np.ndarray]:
+    """UTM -> (lat, lon) у градусах; NaN на невалідних позиціях."""
+    northing = np.asarray(utm.northing, dtype=float) - np.where(utm.northern, 0.0, FALSE_NORTHING_S)
+    xi = northing / (K0 * _A)
+    eta = (np.asarray(utm.easting, dtype=float) - FALSE_EASTING) / (K0 * _A)
+
+    xi_p, eta_p = xi.copy(), eta.copy()
+    for j, b in enumerate(_BETA, start=1):
+        xi_p -= b * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+        eta_p -= b * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+
+    chi = np.arcsin(np.sin(xi_p) / np.cosh(eta_p))
+    phi = chi.copy()
+    for j, d in enumerate(_DELTA, start=1):
+        phi += d * np.sin(2 * j * chi)
+    lon = central_meridian(utm.zone) + np.degrees(np.arctan2(np.sinh(eta_p), np.cos(xi_p)))
+    return np.degrees(phi), lon
+
+
+def utm_zone(lat, lon) -> np.ndarray:
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    lon = (lon + 180.0) % 360.0 - 180.0
+    zone = np.floor((lon + 180.0) / 6.0).astype(int) + 1
+    zone = np.where(zone > 60, 60, zone)
+    # 32V ширша за рахунок 31V; на Шпіцбергені (72..84°) — лише 31, 33, 35, 37
+    zone = np.where((lat >= 56) & (lat < 64) & (lon >= 3) & (lon < 12), 32, zone)
+    svalbard = (lat >= 72) & (lat < 84)
+    for lo, hi, z in ((0, 9, 31), (9, 21, 33), (21, 33, 35), (33, 42, 37)):
+        zone = np.where(svalbard & (lon >= lo) & (lon < hi), z, zone)
+    return zone
+
+
+def band_letters(lat) -> np.ndarray:
+    idx = np.clip(np.floor((np.asarray(lat, dtype=float) + 80.0) / 8.0), 0, len(BANDS) - 1).astype(int)
+    return np.asarray(list(BANDS))[idx]
+
+
+# ---------- кеш 100-км квадратів ----------
+@lru_cache(maxsize=len(BANDS))
+def _band_min_northing(band: str) -> float:
+    """Найменший northing смуги (на осьовому меридіані) мінус запас."""
+    lat = -80.0 + 8.0 * BANDS.index(band)
+    utm = latlon_to_utm(np.array([lat]), np.array([3.0]), zone=np.array([31]))
+    return float(utm.northing[0]) - BAND_TOLERANCE
+
+
+@lru_cache(maxsize=4096)
+def square_origin(zone: int, band: str, col: str, row: str) -> Tuple[float, float]:
+    """
+    (easting, northing) південно-західного кута 100-км квадрата <zone><band> <col><row>.
+    ValueError — якщо літера стовпця не з набору цієї зони.
+    """
+    cols = COL_LETTERS[(zone - 1) % 3]
+    if col not in cols:
+        raise ValueError(f"Літера стовпця {col} не належить зоні {zone}")
+    easting = (cols.index(col) + 1) * 100_000.0
+    row_idx = (ROW_LETTERS.index(row) - (5 if zone % 2 == 0 else 0)) % 20
+    northing = row_idx * 100_000.0
+    floor = _band_min_northing(band)
+    northing += np.ceil((floor - northing) / ROW_CYCLE) * ROW_CYCLE if northing < floor else 0.0
+    return easting, float(northing)
+
+
+def _parse_one(s: str) -> Tuple[int, str, str, str, float, float]:
+    m = MGRS_RE.match(s or "")
+    if m is None:
+        raise ValueError(f"Некоректний MGRS: {s!r}")
+    e, n = m.group("e"), m.group("n")
+    digits = m.group("digits")
+    if digits is not None:             # злиті цифри: "3296626558", "234064"
+        if len(digits) % 2:
+            raise ValueError(f"Непарна кількість цифр у MGRS: {s!r}")
+        e, n = digits[: len(digits) // 2], digits[len(digits) // 2:]
+    if len(e) != len(n):
+        raise ValueError(f"Різна точність easting/northing у MGRS: {s!r}")
+    scale = 10.0 ** (5 - len(e))
+    zone = int(m.group("zone"))
+    if not 1 <= zone <= 60:
+        raise ValueError(f"Зона поза 1..60 у MGRS: {s!r}")
+    return (zone, m.group("band").upper(), m.group("col").upper(), m.group("row").upper(),
+            int(e) * scale, int(n) * scale)
+
+
+def mgrs_to_utm(values: Iterable[str], strict: bool = True) -> UTM:
+    """
+    Масив рядків MGRS ("37U DQ 32966 26558", "37UDQ3296626558", 1..5 цифр) -> UTM.
+    strict=False — невалідні рядки дають NaN замість ValueError.
+    """
+    values = list(values)
+    n = len(values)
+    zone = np.zeros(n, dtype=int)
+    northern = np.zeros(n, dtype=bool)
+    origin_e = np.full(n, np.nan)
+    origin_n = np.full(n, np.nan)
+    off_e = np.zeros(n)
+    off_n = np.zeros(n)
+    for i, s in enumerate(values):
+        try:
+            z, band, col, row, de, dn = _parse_one(s)
+            origin_e[i], origin_n[i] = square_origin(z, band, col, row)
+        except ValueError:
+            if strict:
+                raise
+            continue
+        zone[i], northern[i], off_e[i], off_n[i] = z, band >= "N", de, dn
+    return UTM(zone, northern, origin_e + off_e, origin_n + off_n)
+
+
+def mgrs_to_latlon(values: Iterable[str], strict: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Масив рядків MGRS -> (lat, lon) у градусах (південно-західний кут клітинки точності)."""
+    return utm_to_latlon(mgrs_to_utm(values, strict))
+
+
+def utm_to_mgrs(utm: UTM, lat, precision: int = 5) -> List[str]:
+    """UTM (+ широта для літери смуги) -> рядки "37U DQ 32966 26558"; precision — цифр на вісь (1..5)."""
+    bands = band_letters(lat)
+    div = 10 ** (5 - precision)
+    # округлення до 0.1 мм перед floor: MGRS -> lat/lon -> MGRS не втрачає метр на похибці float
+    e = np.floor(np.round(np.asarray(utm.easting, dtype=float), 4)).astype(np.int64)
+    n = np.floor(np.round(np.asarray(utm.northing, dtype=float), 4)).astype(np.int64)
+    out = []
+    for z, band, ei, ni in zip(utm.zone.tolist(), bands.tolist(), e.tolist(), n.tolist()):
+        col = COL_LETTERS[(z - 1) % 3][ei // 100_000 - 1]
+        row = ROW_LETTERS[(ni // 100_000 + (5 if z % 2 == 0 else 0)) % 20]
+        out.append(f"{z}{band} {col}{row} {(ei % 100_000) // div:0{precision}d} {(ni % 100_000) // div:0{precision}d}")
+    return out
+
+
+def latlon_to_mgrs(lat, lon, precision: int = 5) -> List[str]:
+    lat = np.asarray(lat, dtype=float)
+    return utm_to_mgrs(latlon_to_utm(lat, lon), lat, precision)
+
+
+# ---------- для записів пеленгів ----------
+def records_latlon(records: Sequence[Mapping[str, str]], key: str = "mgrs",
+                   strict: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """(lat, lon) для записів parse_whatsapp_text одним пакетним викликом; невалідні — NaN."""
+    return mgrs_to_latlon((rec.get(key, "") for rec in records), strict)
+
+
+def haversine_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Відстань по великому колу, м (сфера із середнім радіусом WGS84)."""
+    r = 6_371_008.8
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dp, dl = p2 - p1, np.radians(np.asarray(lon2) - np.asarray(lon1))
+    h = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * r * np.arcsin(np.sqrt(h))
@@ -1,19 +1,20 @@
 # -*- coding: utf-8 -*-
+from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk, messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
-
-# 1) використовуємо існуючі модулі з твого проєкту
-from src.reportgen.settings import load_config  # читаємо config.yml (freq_file, reports_dir тощо)
-from src.armorkit.data_loader import load_reference  # читаємо довідник XLSX
-from src.armorkit.normalize_freq import (
-    FREQ_NOT_FOUND,
-    get_true_freq_by_mask,
-    is_real_freq,
-)
+from typing import TYPE_CHECKING
+import logging
+
+# 1) модулі проєкту (pandas, довідник) імпортуються у фоновому потоці — вікно з'являється одразу
 from .mgrs import is_valid_mgrs
 
+if TYPE_CHECKING:
+    from .lookup import PelengLookup, Suggestion
+
+log = logging.getLogger(__name__)
+
 import re
 
 _space_re = re.compile(r"\s+")
@@ -48,6 +49,21 @@ def _sanitize_mgrs_line(line: str) -> str:
     return f"{t0} {t1} {d1} {d2}"
 
 
+def load_lookup(config_path: str = "config.yml") -> "PelengLookup":
+    """
+    config.yml -> довідник XLSX (з дискового кешу розпарсених XLSX, якщо запис є) -> індекс GUI.
+    Виконується у фоновому потоці GUI разом з імпортом pandas.
+    """
+    from src.reportgen.settings import load_config
+    from src.armorkit.data_loader import cache_for_config, load_reference
+    from src.armorkit.domain.reference_index import ReferenceIndex
+    from .lookup import PelengLookup
+
+    cfg = load_config(config_path)
+    reference_df = load_reference(cfg.paths.freq_file, cache_for_config(cfg))
+    return PelengLookup.from_reference(ReferenceIndex.from_frame(reference_df))
+
+
 FALLBACK_UNIT = "НВ підрозділу"
 FALLBACK_LOC  = "ТОРСЬКЕ"
 
@@ -60,32 +76,15 @@ def _norm3(s: str) -> str:
 def _norm4(s: str) -> str:
     return f"{float(str(s).replace(',', '.')):.4f}"
 
-def _resolve_unit_and_location(freq4: str, reference_df: pd.DataFrame) -> tuple[str, str]:
+def _resolve_unit_and_location(freq4: str, lookup: PelengLookup | None) -> tuple[str, str]:
     """
-    Пробуємо витягти Підрозділ + Зона функціонування з довідника.
+    Підрозділ + Зона функціонування з індексу довідника (dict-lookup).
     Якщо не знайдено — фолбеки.
     """
-    if reference_df is None or reference_df.empty:
+    if lookup is None:
         return FALLBACK_UNIT, FALLBACK_LOC
-
-    df = reference_df.copy()
-    # частоту в довіднику перетворимо у 4 знаки після коми для зіставлення
-    def _to4(x):
-        try:
-            return f"{float(str(x).replace(',', '.')):.4f}"
-        except Exception:
-            return None
-
-    df["__f4"] = df["Частота"].map(_to4) if "Частота" in df.columns else None
-    hit = df[df["__f4"] == freq4] if "__f4" in df.columns else df.iloc[0:0]
-
-    if hit.empty:
-        return FALLBACK_UNIT, FALLBACK_LOC
-
-    row = hit.iloc[0]
-    unit = str(row.get("Підрозділ", "")).strip() or FALLBACK_UNIT
-    loc  = str(row.get("Зона функціонування", "")).strip() or FALLBACK_LOC
-    return unit, loc
+    unit, loc = lookup.place(freq4)
+    return unit or FALLBACK_UNIT, loc or FALLBACK_LOC
 
 class Toast(ttk.Frame):
     def __init__(self, master, text: str, ms: int = 1200):
@@ -94,13 +93,20 @@ class Toast(ttk.Frame):
         self.after(ms, self.destroy)
 
 class App(ttk.Frame):
-    def __init__(self, master):
+    POLL_MS = 100
+
+    def __init__(self, master, config_path: str = "config.yml"):
         super().__init__(master, padding=12)
         self.pack(fill="both", expand=True)
 
-        # 1) Конфіг + довідник
-        cfg = load_config("config.yml")                 # шляхи беремо звідти
-        self.reference_df = load_reference(cfg.paths.freq_file)  # XLSX у DataFrame
+        # 1) Довідник вантажиться у фоні (start_loading); до готовності lookup = None
+        self.config_path = config_path
+        self.lookup: PelengLookup | None = None
+        self._suggestions: list[Suggestion] = []
+        self._suggest_muted = False
+        self.ref_status = tk.StringVar(value="Довідник: завантаження…")
+        self._ref_future: Future | None = None
+        self._accept_pending = False
 
         # 2) Побудова UI за твоїм ескізом
         self.date = tk.StringVar(value=fmt_date_now())
@@ -116,13 +122,27 @@ class App(ttk.Frame):
         ttk.Label(r1, text="Час").pack(side="left")
         ttk.Entry(r1, textvariable=self.time, width=8).pack(side="left", padx=(4,12))
         ttk.Button(r1, text="C", width=3, command=lambda: (self.date.set(fmt_date_now()), self.time.set(fmt_time_now()))).pack(side="left")
+        self.ref_label = ttk.Label(r1, textvariable=self.ref_status, foreground="#a60")
+        self.ref_label.pack(side="right")
 
         # ряд 2: частота/маска + Прийняти
         r2 = ttk.Frame(self); r2.pack(fill="x", pady=(10,0))
         ttk.Label(r2, text="Частота/Маска").pack(side="left")
-        ttk.Entry(r2, textvariable=self.freq, width=12).pack(side="left", padx=(4,12))
+        self.freq_entry = ttk.Entry(r2, textvariable=self.freq, width=12)
+        self.freq_entry.pack(side="left", padx=(4,12))
         ttk.Button(r2, text="Прийняти", command=self.accept_freq).pack(side="left")
 
+        # підказки масок/частот за префіксом (з'являються під полем, поки оператор друкує)
+        self.suggest_box = tk.Listbox(self, height=6, activestyle="dotbox", exportselection=False)
+        self._suggest_anchor = r2
+        self.freq.trace_add("write", lambda *_: self._update_suggestions())
+        self.freq_entry.bind("<Return>", lambda e: self.accept_freq())
+        self.freq_entry.bind("<Down>", self._focus_suggestions)
+        self.freq_entry.bind("<Escape>", lambda e: self._hide_suggestions())
+        self.suggest_box.bind("<Return>", self._pick_suggestion)
+        self.suggest_box.bind("<Double-Button-1>", self._pick_suggestion)
+        self.suggest_box.bind("<Escape>", lambda e: (self._hide_suggestions(), self.freq_entry.focus_set()))
+
         # ряд 3: unit + location
         r3 = ttk.Frame(self); r3.pack(fill="x", pady=(10,0))
         ttk.Label(r3, text="Підрозділ").pack(side="left")
@@ -152,6 +172,83 @@ class App(ttk.Frame):
         ttk.Button(btns, text="Копіювати", command=self.copy_output).pack(side="left", padx=8)
         ttk.Button(btns, text="Вихід", command=self.master.destroy).pack(side="right")
         
+    # ---------- довідник у фоні ----------
+    def start_loading(self):
+        """Запускає читання довідника в окремому потоці; результат забирає _poll_reference (потік Tk)."""
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reference")
+        self._ref_future = pool.submit(load_lookup, self.config_path)
+        pool.shutdown(wait=False)
+        self.after(self.POLL_MS, self._poll_reference)
+
+    def _poll_reference(self):
+        fut = self._ref_future
+        if fut is None or not fut.done():
+            self.after(self.POLL_MS, self._poll_reference)
+            return
+        try:
+            self.lookup = fut.result()
+        except Exception as e:
+            # без довідника GUI працює далі: підрозділ/location — фолбеки
+            self.ref_status.set("Довідник: помилка (див. консоль)")
+            self.ref_label.configure(foreground="#c00")
+            log.warning("Не вдалося завантажити довідник: %s", e, exc_info=e)
+        else:
+            self.ref_status.set(f"Довідник: готово ({len(self.lookup.places)} мереж)")
+            self.ref_label.configure(foreground="#0a5")
+        if self._accept_pending:
+            self._accept_pending = False
+            self.accept_freq()
+        else:
+            self._update_suggestions()
+
+    # ---------- підказки ----------
+    def _update_suggestions(self):
+        if self._suggest_muted or self.lookup is None:
+            return
+        self._suggestions = self.lookup.suggest(self.freq.get())
+        # точний збіг єдиної підказки нічого не додає — ховаємо
+        if not self._suggestions or (len(self._suggestions) == 1
+                                     and self._suggestions[0].key == self.freq.get().strip()):
+            self._hide_suggestions()
+            return
+        self.suggest_box.delete(0, "end")
+        for s in self._suggestions:
+            self.suggest_box.insert("end", s.label())
+        self.suggest_box.configure(height=len(self._suggestions))
+        if not self.suggest_box.winfo_ismapped():
+            self.suggest_box.pack(after=self._suggest_anchor, fill="x", pady=(2, 0))
+
+    def _hide_suggestions(self):
+        self._suggestions = []
+        if self.suggest_box.winfo_ismapped():
+            self.suggest_box.pack_forget()
+
+    def _focus_suggestions(self, event=None):
+        if self._suggestions:
+            self.suggest_box.focus_set()
+            self.suggest_box.selection_clear(0, "end")
+            self.suggest_box.selection_set(0)
+            self.suggest_box.activate(0)
+        return "break"
+
+    def _pick_suggestion(self, event=None):
+        sel = self.suggest_box.curselection()
+        if not sel or sel[0] >= len(self._suggestions):
+            return "break"
+        self._set_freq(self._suggestions[sel[0]].key)
+        self._hide_suggestions()
+        self.freq_entry.focus_set()
+        self.accept_freq()
+        return "break"
+
+    def _set_freq(self, value: str):
+        # програмна зміна поля не повинна знову відкривати підказки
+        self._suggest_muted = True
+        try:
+            self.freq.set(value)
+        finally:
+            self._suggest_muted = False
+
     def _install_clipboard_shortcuts(self):
         """Глобальні шорткати для Copy/Cut/Paste в активне поле."""
         def _gen(seq):
@@ -207,6 +304,16 @@ class App(ttk.Frame):
             messagebox.showinfo("Інфо", "Введіть частоту або маску.")
             return
 
+        if self._ref_future is not None and not self._ref_future.done():
+            # довідник ще читається — підставимо підрозділ/location, щойно він буде готовий
+            self._accept_pending = True
+            self.ref_status.set("Довідник: завантаження… (частоту буде прийнято автоматично)")
+            return
+
+        # вже завантажено фоновим потоком — імпорт миттєвий
+        from src.armorkit.normalize_freq import FREQ_NOT_FOUND, is_real_freq
+        self._hide_suggestions()
+
         # Реальна частота?
         if is_real_freq(raw):
             try:
@@ -216,10 +323,10 @@ class App(ttk.Frame):
                 return
 
             # підставляємо саме ЧАСТОТУ в поле (логічно для real freq)
-            self.freq.set(freq4)
+            self._set_freq(freq4)
 
             # підтягнути unit/location
-            unit, loc = _resolve_unit_and_location(freq4, self.reference_df)
+            unit, loc = _resolve_unit_and_location(freq4, self.lookup)
             self.unit.set(unit or FALLBACK_UNIT)
             self.location.set(loc or FALLBACK_LOC)
             return
@@ -231,8 +338,8 @@ class App(ttk.Frame):
             messagebox.showwarning("Помилка", "Невірний формат маски.")
             return
 
-        # шукаємо справжню частоту за маскою (щоб підставити unit/location)
-        true_f = get_true_freq_by_mask(mask3, self.reference_df)
+        # шукаємо справжню частоту за маскою (щоб підставити unit/location) — dict-lookup в індексі
+        true_f = self.lookup.freq_by_mask.get(mask3, FREQ_NOT_FOUND) if self.lookup is not None else FREQ_NOT_FOUND
         if true_f != FREQ_NOT_FOUND:
             try:
                 freq4 = _norm4(true_f)
@@ -242,11 +349,11 @@ class App(ttk.Frame):
             freq4 = None
 
         # УВАГА: у полі лишаємо МАСКУ (а не частоту)
-        self.freq.set(mask3)
+        self._set_freq(mask3)
 
         # unit/location за знайденою частотою (якщо є), інакше фолбеки
         if freq4:
-            unit, loc = _resolve_unit_and_location(freq4, self.reference_df)
+            unit, loc = _resolve_unit_and_location(freq4, self.lookup)
             self.unit.set(unit or FALLBACK_UNIT)
             self.location.set(loc or FALLBACK_LOC)
         else:
@@ -310,7 +417,10 @@ def main():
     root = tk.Tk()
     root.title("peleng-gen • Формувач повідомлення")
     root.geometry("820x720")
-    App(root)
+    app = App(root)
+    # спершу показуємо вікно, потім — важкі імпорти і довідник у фоні
+    root.update_idletasks()
+    app.start_loading()
     root.mainloop()
 
 if __name__ == "__main__":
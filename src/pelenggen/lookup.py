@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Індекс довідника для GUI: маска -> частота, частота -> (підрозділ, location) і підказки
+за префіксом. Будується один раз у фоновому потоці з ReferenceIndex; далі — лише dict
+і bisect по відсортованому списку ключів, без pandas на кожне натискання клавіші.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import math
+
+from src.armorkit.domain.freqnorm import freq4_str
+
+if TYPE_CHECKING:
+    from src.armorkit.domain.reference_index import ReferenceIndex
+
+UNIT_COL = "Підрозділ"
+LOCATION_COL = "Зона функціонування"
+SUGGEST_LIMIT = 8
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    key: str            # те, що підставляється в поле (маска або частота)
+    freq4: str          # справжня частота
+    name: str           # назва радіомережі
+    is_mask: bool
+
+    def label(self) -> str:
+        if self.is_mask:
+            return f"{self.key}  →  {self.freq4}   {self.name}"
+        return f"{self.key}   {self.name}"
+
+
+def _clean(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value).strip()
+
+
+def normalize_prefix(text: str) -> str:
+    """Введене оператором -> префікс ключа: без пробілів, кома як крапка."""
+    return (text or "").strip().replace(",", ".")
+
+
+@dataclass
+class PelengLookup:
+    """
+    freq_by_mask — mask3 -> частота, 4 знаки (перший збіг, як у MaskIndex)
+    places       — freq4 -> (підрозділ, location); порожні значення — ""
+    names        — freq4 -> назва радіомережі
+    keys/items   — відсортовані ключі підказок (маски і частоти) і відповідні Suggestion
+    """
+    freq_by_mask: Dict[str, str] = field(default_factory=dict)
+    places: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    names: Dict[str, str] = field(default_factory=dict)
+    keys: List[str] = field(default_factory=list)
+    items: List[Suggestion] = field(default_factory=list)
+
+    @classmethod
+    def from_reference(cls, idx: "ReferenceIndex") -> "PelengLookup":
+        frame = idx.frame
+        units = frame[UNIT_COL].tolist() if UNIT_COL in frame.columns else None
+        locs = frame[LOCATION_COL].tolist() if LOCATION_COL in frame.columns else None
+
+        by_mask3 = idx.masks.by_mask3 if idx.masks is not None else {}
+        out = cls(freq_by_mask={m: freq4_str(f) or f for m, f in by_mask3.items()}, names=dict(idx.names))
+        for f, pos in idx.rows.items():
+            out.places[f] = (_clean(units[pos]) if units else "", _clean(locs[pos]) if locs else "")
+
+        entries = [Suggestion(f, f, out.names.get(f, "—"), False) for f in idx.rows]
+        entries += [Suggestion(m, f, out.names.get(f, "—"), True) for m, f in out.freq_by_mask.items()
+                    if f in idx.rows]  # маски без частоти в довіднику не підказуємо
+        entries.sort(key=lambda s: (s.key, not s.is_mask))
+        out.keys = [s.key for s in entries]
+        out.items = entries
+        return out
+
+    def place(self, freq4: str) -> Tuple[Optional[str], Optional[str]]:
+        unit, loc = self.places.get(freq4, ("", ""))
+        return unit or None, loc or None
+
+    def suggest(self, text: str, limit: int = SUGGEST_LIMIT) -> List[Suggestion]:
+        """Маски/частоти, що починаються з введеного (bisect по відсортованих ключах)."""
+        prefix = normalize_prefix(text)
+        if not prefix:
+            return []
+        out: List[Suggestion] = []
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and len(out) < limit and self.keys[i].startswith(prefix):
+            out.append(self.items[i])
+            i += 1
+        return out
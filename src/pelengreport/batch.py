@@ -0,0 +1,168 @@
+# src/pelengreport/batch.py
+"""
+Пакетний режим: експорти чатів кількох операторів (каталог / маска / файли) парсяться
+паралельно в пулі процесів, однакові пеленги (freq_or_mask, dt, mgrs) відкидаються,
+результат — одна зведена Форма 1.2.15 + статистика по кожному файлу.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from glob import glob
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+import argparse
+import os
+import time
+
+from .clusters import ClusterParams
+from .parser import DT_FORMAT, Record, parse_whatsapp_file
+from .report import build_docx
+from .runner import output_path
+
+RecordKey = Tuple[str, str, str]
+
+
+@dataclass
+class FileStats:
+    path: Path
+    records: int = 0        # усього пеленгів у файлі
+    unique: int = 0         # нових (не бачених у попередніх файлах)
+    seconds: float = 0.0    # час парсингу у воркері
+
+    @property
+    def duplicates(self) -> int:
+        return self.records - self.unique
+
+
+def record_key(rec: Record) -> RecordKey:
+    return rec["freq_or_mask"], rec["dt"], rec["mgrs"]
+
+
+def expand_inputs(inputs: Iterable[str | Path]) -> List[Path]:
+    """Каталоги (*.txt у них), маски glob і шляхи до файлів -> унікальні файли, відсортовані за іменем."""
+    files: set[Path] = set()
+    for item in inputs:
+        p = Path(item)
+        if p.is_dir():
+            files.update(f for f in p.iterdir() if f.is_file() and f.suffix.lower() == ".txt")
+        elif p.is_file():
+            files.add(p)
+        else:
+            files.update(Path(f) for f in glob(str(item)) if Path(f).is_file())
+    return sorted((f.resolve() for f in files), key=lambda f: (f.name, str(f)))
+
+
+@dataclass
+class ParsedFile:
+    records: List[Record]   # без повторів у межах файлу (порядок першої появи)
+    total: int              # скільки пеленгів було у файлі разом з повторами
+    seconds: float
+
+
+def _parse_file(path: Path) -> ParsedFile:
+    # повтори в межах файлу відкидаємо ще у воркері — менше записів іде назад через pickle
+    t0 = time.perf_counter()
+    seen: set[RecordKey] = set()
+    records: List[Record] = []
+    total = 0
+    for rec in parse_whatsapp_file(path):
+        total += 1
+        key = record_key(rec)
+        if key not in seen:
+            seen.add(key)
+            records.append(rec)
+    return ParsedFile(records, total, time.perf_counter() - t0)
+
+
+def parse_files(files: Sequence[Path], workers: int | None = None) -> List[ParsedFile]:
+    """Парсить файли паралельно (workers=1 — послідовно); результат — у порядку files."""
+    workers = workers or min(len(files), os.cpu_count() or 1)
+    if workers <= 1 or len(files) <= 1:
+        return [_parse_file(f) for f in files]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_parse_file, files))
+
+
+def _sort_key(rec: Record):
+    try:
+        return 0, datetime.strptime(rec["dt"], DT_FORMAT)
+    except ValueError:
+        return 1, datetime.min
+
+
+def merge_records(files: Sequence[Path],
+                  parsed: Sequence[ParsedFile]) -> Tuple[List[Record], List[FileStats]]:
+    """
+    Зливає записи всіх файлів без дублікатів (перший бачений запис лишається) і
+    впорядковує за часом пеленга (стабільно: однаковий час — у порядку файлів).
+    """
+    seen: set[RecordKey] = set()
+    merged: List[Record] = []
+    stats: List[FileStats] = []
+    for path, pf in zip(files, parsed):
+        st = FileStats(path, records=pf.total, seconds=pf.seconds)
+        for rec in pf.records:
+            key = record_key(rec)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(rec)
+            st.unique += 1
+        stats.append(st)
+    merged.sort(key=_sort_key)
+    return merged, stats
+
+
+def format_stats(stats: Sequence[FileStats], total_seconds: float) -> str:
+    lines = [f"{'файл':<40}{'пеленгів':>10}{'нових':>8}{'дублів':>8}{'час, с':>9}"]
+    for st in stats:
+        lines.append(f"{st.path.name[:39]:<40}{st.records:>10}{st.unique:>8}{st.duplicates:>8}{st.seconds:>9.3f}")
+    lines.append(f"{'РАЗОМ':<40}{sum(s.records for s in stats):>10}{sum(s.unique for s in stats):>8}"
+                 f"{sum(s.duplicates for s in stats):>8}{total_seconds:>9.3f}")
+    return "\n".join(lines)
+
+
+def run_batch(inputs: Iterable[str | Path], out_dir: Path | None = None,
+              workers: int | None = None,
+              clusters: ClusterParams | None = None) -> Tuple[Path, List[FileStats]]:
+    files = expand_inputs(inputs)
+    if not files:
+        raise FileNotFoundError("Не знайдено жодного експорту *.txt за вказаними шляхами/масками")
+
+    t0 = time.perf_counter()
+    print(f"[i] Batch: {len(files)} файл(ів)")
+    merged, stats = merge_records(files, parse_files(files, workers))
+    out_path = output_path(out_dir)
+    build_docx(merged, out_path, clusters)
+
+    print(format_stats(stats, time.perf_counter() - t0))
+    print(f"[OK] Report saved to: {out_path}")
+    return out_path, stats
+
+
+def add_cluster_args(ap: argparse.ArgumentParser) -> None:
+    d = ClusterParams()
+    ap.add_argument("--radius", type=float, default=d.radius_m,
+                    help=f"радіус району, м (за замовчуванням {d.radius_m:g})")
+    ap.add_argument("--window", type=float, default=d.window_h,
+                    help=f"вікно часу району, год; 0 — без обмеження (за замовчуванням {d.window_h:g})")
+    ap.add_argument("--min-fixes", type=int, default=d.min_fixes,
+                    help=f"мінімум пеленгів у підтвердженому районі (за замовчуванням {d.min_fixes})")
+
+
+def cluster_params(args: argparse.Namespace) -> ClusterParams:
+    return ClusterParams(args.radius, args.window or None, args.min_fixes)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.pelengreport.runner --batch",
+                                 description="Зведена Форма 1.2.15 з кількох експортів WhatsApp")
+    ap.add_argument("inputs", nargs="+", help="каталоги з *.txt, маски (data/*.txt) або файли")
+    ap.add_argument("--out-dir", default=None, help="куди зберегти DOCX (за замовчуванням <repo>/build)")
+    ap.add_argument("--workers", type=int, default=None, help="процесів для парсингу (1 = послідовно)")
+    add_cluster_args(ap)
+    args = ap.parse_args(argv)
+    run_batch(args.inputs, Path(args.out_dir) if args.out_dir else None, args.workers,
+              cluster_params(args))
+    return 0
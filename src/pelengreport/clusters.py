@@ -0,0 +1,222 @@
+# src/pelengreport/clusters.py
+"""
+Викриті (підтверджені) райони для розділу 3: пеленги однієї частоти/маски, що лежать
+ближче radius_m один до одного і розділені в часі не більше ніж window_h, зливаються
+в один район (single-linkage). Сусідів шукаємо через просторово-часовий хеш — клітинки
+~radius_m x radius_m x window_h, перевіряються лише сусідні клітинки, — тож замість
+O(n²) попарних відстаней маємо майже лінійний час на реальних даних.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.pelenggen.geo import UTM, latlon_to_utm, records_latlon, utm_to_latlon, utm_to_mgrs, utm_zone
+from .parser import DT_FORMAT
+
+EARTH_R = 6_371_008.8
+SQRT2 = 2 ** 0.5
+# зсуви сусідніх клітинок (dt, dx, dy): радіус r — до двох клітинок r/√2 у кожен бік, кутові
+# (±2, ±2) віддалені щонайменше на r; беремо лише половину (> 0) — пара перевіряється один раз
+_SPATIAL = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if abs(dx) + abs(dy) < 4]
+OFFSETS = [(dt, dx, dy) for dt in (-1, 0, 1) for dx, dy in _SPATIAL if (dt, dx, dy) > (0, 0, 0)]
+
+@dataclass
+class ClusterParams:
+    radius_m: float = 1000.0            # пеленги ближче за це — один район
+    window_h: Optional[float] = 24.0    # None — без обмеження за часом
+    min_fixes: int = 2                  # з якої кількості пеленгів район вважається підтвердженим
+
+
+@dataclass
+class Cluster:
+    freq_or_mask: str
+    fixes: int
+    lat: float                  # центр району (середнє координат пеленгів)
+    lon: float
+    mgrs: str
+    first_dt: str
+    last_dt: str
+
+
+def _hours(dt: str) -> float:
+    """Час пеленга в годинах від епохи; NaN — якщо дата не розбирається."""
+    try:
+        return datetime.strptime(dt, DT_FORMAT).timestamp() / 3600.0
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _time_key(h: float) -> Tuple[bool, float]:
+    # пеленги без дати — в кінець (NaN не можна порівнювати напряму)
+    return (True, 0.0) if np.isnan(h) else (False, h)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _close(a: List[int], b: List[int], xs: List[float], ys: List[float], hs: List[float],
+           timed: List[bool], r2: float, window: float) -> bool:
+    """Чи є в клітинках a і b пара точок, ближчих за r (і за часом — у межах window)."""
+    for i in a:
+        for j in b:
+            if (xs[i] - xs[j]) ** 2 + (ys[i] - ys[j]) ** 2 <= r2 \
+                    and (not timed[i] or abs(hs[i] - hs[j]) <= window):
+                return True
+    return False
+
+
+def cluster_labels(freqs: Sequence[str], lat: np.ndarray, lon: np.ndarray, hours: np.ndarray,
+                   params: ClusterParams) -> np.ndarray:
+    """
+    Мітка району для кожного пеленга (-1 — без координат). Точки переводяться в локальну
+    рівнопроміжну проекцію (метри), клітинка — (частота, x//(r/√2), y//(r/√2), t//window).
+    Пеленги без дати (або window_h=None) групуються лише за відстанню — в окремому шарі.
+    """
+    n = len(freqs)
+    labels = np.full(n, -1, dtype=int)
+    ok = ~(np.isnan(lat) | np.isnan(lon))
+    if not ok.any():
+        return labels
+
+    # Клітинка зі стороною r/√2 і шаром часу window: будь-які дві точки однієї клітинки
+    # гарантовано зв'язані, тож union-find ведемо по клітинках. Ключ клітинки — одне int64
+    # (щільний номер шару "частота+час" і зсунуті x, y), сусідів для кожного зсуву шукаємо
+    # векторно через searchsorted по відсортованих ключах; точкову перевірку "є пара ближче r"
+    # у Python робимо лише для пар клітинок, де хоч в одній більше однієї точки.
+    idx = np.flatnonzero(ok)
+    r = float(params.radius_m)
+    size = r / SQRT2
+    lat0 = np.radians(np.mean(lat[idx]))
+    y = np.radians(lat[idx]) * EARTH_R
+    x = np.radians(lon[idx]) * EARTH_R * np.cos(lat0)
+    h = hours[idx]
+    timed = ~np.isnan(h) if params.window_h is not None else np.zeros(len(idx), dtype=bool)
+    window = float(params.window_h or 1.0)
+
+    _, fcode = np.unique(np.asarray(freqs, dtype=object)[idx].astype(str), return_inverse=True)
+    ct = np.where(timed, np.floor(np.nan_to_num(h) / window), 0).astype(np.int64)
+    layer_rows = np.stack([fcode.astype(np.int64), timed.astype(np.int64), ct], axis=1)
+    layers, layer = np.unique(layer_rows, axis=0, return_inverse=True)
+    layer = layer.reshape(-1)
+    layer_id = {tuple(row): k for k, row in enumerate(layers.tolist())}
+    # сусідній шар у часі (dt = -1/0/1); для шарів без дати — лише сам шар
+    shift = np.full((len(layers), 3), -1, dtype=np.int64)
+    for k, (fc, tm, t) in enumerate(layers.tolist()):
+        for dt in (-1, 0, 1):
+            if tm or dt == 0:
+                shift[k, dt + 1] = layer_id.get((fc, tm, t + dt), -1)
+
+    ix = np.floor(x / size).astype(np.int64)
+    iy = np.floor(y / size).astype(np.int64)
+    ix -= ix.min() - 2
+    iy -= iy.min() - 2
+    width, height = int(ix.max()) + 3, int(iy.max()) + 3
+    pkey = (layer * width + ix) * height + iy
+    ckeys, cell = np.unique(pkey, return_inverse=True)
+    cell = cell.reshape(-1)
+    n_cells = len(ckeys)
+    counts = np.bincount(cell, minlength=n_cells)
+    rep = np.empty(n_cells, dtype=np.int64)
+    rep[cell[::-1]] = np.arange(len(cell))[::-1]          # перша точка кожної клітинки
+    c_layer, c_ix, c_iy = layer[rep], ix[rep], iy[rep]
+
+    pairs_a, pairs_b = [], []
+    for dt, dx, dy in OFFSETS:
+        nb_layer = shift[c_layer, dt + 1]
+        nb_key = (nb_layer * width + c_ix + dx) * height + c_iy + dy
+        pos = np.minimum(np.searchsorted(ckeys, nb_key), n_cells - 1)
+        hit = (nb_layer >= 0) & (ckeys[pos] == nb_key)
+        pairs_a.append(np.flatnonzero(hit))
+        pairs_b.append(pos[hit])
+    pa = np.concatenate(pairs_a)
+    pb = np.concatenate(pairs_b)
+
+    # пари одноточкових клітинок — перевірка повністю векторна
+    single = (counts[pa] == 1) & (counts[pb] == 1)
+    i, j = rep[pa[single]], rep[pb[single]]
+    near = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 <= r * r
+    near &= ~timed[i] | (np.abs(h[i] - h[j]) <= window)
+    edges = list(zip(pa[single][near].tolist(), pb[single][near].tolist()))
+
+    parent = list(range(n_cells))
+    for a, b in edges:
+        ra, rb = _find(parent, a), _find(parent, b)
+        if ra != rb:
+            parent[ra] = rb
+
+    multi_a, multi_b = pa[~single].tolist(), pb[~single].tolist()
+    if multi_a:
+        order = np.argsort(cell, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)]).tolist()
+        members = order.tolist()
+        xs, ys, hs, ts = x.tolist(), y.tolist(), h.tolist(), timed.tolist()
+        r2 = r * r
+        for a, b in zip(multi_a, multi_b):
+            ra, rb = _find(parent, a), _find(parent, b)
+            if ra == rb:
+                continue
+            if _close(members[starts[a]:starts[a + 1]], members[starts[b]:starts[b + 1]],
+                      xs, ys, hs, ts, r2, window):
+                parent[ra] = rb
+
+    roots = np.array([_find(parent, c) for c in range(n_cells)])
+    _, dense = np.unique(roots, return_inverse=True)
+    labels[idx] = dense.reshape(-1)[cell]
+    return labels
+
+
+def cluster_records(records: Sequence[Mapping[str, str]],
+                    params: ClusterParams | None = None) -> List[Cluster]:
+    """Підтверджені райони (fixes >= min_fixes) за частотою, далі — за часом першого пеленга."""
+    params = params or ClusterParams()
+    if not records:
+        return []
+    freqs = [str(rec.get("freq_or_mask", "")) for rec in records]
+    dts = [str(rec.get("dt", "")) for rec in records]
+    lat, lon = records_latlon(records)
+    hours = np.array([_hours(d) for d in dts])
+    labels = cluster_labels(freqs, lat, lon, hours, params)
+
+    k = int(labels.max()) + 1
+    if k == 0:
+        return []
+    valid = labels >= 0
+    counts = np.bincount(labels[valid], minlength=k)
+    keep = np.flatnonzero(counts >= params.min_fixes)
+    if not len(keep):
+        return []
+    # центр — середнє в UTM (зона — за центром району), щоб не зміщуватися на збіжності меридіанів
+    lb, la, lo = labels[valid], lat[valid], lon[valid]
+    m_lat = np.bincount(lb, weights=la, minlength=k) / counts
+    m_lon = np.bincount(lb, weights=lo, minlength=k) / counts
+    zone = utm_zone(m_lat, m_lon)
+    utm = latlon_to_utm(la, lo, zone=zone[lb])
+    centre = UTM(zone[keep], m_lat[keep] >= 0,
+                 np.bincount(lb, weights=utm.easting, minlength=k)[keep] / counts[keep],
+                 np.bincount(lb, weights=utm.northing, minlength=k)[keep] / counts[keep])
+    c_lat, c_lon = utm_to_latlon(centre)
+    c_mgrs = utm_to_mgrs(centre, c_lat)
+
+    members: Dict[int, List[int]] = defaultdict(list)
+    for i, label in enumerate(labels.tolist()):
+        members[label].append(i)
+
+    out: List[Cluster] = []
+    for pos, label in enumerate(keep.tolist()):
+        idx = members[label]
+        times = sorted(idx, key=lambda i: _time_key(hours[i]))
+        out.append(Cluster(freqs[idx[0]], int(counts[label]), float(c_lat[pos]), float(c_lon[pos]),
+                           c_mgrs[pos], dts[times[0]], dts[times[-1]]))
+    out.sort(key=lambda c: (c.freq_or_mask, _time_key(_hours(c.first_dt))))
+    return out
+
+
+__all__ = ["ClusterParams", "Cluster", "cluster_labels", "cluster_records"]
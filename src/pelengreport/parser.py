@@ -1,13 +1,32 @@
 # src/pelengreport/parser.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple
 import re
 
 HDR = re.compile(
     r"Пеленг\s+РЕР_63:\s*(?P<val>\d+(?:\.\d+)?)\s*/\s*(?P<date>\d{2}\.\d{2}\.\d{4})\s+(?P<time>\d{1,2}[:.]\d{2})",
     re.IGNORECASE,
 )
+# формат поля "dt" у записах (norm_time завжди дає секунди)
+DT_FORMAT = "%d.%m.%Y %H:%M:%S"
 SPACE_RE = re.compile(r"\s+")
 MGRS_LAST_TWO_5 = re.compile(r"^\d{5}$")
 
+# Один прохід regex на рядок: заголовок (будь-де в рядку — через lookahead, як HDR.search),
+# порожній рядок або MGRS (4+ токени, два останні — по 5 цифр; як sanitize_mgrs).
+LINE_RE = re.compile(
+    r"^(?:(?=.*?(?P<hdr>(?i:" + HDR.pattern + r")))"
+    r"|(?P<blank>\s*$)"
+    r"|\s*(?P<t0>\S+)\s+(?P<t1>\S+)\s(?:.*\s)?(?P<d1>\d{5})\s+(?P<d2>\d{5})\s*$)"
+)
+
+# види рядків
+HEADER, MGRS, BLANK, TEXT = "header", "mgrs", "blank", "text"
+
+Record = Dict[str, str]
+
+
 def norm_time(t: str) -> str:
     t = t.strip().replace(".", ":")
     if len(t) == 4 and t[1] == ":":
@@ -26,52 +45,65 @@ def sanitize_mgrs(line: str) -> str:
         raise ValueError("Цифрові блоки мають бути по 5 цифр")
     return f"{t0} {t1} {d1} {d2}"
 
-def parse_whatsapp_text(lines: list[str]):
-    """Один заголовок → 1..N MGRS; кожна координата окремим записом."""
-    def looks_like_header(s: str) -> bool: return bool(HDR.search(s))
-    def looks_like_mgrs(s: str) -> bool:
-        try:
-            sanitize_mgrs(s); return True
-        except Exception:
-            return False
+def classify_line(line: str) -> Tuple[str, re.Match | None]:
+    """(вид рядка, match). Для MGRS нормалізований рядок — mgrs_of(match)."""
+    s = line.strip()
+    if not s:
+        return BLANK, None
+    # дешевий фільтр перед regex: заголовок обов'язково містить "_63:" (регістр не важить),
+    # MGRS закінчується цифрою; решта (звичайні повідомлення чату) — текст без regex
+    if "_63:" not in s and not s[-1].isdecimal():
+        return TEXT, None
+    m = LINE_RE.match(line)
+    if m is None:
+        return TEXT, None
+    if m.group("hdr") is not None:
+        return HEADER, m
+    if m.group("blank") is not None:
+        return BLANK, m
+    return MGRS, m
 
-    i, n = 0, len(lines)
-    while i < n:
-        m = HDR.search(lines[i])
-        if not m:
-            i += 1
-            continue
-
-        freq_or_mask = m.group("val")
-        date_s = m.group("date")
-        time_s = norm_time(m.group("time"))
-        dt_s = f"{date_s} {time_s}"
+def mgrs_of(m: re.Match) -> str:
+    return f"{m.group('t0').upper()} {m.group('t1').upper()} {m.group('d1')} {m.group('d2')}"
 
-        # опис на наступному рядку (+ можливе склеювання ще одного)
-        i += 1
-        if i >= n: break
-        desc = lines[i].strip()
-        j = i + 1
-        if j < n and not looks_like_header(lines[j]) and not looks_like_mgrs(lines[j]):
-            desc = SPACE_RE.sub(" ", (desc + " " + lines[j].strip())).strip()
-            i = j
+def parse_whatsapp_text(lines: Iterable[str]) -> Iterator[Record]:
+    """
+    Один заголовок → 1..N MGRS; кожна координата окремим записом.
+    Потоковий автомат: кожен рядок класифікується рівно один раз, записи віддаються одразу,
+    lines може бути відкритим файлом (тоді в пам'яті лише поточний рядок).
+      заголовок → наступний рядок — опис (+ ще один, якщо це не заголовок і не MGRS)
+      → MGRS-рядки (порожні пропускаються) до першого рядка іншого виду.
+    """
+    state = "seek"
+    head: Tuple[str, str] = ("", "")     # (частота/маска, "дата час")
+    desc = ""
+    for line in lines:
+        kind, m = classify_line(line)
 
-        # збираємо 1..N MGRS
-        coords = []
-        k = i + 1
-        while k < n and not looks_like_header(lines[k]):
-            s = lines[k].strip()
-            if not s:
-                k += 1
+        if state == "desc":
+            # опис — завжди наступний рядок після заголовка
+            desc = line.strip()
+            state = "desc2"
+            continue
+        if state == "desc2":
+            state = "coords"
+            if kind in (TEXT, BLANK):
+                desc = SPACE_RE.sub(" ", (desc + " " + line.strip())).strip()
                 continue
-            try:
-                coords.append(sanitize_mgrs(s))
-            except Exception:
-                break
-            k += 1
+            # заголовок/MGRS — обробляємо нижче як звичайний рядок координат
+
+        if kind == HEADER:
+            head = (m.group("val"), f"{m.group('date')} {norm_time(m.group('time'))}")
+            state = "desc"
+        elif state == "coords":
+            if kind == MGRS:
+                yield {"freq_or_mask": head[0], "unit_desc": desc, "dt": head[1], "mgrs": mgrs_of(m)}
+            elif kind == TEXT:
+                state = "seek"
 
-        for mgrs in coords:
-            yield {"freq_or_mask": freq_or_mask, "unit_desc": desc, "dt": dt_s, "mgrs": mgrs}
-        i = k
+def parse_whatsapp_file(path: str | Path) -> Iterator[Record]:
+    """Записи з експорту WhatsApp, файл читається лениво (utf-8-sig — на випадок BOM)."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        yield from parse_whatsapp_text(f)
 
-__all__ = ["parse_whatsapp_text", "sanitize_mgrs", "norm_time"]
+__all__ = ["parse_whatsapp_text", "parse_whatsapp_file", "classify_line", "sanitize_mgrs", "norm_time"]
@@ -3,13 +3,15 @@
 from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Mapping
+from typing import Iterable, Mapping, Sequence
 
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_ALIGN_VERTICAL
 from docx.shared import Pt
 
+from src.armorkit.docxutils.tables import Cell, Col, add_xml_table
+from .clusters import Cluster, ClusterParams, cluster_records
+
 # -------------------- helpers (портовано зі старої версії) --------------------
 def _add_header(doc: Document, total_rows: int) -> None:
     # базовий стиль
@@ -38,33 +40,11 @@ def _add_header(doc: Document, total_rows: int) -> None:
     doc.add_paragraph("")
 
 
-def _set_cell(cell, text: str, bold: bool = False,
-              align=WD_ALIGN_PARAGRAPH.CENTER,
-              valign=WD_ALIGN_VERTICAL.CENTER):
-    cell.text = ""
-    lines = (text or "").split("\n")
-    if not lines:
-        lines = [""]
-
-    for i, line in enumerate(lines):
-        if i == 0:
-            p = cell.paragraphs[0] if cell.paragraphs else cell.add_paragraph("")
-            p.text = line
-        else:
-            p = cell.add_paragraph(line)
-        p.alignment = align
-        if p.runs:
-            p.runs[0].bold = bold
-    cell.vertical_alignment = valign
-
-
-def _add_body(doc: Document, total_pelengs: int) -> None:
+def _add_body(doc: Document, total_pelengs: int, areas: Sequence[Cluster] = ()) -> None:
     # 1. Склад сил і засобів…
     p = doc.add_paragraph("1. Склад сил і засобів, які розгорнуті для визначення місцеположення джерел (об’єктів) розвідки.")
     p.alignment = WD_ALIGN_PARAGRAPH.LEFT
 
-    tbl1 = doc.add_table(rows=1, cols=5)
-    tbl1.style = "Table Grid"
     hdrs1 = [
         "№ з/п",
         "Військова частина (підрозділ)",
@@ -72,27 +52,21 @@ def _add_body(doc: Document, total_pelengs: int) -> None:
         "Озброєння, військова техніка, яка залучена",
         "Хід виконання розвідувальних завдань",
     ]
-    for j, h in enumerate(hdrs1):
-        _set_cell(tbl1.rows[0].cells[j], h, bold=True)
-
-    row = tbl1.add_row()
-    merged = row.cells[2].merge(row.cells[3]).merge(row.cells[4])
-    _set_cell(row.cells[2], "3 АК", bold=True)
-    _set_cell(row.cells[0], ""); _set_cell(row.cells[1], "")
-
-    row = tbl1.add_row()
-    _set_cell(row.cells[0], "1.")
-    _set_cell(row.cells[1], "А3719\n(63 омбр)")
-    _set_cell(row.cells[2], "МІКОЛАЇВКА,\nБП №0000", align=WD_ALIGN_PARAGRAPH.LEFT)
-    _set_cell(row.cells[3], "“Пластун”")
-    _set_cell(row.cells[4], "Відповідно до плану бойового застосування", align=WD_ALIGN_PARAGRAPH.LEFT)
-
-    row = tbl1.add_row()
-    _set_cell(row.cells[0], "2.")
-    _set_cell(row.cells[1], "А3719\n(63 омбр)")
-    _set_cell(row.cells[2], "МАЯКИ,\nБП №0001", align=WD_ALIGN_PARAGRAPH.LEFT)
-    _set_cell(row.cells[3], "“Пластун”")
-    _set_cell(row.cells[4], "Відповідно до плану бойового застосування", align=WD_ALIGN_PARAGRAPH.LEFT)
+    add_xml_table(
+        doc,
+        [Col(align="center", vcenter=True), Col(align="center", vcenter=True),
+         Col(align="left", vcenter=True), Col(align="center", vcenter=True),
+         Col(align="left", vcenter=True)],
+        [
+            ("", "", Cell("3 АК", span=3, bold=True, align="center")),
+            ("1.", "А3719\n(63 омбр)", "МІКОЛАЇВКА,\nБП №0000", "“Пластун”",
+             "Відповідно до плану бойового застосування"),
+            ("2.", "А3719\n(63 омбр)", "МАЯКИ,\nБП №0001", "“Пластун”",
+             "Відповідно до плану бойового застосування"),
+        ],
+        header=[Cell(h, bold=True) for h in hdrs1],
+        split_lines=True,
+    )
 
     doc.add_paragraph("")
 
@@ -111,8 +85,6 @@ def _add_body(doc: Document, total_pelengs: int) -> None:
     )
     p.alignment = WD_ALIGN_PARAGRAPH.LEFT
 
-    tbl2 = doc.add_table(rows=1, cols=6)
-    tbl2.style = "Table Grid"
     hdrs2 = [
         "№ з/п",
         "Військова частина (підрозділ)",
@@ -121,29 +93,22 @@ def _add_body(doc: Document, total_pelengs: int) -> None:
         "Кількість отриманих пеленгів (напрямків)",
         "Примітка",
     ]
-    for j, h in enumerate(hdrs2):
-        _set_cell(tbl2.rows[0].cells[j], h, bold=True)
-
-    row = tbl2.add_row()
-    row.cells[2].merge(row.cells[3]).merge(row.cells[4])
-    _set_cell(row.cells[2], "3 АК", bold=True)
-    _set_cell(row.cells[0], ""); _set_cell(row.cells[1], ""); _set_cell(row.cells[5], "")
-
-    row = tbl2.add_row()
-    _set_cell(row.cells[0], "1.")
-    _set_cell(row.cells[1], "А3719\n(63 омбр)")
-    _set_cell(row.cells[2], "МІКОЛАЇВКА,\nБП №0000", align=WD_ALIGN_PARAGRAPH.LEFT)
-    _set_cell(row.cells[3], "“Пластун”")
-    _set_cell(row.cells[4], str(total_pelengs))
-    _set_cell(row.cells[5], "")
-
-    row = tbl2.add_row()
-    _set_cell(row.cells[0], "2.")
-    _set_cell(row.cells[1], "А3719\n(63 омбр)")
-    _set_cell(row.cells[2], "МАЯКИ,\nБП №0001", align=WD_ALIGN_PARAGRAPH.LEFT)
-    _set_cell(row.cells[3], "“Пластун”")
-    _set_cell(row.cells[4], "0")
-    _set_cell(row.cells[5], "")
+    add_xml_table(
+        doc,
+        [Col(align="center", vcenter=True), Col(align="center", vcenter=True),
+         Col(align="left", vcenter=True), Col(align="center", vcenter=True),
+         Col(align="center", vcenter=True), Col(align="center", vcenter=True)],
+        [
+            ("", "", Cell("3 АК", span=3, bold=True, align="center"), ""),
+            ("1.", "А3719\n(63 омбр)", "МІКОЛАЇВКА,\nБП №0000", "“Пластун”", str(total_pelengs),
+             f"Викрито районів: {len(areas)}"),
+            ("2.", "А3719\n(63 омбр)", "МАЯКИ,\nБП №0001", "“Пластун”", "0", ""),
+        ],
+        header=[Cell(h, bold=True) for h in hdrs2],
+        split_lines=True,
+    )
+    if areas:
+        _add_areas(doc, areas)
 
     doc.add_paragraph("")
     p = doc.add_paragraph("4. Результати визначення місцеположень джерел (об’єктів) розвідки.")
@@ -151,44 +116,50 @@ def _add_body(doc: Document, total_pelengs: int) -> None:
     doc.add_paragraph("")
 
 
+def _add_areas(doc: Document, areas: Sequence[Cluster]) -> None:
+    # викриті райони: центр — середнє координат пеленгів району
+    doc.add_paragraph("")
+    p = doc.add_paragraph("Викриті (підтверджені) райони:")
+    p.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    add_xml_table(
+        doc, [Col(align="center", vcenter=True)] * 6,
+        ((str(i), a.freq_or_mask, a.mgrs, str(a.fixes), a.first_dt, a.last_dt)
+         for i, a in enumerate(areas, 1)),
+        header=[Cell(h, bold=True) for h in
+                ("№", "Частота (МГц)", "Центр району", "Кількість пеленгів", "Перший пеленг", "Останній пеленг")],
+    )
+
+
 def _add_table(doc: Document, rows: Iterable[Mapping[str, str]]) -> None:
-    table = doc.add_table(rows=1, cols=5)
-    table.style = "Table Grid"
-    hdr = table.rows[0].cells
-    hdr[0].text = "№"
-    hdr[1].text = "Частота (МГц)"
-    hdr[2].text = "Назва підрозділу"
-    hdr[3].text = "Дата та час"
-    hdr[4].text = "Координати"
-
-    for i, rec in enumerate(rows, 1):
-        cells = table.add_row().cells
-        cells[0].text = str(i)
-        cells[1].text = str(rec.get("freq_or_mask", ""))  # маска або частота — як у джерелі
-        cells[2].text = str(rec.get("unit_desc", ""))
-        cells[3].text = str(rec.get("dt", ""))
-        cells[4].text = str(rec.get("mgrs", ""))
-
-    # центруємо де потрібно
-    for row in table.rows:
-        for j, cell in enumerate(row.cells):
-            cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            if j in (0, 1, 3, 4):
-                for pr in cell.paragraphs:
-                    pr.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-
-def build_docx(records: list[Mapping[str, str]], out_path: str | Path) -> Path:
+    # центруємо всі колонки, крім назви підрозділу
+    columns = [Col(align="center", vcenter=True), Col(align="center", vcenter=True),
+               Col(vcenter=True), Col(align="center", vcenter=True), Col(align="center", vcenter=True)]
+    add_xml_table(
+        doc, columns,
+        ((str(i),
+          str(rec.get("freq_or_mask", "")),  # маска або частота — як у джерелі
+          str(rec.get("unit_desc", "")),
+          str(rec.get("dt", "")),
+          str(rec.get("mgrs", "")))
+         for i, rec in enumerate(rows, 1)),
+        header=("№", "Частота (МГц)", "Назва підрозділу", "Дата та час", "Координати"),
+    )
+
+
+def build_docx(records: list[Mapping[str, str]], out_path: str | Path,
+               clusters: ClusterParams | None = None) -> Path:
     """
     Формує DOCX «як у попередній версії»: шапка, розділи 1–3 (як у твоєму старому звіті),
     «4. …» + таблиця з даними (1 координата = 1 рядок).
+    У розділі 3 — кількість викритих районів і їхні центри (clusters — радіус/вікно групування).
     """
     out_path = Path(out_path)
     doc = Document()
 
     total = len(records)  # для секції 3 (кількість пеленгів/напрямків)
+    areas = cluster_records(records, clusters)
     _add_header(doc, total_rows=total)
-    _add_body(doc, total_pelengs=total)
+    _add_body(doc, total_pelengs=total, areas=areas)
     _add_table(doc, records)
 
     # низ документа (підпис) — як у старій версії
@@ -5,7 +5,8 @@ from datetime import datetime
 import sys
 
 # імпорти відносно пакета
-from .parser import parse_whatsapp_text
+from .parser import parse_whatsapp_file
+from .clusters import ClusterParams
 from .report import build_docx
 
 def _repo_root() -> Path:
@@ -65,29 +66,30 @@ def _resolve_input_path(arg: str | None) -> Path:
     txt_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
     return txt_files[0]
 
-def run(input_txt: Path, out_dir: Path | None = None) -> Path:
-    root = _repo_root()
-    out_dir = Path(out_dir or (root / "build"))
+def output_path(out_dir: Path | None = None) -> Path:
+    """Вільне ім'я форми 1.2.15 на сьогодні в out_dir (за замовчуванням <repo>/build)."""
+    out_dir = Path(out_dir or (_repo_root() / "build"))
     out_dir.mkdir(parents=True, exist_ok=True)
-
     today = datetime.now().strftime("%d.%m.%Y")
-    out_path = _next_free_path(out_dir / f"форма_1.2.15 {today}.docx")
+    return _next_free_path(out_dir / f"форма_1.2.15 {today}.docx")
 
-    print(f"[i] Using input: {input_txt}")
-    with open(input_txt, "r", encoding="utf-8-sig") as f:   # <- utf-8-sig на випадок BOM з WhatsApp
-        lines = f.readlines()
-        
-    records = list(parse_whatsapp_text(lines))  # ← парсимо WhatsApp у список записів
-    build_docx(records, out_path)               # ← генеруємо DOCX «як у старій версії»
+def run(input_txt: Path, out_dir: Path | None = None, clusters: ClusterParams | None = None) -> Path:
+    out_path = output_path(out_dir)
 
+    print(f"[i] Using input: {input_txt}")
+    # файл читається потоково (utf-8-sig на випадок BOM з WhatsApp); у пам'яті — лише записи:
+    # їхня кількість потрібна для розділу 3 ще до таблиці
+    records = list(parse_whatsapp_file(input_txt))
+    build_docx(records, out_path, clusters)     # ← генеруємо DOCX «як у старій версії»
 
-    records = list(parse_whatsapp_text(lines))
-    build_docx(records, out_path)
-    
     print(f"[OK] Report saved to: {out_path}")
     return out_path
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        # python -m src.pelengreport.runner --batch <каталог|маска|файл> [...] [--workers N] [--radius М]
+        from .batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
     arg = sys.argv[1] if len(sys.argv) > 1 else None
     inp = _resolve_input_path(arg)
     run(inp)
@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 # from collections import OrderedDict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+import hashlib
 import re
 import pandas as pd
 
@@ -13,31 +16,28 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_ALIGN_VERTICAL, WD_ROW_HEIGHT
 from docx.shared import Pt
 
-from src.armorkit.dates import combine_date_time, parse_period_from_filename, format_for_filename
-from src.armorkit.domain.freqnorm import freq4_str
-from src.armorkit.domain.callsigns import build_callsign_str_for_freq
+from src.armorkit.dates import format_for_filename
+from src.armorkit.domain.callsigns import format_callsigns
 from src.armorkit.domain.reference import (
     get_network_name_by_freq,
     full_tag_for_group,
     read_reference_sheet,
 )
+from src.armorkit.domain.reference_index import ReferenceIndex
 
-from src.armorkit.domain.schema import message_columns, COL_FREQ, COL_DATE, COL_TIME, COL_WHO, COL_TO
 from src.armorkit.docxutils.images import insert_bearing_image
 from src.armorkit.docxutils.styles import set_base_styles, add_title
-from src.armorkit.docxutils.tables import set_col_widths, center_cell, vcenter, set_row_min_height
-from src.armorkit.domain.intercepts import network_is_empty
-from src.armorkit.docxutils.anchors import add_internal_link, bookmark
-
-from src.armorkit.data_loader import load_inputs
-from src.armorkit.normalize_freq import normalize_frequency_column, FREQ_NOT_FOUND
-from src.reportgen.grouping import (
-    unique_frequencies_with_counts,
-    group_frequencies_by_tag,
-)
-from src.reportgen.settings import load_config
+from src.armorkit.docxutils.tables import Cell, Col, add_xml_table
+from src.armorkit.domain.intercepts import InterceptSlices, network_is_empty
+from src.armorkit.docxutils.anchors import bookmark
+from src.armorkit.docxutils.merge import Fragment, body_fragment_xml, body_length, splice_body_xml
+from src.armorkit.docxutils.fragment_cache import FragmentCache
+
+from src.armorkit.data_loader import cache_for_config
+from src.reportgen.report_pipeline import PreparedInputs, prepare_inputs
 
 from src.armorkit.docxutils.safe_save import safe_save_docx
+from src.armorkit.instrument import stage, timed
 
 import logging
 
@@ -73,17 +73,33 @@ def _append_executor_block(doc: Document) -> None:
 
 
 
-def _render_frequency_section(doc: Document, freq4: str, count: int, li, cfg) -> None:
-    # Якір
-    title_p = doc.add_paragraph()
-    anchor = f"freq-{freq4.replace('.', '_')}"
-    bookmark(title_p, anchor)
+@dataclass
+class _SectionInputs:
+    """Усе, від чого залежить секція частоти (і ключ у кеші секцій)."""
+    freq4: str
+    title: str
+    purpose: str
+    nodes: str
+    calls: str
+    part: pd.DataFrame | None   # перехоплення з коментарями, відсортовані за часом
+    msg_col: str | None
+    cmt_col: str | None
+
+    def key(self) -> str:
+        """Хеш вмісту секції: однакові вхідні дані -> однаковий XML."""
+        h = hashlib.sha1(repr((SECTION_CACHE_VERSION, self.freq4, self.title, self.purpose, self.nodes,
+                               self.calls, self.msg_col, self.cmt_col)).encode("utf-8"))
+        if self.part is not None and not self.part.empty:
+            # значення колонок як є: hash_pandas_object на десяток рядків коштує більше за сам рендер
+            cols = [c for c in (self.msg_col, self.cmt_col) if c and c in self.part.columns]
+            h.update(repr([self.part[c].tolist() for c in cols]).encode("utf-8"))
+        return h.hexdigest()
 
-    # Заголовок
-    net_name = get_network_name_by_freq(freq4, li.reference_df)
-    run = title_p.add_run(f"[{freq4}] - {net_name} - ({count})")
-    run.bold = True
-    run.font.size = Pt(12)
+
+@timed(label=lambda freq4, *a, **kw: freq4)
+def _section_inputs(freq4: str, count: int, li, ref_idx: ReferenceIndex, slices: InterceptSlices,
+                    callsigns: dict[str, list[str]]) -> _SectionInputs:
+    net_name = get_network_name_by_freq(freq4, ref_idx)
 
     # Еталонка
     ref_sheet = read_reference_sheet(freq4, li.freq_path)
@@ -91,68 +107,74 @@ def _render_frequency_section(doc: Document, freq4: str, count: int, li, cfg) ->
 
     # Вузли: з головного листа; якщо порожньо — зі "Склад кореспондентів" еталонки
     nodes = "—"
-    if "Частота" in li.reference_df.columns:
-        df_ref = li.reference_df.copy()
-        df_ref["__f4"] = df_ref["Частота"].map(freq4_str)
-        m = df_ref[df_ref["__f4"] == freq4]
-        if not m.empty:
-            for col in ["Вузли зв’язку", "Вузли зв'язку", "Вузли", "Вузли звʹязку"]:
-                if col in m.columns and pd.notna(m.iloc[0][col]) and str(m.iloc[0][col]).strip():
-                    nodes = str(m.iloc[0][col]).strip()
-                    break
+    ref_row = ref_idx.row(freq4)
+    if ref_row is not None:
+        for col in ["Вузли зв’язку", "Вузли зв'язку", "Вузли", "Вузли звʹязку"]:
+            if col in ref_row.index and pd.notna(ref_row[col]) and str(ref_row[col]).strip():
+                nodes = str(ref_row[col]).strip()
+                break
     if nodes == "—":
         nodes = ref_sheet.get("Склад кореспондентів") or "—"
 
+    return _SectionInputs(
+        freq4=freq4,
+        title=f"[{freq4}] - {net_name} - ({count})",
+        purpose=purpose,
+        nodes=nodes,
+        # Позивні: готова таблиця з prepare_inputs (aliases з cfg.callsign_aliases вже застосовані)
+        calls=format_callsigns(callsigns.get(freq4)),
+        # готовий зріз: лише перехоплення з коментарями, вже відсортовані за часом
+        part=slices.commented.get(freq4),
+        msg_col=slices.msg_col,
+        cmt_col=slices.cmt_col,
+    )
+
+
+# етап профайлера зветься за публічною обгорткою: і прямий рендер, і кешований (_section_fragment) ідуть сюди
+@timed("_render_frequency_section", label=lambda doc, s: s.freq4)
+def _write_section(doc: Document, s: _SectionInputs) -> None:
+    # Якір
+    title_p = doc.add_paragraph()
+    anchor = f"freq-{s.freq4.replace('.', '_')}"
+    bookmark(title_p, anchor)
+
+    # Заголовок
+    run = title_p.add_run(s.title)
+    run.bold = True
+    run.font.size = Pt(12)
+
     # ТРИ абзаци з готовими значеннями
-    doc.add_paragraph(f"Призначення радіомережі: {purpose}")
-    doc.add_paragraph(f"Вузли зв’язку: {nodes}")
-    
-    # Позивні (беремо aliases з cfg.callsign_aliases)
-    calls_text = build_callsign_str_for_freq(li.intercepts_df, freq4)
-    doc.add_paragraph(f"Список позивних: {calls_text}")
+    doc.add_paragraph(f"Призначення радіомережі: {s.purpose}")
+    doc.add_paragraph(f"Вузли зв’язку: {s.nodes}")
+    doc.add_paragraph(f"Список позивних: {s.calls}")
 
     # Далі — як було: таблиця з 2 колонок тільки для перехоплень з коментарем
     doc.add_paragraph("Найважливіші перехоплення з коментарями:").runs[0].bold = True
 
-    msg_col, cmt_col = message_columns(li.intercepts_df)
-    df = li.intercepts_df.copy()
-    df["__f4"] = df["Частота"].map(freq4_str)
-    part = df[df["__f4"] == freq4].copy()
-
-    if cmt_col:
-        cm = part[cmt_col].astype(str).fillna("").str.strip().replace({"nan": "", "None": "", "NONE": ""})
-        part = part[cm.ne("")]
-    else:
-        part = part.iloc[0:0]
-
-    if part.empty:
+    part = s.part
+    if part is None or part.empty:
         # якщо з якихось причин сюди дійшли без записів — просто не друкуємо пусту таблицю
-        log.info("Секція %s: відсутні перехоплення з коментарями (таблиця пропущена).", freq4)
+        log.info("Секція %s: відсутні перехоплення з коментарями (таблиця пропущена).", s.freq4)
         # doc.add_page_break()
         return
 
-    if all(c in part.columns for c in ("Дата", "Час")):
-        part["__dt"] = [combine_date_time(d, t) for d, t in zip(part["Дата"], part["Час"])]
-        part = part.sort_values("__dt", kind="stable")
-
-    t = doc.add_table(rows=1, cols=2); t.style = "Table Grid"
-    hdr = t.rows[0].cells
-    hdr[0].text = "Перехоплення"; hdr[1].text = "Коментар"
-    for c in hdr: center_cell(c); vcenter(c)
-    set_row_min_height(t.rows[0], cm=0.9); set_col_widths(t, [3.6, 2.4])
-
-    for _, row in part.iterrows():
-        msg = str(row[msg_col]).strip() if msg_col and pd.notna(row.get(msg_col)) else ""
-        cmt = str(row[cmt_col]).strip() if cmt_col and pd.notna(row.get(cmt_col)) else ""
-        cells = t.add_row().cells
-        cells[0].text = msg
-        cells[1].text = cmt
-        set_row_min_height(t.rows[-1], cm=0.9)
-
-    insert_bearing_image(doc, freq4)
+    def _texts(col):
+        if not col or col not in part.columns:
+            return [""] * len(part)
+        return [str(v).strip() if pd.notna(v) else "" for v in part[col]]
+
+    add_xml_table(doc, [Col(3.6), Col(2.4)], zip(_texts(s.msg_col), _texts(s.cmt_col)),
+                  header=("Перехоплення", "Коментар"), row_height_cm=0.9)
+
+    insert_bearing_image(doc, s.freq4)
     # doc.add_page_break()
 
 
+def _render_frequency_section(doc: Document, freq4: str, count: int, li, cfg, ref_idx: ReferenceIndex,
+                              slices: InterceptSlices, callsigns: dict[str, list[str]]) -> None:
+    _write_section(doc, _section_inputs(freq4, count, li, ref_idx, slices, callsigns))
+
+
 
 
 
@@ -160,7 +182,9 @@ def _render_frequency_section(doc: Document, freq4: str, count: int, li, cfg) ->
 # Перша сторінка (ОГЛЯД) — БЕЗ ЗМІН ВІД ТВОЄЇ ОСТАННЬОЇ ВЕРСІЇ,
 # але замість plain-text частоти додаємо КЛІКАЛЬНЕ посилання.
 # -----------------------
-def _render_overview_page(doc: Document, cfg, li, groups, counts, period_start, period_end):
+@timed()
+def _render_overview_page(doc: Document, cfg, li, groups, counts, period_start, period_end, ref_idx: ReferenceIndex,
+                          slices: InterceptSlices):
     set_base_styles(doc)
 
     add_title(doc, "Донесення")
@@ -190,116 +214,186 @@ def _render_overview_page(doc: Document, cfg, li, groups, counts, period_start,
     title_tbl.runs[0].bold = True; title_tbl.runs[0].font.size = Pt(12)
     doc.add_paragraph()
 
-       # Таблиця: № | Частота | Радіомережа | Перехоплення
-    t = doc.add_table(rows=1, cols=4)
-    t.style = "Table Grid"
-    hdr = t.rows[0].cells
-    hdr[0].text = "№"
-    hdr[1].text = "Частота"
-    hdr[2].text = "Радіомережа"
-    hdr[3].text = "Перехоплення"
-
-    # заголовки по центру (горизонтально і вертикально) + висота
-    for c in hdr:
-        center_cell(c)
-        vcenter(c)
-    set_row_min_height(t.rows[0], cm=0.9)
-
+    # Таблиця: № | Частота | Радіомережа | Перехоплення
     # Ширини колонок:
     # 1 — в 4 рази менша; 2 — на 35% менша; 3 — вдвічі більша; 4 — в 4 рази менша.
     # Пропорції: [0.25, 0.65, 2.0, 0.25]
-    set_col_widths(t, [0.25, 0.65, 2.0, 0.25])
-
+    columns = [
+        Col(0.25, align="center", vcenter=True),
+        Col(0.65, align="center", vcenter=True),
+        Col(2.0),
+        Col(0.25, align="center", vcenter=True),
+    ]
+
+    rows = []
     row_counter = 1
     for short_tag, flist in groups.items():
         # повний напис «Хто» (за довідником)
-        full_tag = full_tag_for_group(flist, li.reference_df, short_tag)
+        full_tag = full_tag_for_group(flist, ref_idx, short_tag)
 
         # рядок-заголовок групи (злиті комірки, жирним, по центру)
-        r = t.add_row()
-        c = r.cells
-        c[0].merge(c[1]).merge(c[2]).merge(c[3])
-        c[0].text = f"Радіомережі {full_tag}"
-        # стилізація комірки заголовка групи
-        p = c[0].paragraphs[0]
-        if p.runs:
-            p.runs[0].bold = True
-        center_cell(c[0])
-        vcenter(c[0])
-        set_row_min_height(t.rows[-1], cm=0.9)
+        rows.append((Cell(f"Радіомережі {full_tag}", span=4, bold=True, align="center", vcenter=True),))
 
         if not flist:
             # порожня група
-            r = t.add_row().cells
-            r[2].text = "Не виявлено"
-            if r[2].paragraphs[0].runs:
-                r[2].paragraphs[0].runs[0].italic = True
-            # центруємо 1,2,4 колонки
-            for idx in (0, 1, 3):
-                center_cell(r[idx])
-                vcenter(r[idx])
-            set_row_min_height(t.rows[-1], cm=0.9)
+            rows.append(("", "", Cell("Не виявлено", italic=True), ""))
             continue
 
         # рядки з даними по частотах
         for f in flist:
-            r = t.add_row().cells
-            # №
-            r[0].text = str(row_counter)
-            center_cell(r[0]); vcenter(r[0])
-
             # Частота як клікабельний лінк на закладку розділу частоти
-            if not network_is_empty(li.intercepts_df, f):
-                anchor = f"freq-{f.replace('.', '_')}"
-                add_internal_link(r[1], f, anchor)
+            if not network_is_empty(slices, f):
+                freq_cell = Cell(f, anchor=f"freq-{f.replace('.', '_')}")
             else:
-                r[1].text = f  # просто текст без гіперпосилання
-            center_cell(r[1]); vcenter(r[1])
-
-            # Назва мережі (з довідника)
-            r[2].text = get_network_name_by_freq(f, li.reference_df)
+                freq_cell = f  # просто текст без гіперпосилання
+            rows.append((
+                str(row_counter),
+                freq_cell,
+                get_network_name_by_freq(f, ref_idx),   # назва мережі (з довідника)
+                str(counts.get(f, 0)),                  # кількість перехоплень
+            ))
+            row_counter += 1
 
-            # Кількість перехоплень
-            r[3].text = str(counts.get(f, 0))
-            center_cell(r[3]); vcenter(r[3])
+    add_xml_table(doc, columns, rows, header=("№", "Частота", "Радіомережа", "Перехоплення"),
+                  row_height_cm=0.9)
 
-            set_row_min_height(t.rows[-1], cm=0.9)
-            row_counter += 1
-            
-    
 
-            
 # --- ПУБЛІЧНИЙ API: згенерувати DOCX-чернетку ---
 __all__ = ["build_draft_docx"]
 
-def build_draft_docx(config_path: str = "config.yml") -> str:
+# -----------------------
+# Рендер секцій: послідовно або в пулі процесів зі склейкою body-XML
+# -----------------------
+# мінімум секцій, з якого має сенс піднімати пул процесів
+PARALLEL_MIN_SECTIONS = 24
+
+# версія рендеру секції — збільшуємо при зміні _write_section (збережений кеш стане недійсним)
+SECTION_CACHE_VERSION = 2
+SECTION_CACHE_FILE = "sections.pkl"
+
+
+def _render_sections(doc: Document, plan: list[tuple[str, bool]], p: PreparedInputs) -> None:
+    """plan: [(freq4, чи ставити розрив сторінки після секції), ...]"""
+    for f, page_break in plan:
+        _render_frequency_section(doc, f, p.counts.get(f, 0), p.li, p.cfg, p.ref_idx, p.slices, p.callsigns)
+        if page_break:
+            doc.add_page_break()
+
+
+_SECTION_STATE: PreparedInputs | None = None
+
+
+def _init_section_worker(prepared: PreparedInputs) -> None:
+    global _SECTION_STATE
+    _SECTION_STATE = prepared
+
+
+def _render_sections_xml(plan: list[tuple[str, bool]]) -> Fragment:
+    """Робочий процес: рендерить свій шматок секцій в окремий Document і віддає body-XML."""
+    part = Document()
+    _render_sections(part, plan, _SECTION_STATE)
+    return body_fragment_xml(part)
+
+
+def _render_sections_parallel(doc: Document, plan: list[tuple[str, bool]], p: PreparedInputs,
+                              workers: int) -> None:
+    """
+    Ділить план на суцільні шматки, рендерить їх у процесах і вклеює у doc
+    в ПОЧАТКОВОМУ порядку — document.xml збігається з послідовним рендером.
+    """
+    n_chunks = min(len(plan), workers * 4)
+    size = -(-len(plan) // n_chunks)
+    chunks = [plan[i:i + size] for i in range(0, len(plan), size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_section_worker, initargs=(p,)) as pool:
+        for fragment in pool.map(_render_sections_xml, chunks):
+            splice_body_xml(doc, fragment)
+
+
+def _section_fragment(doc: Document, s: _SectionInputs) -> Fragment:
+    """Рендерить секцію в кінець doc і повертає її body-XML (для кешу секцій)."""
+    start = body_length(doc)
+    _write_section(doc, s)
+    return body_fragment_xml(doc, start)
+
+
+def _render_section_fragments(freqs: list[str]) -> list[Fragment]:
+    """
+    Робочий процес: окремий XML-фрагмент на кожну частоту (для кешу секцій).
+    Усі секції шматка — в одному Document (новий Document() коштує ~15 мс), далі ріжемо по межах.
+    """
+    p = _SECTION_STATE
+    part = Document()
+    return [_section_fragment(part, _section_inputs(f, p.counts.get(f, 0), p.li, p.ref_idx, p.slices,
+                                                    p.callsigns))
+            for f in freqs]
+
+
+def _render_sections_cached(doc: Document, plan: list[tuple[str, bool]], p: PreparedInputs,
+                            cache: FragmentCache, workers: int | None = None) -> None:
+    """
+    Секція з тими самими вхідними даними (_SectionInputs.key) береться з кешу готовим XML;
+    рендеряться лише промахи (у процесах, якщо їх багато і задано workers). Без процесів промах
+    рендериться одразу в doc, а в кеш іде зріз його body — промах коштує як рендер без кешу.
+    """
+    inputs = {f: _section_inputs(f, p.counts.get(f, 0), p.li, p.ref_idx, p.slices, p.callsigns) for f, _ in plan}
+    keys = {f: s.key() for f, s in inputs.items()}
+    fragments = {f: cache.get(k) for f, k in keys.items()}
+    misses = [f for f, frag in fragments.items() if frag is None]
+
+    if workers and workers > 1 and len(misses) >= PARALLEL_MIN_SECTIONS:
+        n_chunks = min(len(misses), workers * 4)
+        size = -(-len(misses) // n_chunks)
+        chunks = [misses[i:i + size] for i in range(0, len(misses), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_section_worker, initargs=(p,)) as pool:
+            for chunk, frags in zip(chunks, pool.map(_render_section_fragments, chunks)):
+                fragments.update(zip(chunk, frags))
+
+    with stage("splice_sections"):
+        for f, page_break in plan:
+            if fragments[f] is None:
+                fragments[f] = _section_fragment(doc, inputs[f])
+            else:
+                splice_body_xml(doc, fragments[f])
+            if page_break:
+                doc.add_page_break()
+    for f in misses:
+        cache.put(keys[f], fragments[f])
+
+
+def open_section_cache(cfg) -> FragmentCache | None:
+    """Кеш секцій між запусками — у каталозі дискового кешу; None, якщо кеш вимкнено (--no-cache)."""
+    frames = cache_for_config(cfg)
+    if not frames.enabled:
+        return None
+    return FragmentCache.load(frames.root / SECTION_CACHE_FILE, version=SECTION_CACHE_VERSION)
+
+
+def build_draft_docx(config_path: str = "config.yml", prepared: PreparedInputs | None = None,
+                     section_workers: int | None = None,
+                     section_cache: FragmentCache | None = None) -> str:
 
     """
     Генерує DOCX:
       - перша сторінка (огляд з клікабельними частотами)
       - розділи по кожній частоті (page break між ними)
+    prepared — спільний стан конвеєра (режим run); якщо не передано — готуємо тут.
+    section_workers > 1 — секції рендеряться у стількох процесах (для великих звітів).
+    section_cache — кеш XML секцій (режим watch тримає свій між циклами); якщо не передано —
+    відкривається з каталогу дискового кешу і зберігається після рендеру.
     Повертає абсолютний шлях до збереженого файлу.
     """
-    cfg = load_config(config_path)
-    li = load_inputs(config_path)
-
-    # нормалізуємо «Частота» в перехопленнях
-    normalize_frequency_column(li.intercepts_df, li.reference_df)
-
-    # групи та лічильники
-    freqs, counts = unique_frequencies_with_counts(li.intercepts_df)
-    allowed = (cfg.grouping or {}).get("allowed_tags", [])
-    other   = (cfg.grouping or {}).get("other_bucket", "Інші радіомережі")
-    groups = group_frequencies_by_tag(freqs, li.reference_df, allowed, other, cfg.grouping)
-
-    # період з назви файла репорту
-    period_start, period_end = parse_period_from_filename(li.report_path)
+    # завантаження, нормалізація «Частота», індекс довідника, групи,
+    # зрізи перехоплень по частотах і період — все один раз
+    p = prepared or prepare_inputs(config_path)
+    cfg, li, ref_idx, slices = p.cfg, p.li, p.ref_idx, p.slices
+    counts, groups = p.counts, p.groups
+    period_start, period_end = p.period_start, p.period_end
 
     # створюємо документ
     doc = Document()
 
     # 1) Перша сторінка-огляд
-    _render_overview_page(doc, cfg, li, groups, counts, period_start, period_end)
+    _render_overview_page(doc, cfg, li, groups, counts, period_start, period_end, ref_idx, slices)
     doc.add_page_break()
 
     # 2) Детальні розділи по частотах
@@ -307,16 +401,26 @@ def build_draft_docx(config_path: str = "config.yml") -> str:
     pub_freqs: list[tuple[str, str]] = []  # (short_tag, freq4)
     for short_tag, flist in groups.items():
         for f in flist:
-            if not network_is_empty(li.intercepts_df, f):
+            if not network_is_empty(slices, f):
                 pub_freqs.append((short_tag, f))
             else:
                 log.info("Секцію %s пропущено — немає перехоплень із коментарями.", f)
 
     # 2) Рендер секцій з розривом сторінки МІЖ ними
-    for idx, (short_tag, f) in enumerate(pub_freqs, start=1):
-        _render_frequency_section(doc, f, counts.get(f, 0), li, cfg)
-        if idx < len(pub_freqs):
-            doc.add_page_break()
+    plan = [(f, idx < len(pub_freqs)) for idx, (short_tag, f) in enumerate(pub_freqs, start=1)]
+    cache = section_cache if section_cache is not None else open_section_cache(cfg)
+    if cache is not None:
+        cache.reset_stats()
+        _render_sections_cached(doc, plan, p, cache, section_workers)
+        log.info("Кеш секцій: %s", cache.summary())
+        try:
+            cache.save()
+        except OSError as e:
+            log.warning("Не вдалося записати кеш секцій: %s", e)
+    elif section_workers and section_workers > 1 and len(plan) >= PARALLEL_MIN_SECTIONS:
+        _render_sections_parallel(doc, plan, p, section_workers)
+    else:
+        _render_sections(doc, plan, p)
                 
     # після останньої секції — примітка + підпис (без page break)
     _append_executor_block(doc)
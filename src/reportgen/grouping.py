@@ -1,18 +1,24 @@
 # src/reportgen/grouping.py
 from __future__ import annotations
 from collections import OrderedDict, Counter
-from typing import Iterable, Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Iterable, Dict, List, Optional, Tuple
+import json
 import re
 import pandas as pd
 import logging
 
+from src.armorkit.instrument import timed
 from src.armorkit.normalize_freq import FREQ_NOT_FOUND
+from src.armorkit.domain.reference_index import (
+    ReferenceIndex,
+    as_reference_index,
+    REF_FREQ_COL,
+    REF_TAG_COL,
+)
 
 log = logging.getLogger(__name__)
 
-REF_FREQ_COL = "Частота"
-REF_TAG_COL  = "Хто"
-
 def _to_float(x):
     try:
         return float(str(x).replace(",", "."))
@@ -27,59 +33,128 @@ def _numeric_sort_key(x: str) -> float:
     v = _to_float(x)
     return v if v is not None else float("inf")
 
+@dataclass
+class TagNormalizer:
+    """
+    Правила grouping.tag_normalization, скомпільовані ОДИН раз:
+      explicit — точні відповідності (map), мають пріоритет
+      patterns — (скомпільований regex, заміна) у порядку з конфіга
+      memo     — сира мітка -> коротка (кожне унікальне «Хто» рахується один раз)
+    """
+    explicit: Dict[str, str] = field(default_factory=dict)
+    patterns: List[Tuple[re.Pattern, str]] = field(default_factory=list)
+    memo: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, cfg_grouping: dict | None) -> "TagNormalizer":
+        rules = (cfg_grouping or {}).get("tag_normalization", {}) or {}
+        return cls(
+            explicit=dict(rules.get("map") or {}),
+            patterns=[(re.compile(pat.get("match", "")), pat.get("to", "\\g<0>"))
+                      for pat in (rules.get("patterns") or [])],
+        )
+
+    def _apply(self, s: str) -> str | None:
+        if s in self.explicit:
+            return self.explicit[s]
+        for rx, to in self.patterns:
+            if rx.search(s):
+                return rx.sub(to, s)
+        return s
+
+    def __call__(self, tag) -> str | None:
+        if tag is None or (isinstance(tag, float) and pd.isna(tag)):
+            return None
+        s = str(tag).strip()
+        if s not in self.memo:
+            self.memo[s] = self._apply(s)
+        return self.memo[s]
+
+    def normalize_series(self, tags: pd.Series) -> pd.Series:
+        """Уся колонка «Хто» за один прохід: правила — лише для унікальних значень."""
+        ser = tags.astype("object")
+        uniq = pd.unique(ser[ser.notna()])
+        return ser.map({u: self(u) for u in uniq}).astype("object").where(ser.notna(), None)
+
+
+# нормалізатори за вмістом правил (конфіг — звичайний dict, тож ключ — його JSON)
+_NORMALIZERS: Dict[str, TagNormalizer] = {}
+
+
+def tag_normalizer(cfg_grouping: dict | None) -> TagNormalizer:
+    rules = (cfg_grouping or {}).get("tag_normalization", {}) or {}
+    key = json.dumps(rules, sort_keys=True, ensure_ascii=False, default=str)
+    norm = _NORMALIZERS.get(key)
+    if norm is None:
+        norm = _NORMALIZERS[key] = TagNormalizer.from_config(cfg_grouping)
+    return norm
+
+
 def _normalize_tag(tag: str | None, cfg_grouping: dict | None) -> str | None:
-    if tag is None or (isinstance(tag, float) and pd.isna(tag)):
-        return None
-    s = str(tag).strip()
-    rules = (cfg_grouping or {}).get("tag_normalization", {})
-    explicit = (rules.get("map") or {})
-    if s in explicit:
-        return explicit[s]
-    for pat in (rules.get("patterns") or []):
-        m = re.search(pat.get("match", ""), s)
-        if m:
-            return re.sub(pat.get("match", ""), pat.get("to", "\\g<0>"), s)
-    return s
-
-def unique_frequencies_with_counts(intercepts_df: pd.DataFrame) -> Tuple[List[str], Counter]:
+    return tag_normalizer(cfg_grouping)(tag)
+
+def frequency_counts(intercepts_df: pd.DataFrame) -> Counter:
+    """Кількість перехоплень на частоту (4 знаки) без службового маркера."""
     if "Частота" not in intercepts_df.columns:
         raise KeyError("У перехопленнях немає колонки 'Частота'")
     ser = intercepts_df["Частота"].map(_freq4_str).dropna()
     ser = ser[ser != FREQ_NOT_FOUND]  # прибираємо службовий маркер
-    counts = Counter(ser)
+    return Counter(ser)
+
+def unique_frequencies_with_counts(intercepts: pd.DataFrame | Iterable[pd.DataFrame]) -> Tuple[List[str], Counter]:
+    """
+    Приймає один DataFrame або послідовність шматків (потокове читання) —
+    лічильники накопичуються по шматках, увесь файл у пам'яті не потрібен.
+    """
+    if isinstance(intercepts, pd.DataFrame):
+        counts = frequency_counts(intercepts)
+    else:
+        counts = Counter()
+        for chunk in intercepts:
+            counts.update(frequency_counts(chunk))
     freqs = sorted(counts.keys(), key=_numeric_sort_key)
     return freqs, counts
 
-def tag_for_frequency(freq: str, ref_df: pd.DataFrame, cfg_grouping: dict | None) -> str | None:
-    if REF_FREQ_COL not in ref_df.columns:
+def tag_for_frequency(freq: str, ref: ReferenceIndex | pd.DataFrame, cfg_grouping: dict | None) -> str | None:
+    """
+    Нормалізована мітка «Хто» для частоти.
+    Якщо передано готовий ReferenceIndex — мітки беруться з нього
+    (нормалізовані за тим cfg_grouping, з яким індекс будувався).
+    """
+    idx = as_reference_index(ref, cfg_grouping)
+    if REF_FREQ_COL not in idx.frame.columns:
         raise KeyError(f"У довіднику немає колонки '{REF_FREQ_COL}'")
-    if REF_TAG_COL not in ref_df.columns:
+    if REF_TAG_COL not in idx.frame.columns:
         raise KeyError(f"У довіднику немає колонки '{REF_TAG_COL}'")
 
-    ref = ref_df.copy()
-    ref["_freq4"] = ref[REF_FREQ_COL].map(_freq4_str)
-
-    m = ref[ref["_freq4"] == _freq4_str(freq)]
-    if m.empty:
+    f4 = _freq4_str(freq)
+    if f4 not in idx.rows:
         return None
-    if len(m) > 1:
+    if idx.row_counts.get(f4, 0) > 1:
         log.warning("WARN: Частота %s має кілька рядків у довіднику. Узято перший.", freq)
+    return idx.tags.get(f4)
 
-    tag_raw = m.iloc[0][REF_TAG_COL]
-    return _normalize_tag(tag_raw, cfg_grouping)
-
+@timed()
 def group_frequencies_by_tag(
     freqs: Iterable[str],
-    ref_df: pd.DataFrame,
+    ref: ReferenceIndex | pd.DataFrame,
     allowed_tags: List[str],
     other_bucket: str,
     cfg_grouping: dict | None,
 ) -> "OrderedDict[str, List[str]]":
+    idx = as_reference_index(ref, cfg_grouping)
+    for col in (REF_FREQ_COL, REF_TAG_COL):
+        if col not in idx.frame.columns:
+            raise KeyError(f"У довіднику немає колонки '{col}'")
     buckets: Dict[str, List[str]] = {tag: [] for tag in allowed_tags}
     buckets[other_bucket] = []
 
+    # мітки вже нормалізовані в індексі — тут лише dict-lookup
     for f in freqs:
-        tag = tag_for_frequency(f, ref_df, cfg_grouping)
+        f4 = _freq4_str(f)
+        if idx.row_counts.get(f4, 0) > 1:
+            log.warning("WARN: Частота %s має кілька рядків у довіднику. Узято перший.", f)
+        tag = idx.tags.get(f4)
         if tag in buckets:
             buckets[tag].append(f)
         else:
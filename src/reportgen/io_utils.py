@@ -2,9 +2,14 @@ from pathlib import Path
 import pandas as pd
 
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, time, timedelta
+import logging
 import re
-from typing import Callable
+from typing import Callable, Iterator, Mapping
+
+from src.armorkit.images import image_index
+
+log = logging.getLogger(__name__)
 
 _TS_RE = re.compile(
     r"report_(\d{4}-\d{2}-\d{2}T\d{2}-\d{2})_(\d{4}-\d{2}-\d{2}T\d{2}-\d{2})",
@@ -26,14 +31,165 @@ def read_excel(path: str | Path) -> pd.DataFrame:
     # engine='openpyxl' для .xlsx
     return pd.read_excel(path, engine="openpyxl")
 
+# -----------------------
+# Потокове читання великих report_*.xlsx
+# -----------------------
+# Ролі колонок перехоплень -> назви в XLSX (перекриваються columns.intercepts у config.yml)
+DEFAULT_INTERCEPT_COLUMNS = {
+    "date": "Дата",
+    "time": "Час",
+    "frequency": "Частота",
+    "from_callsign": "хто",
+    "to_callsign": "кому",
+    "message": "р\\обмін",
+    "comment": "примітки",
+}
+
+# Явні типи за роллю; решта колонок лишається object (текст як є)
+#   category        — мало унікальних значень на сотні тисяч рядків
+#   datetime64[ns]  — дата перехоплення (без часу)
+#   timedelta64[ns] — час доби (дата + час = datetime64 однією векторною операцією)
+INTERCEPT_DTYPES = {
+    "frequency": "category",
+    "from_callsign": "category",
+    "to_callsign": "category",
+    "date": "datetime64[ns]",
+    "time": "timedelta64[ns]",
+}
+
+STREAM_CHUNK_ROWS = 50_000
+
+
+def intercept_columns(columns_cfg: Mapping | None = None) -> dict[str, str]:
+    """Ролі -> назви колонок: дефолти + columns.intercepts з конфіга."""
+    cols = dict(DEFAULT_INTERCEPT_COLUMNS)
+    cols.update({k: str(v) for k, v in ((columns_cfg or {}).get("intercepts") or {}).items() if v})
+    return cols
+
+
+def _cat_text(v):
+    if v is None or (isinstance(v, float) and pd.isna(v)):
+        return None
+    s = str(v).strip()
+    return s or None
+
+
+def _time_text(v):
+    """Час доби у вигляді 'HH:MM:SS' для pd.to_timedelta (або None)."""
+    if v is None or (isinstance(v, float) and pd.isna(v)):
+        return None
+    if isinstance(v, datetime):
+        v = v.time()
+    if isinstance(v, time):
+        return f"{v.hour:02d}:{v.minute:02d}:{v.second:02d}"
+    if isinstance(v, timedelta):
+        return str(pd.Timedelta(v))
+    s = str(v).strip()
+    if len(s) in (4, 5) and s.count(":") == 1:   # 9:05 / 12:00
+        s += ":00"
+    return s or None
+
+
+def _typed_column(values: list, dtype: str | None) -> pd.Series:
+    if dtype == "category":
+        return pd.Series([_cat_text(v) for v in values], dtype="object").astype("category")
+    if dtype == "datetime64[ns]":
+        ser = pd.Series(values, dtype="object")
+        return pd.to_datetime(ser, dayfirst=True, errors="coerce", format="mixed").astype(dtype).dt.normalize()
+    if dtype == "timedelta64[ns]":
+        ser = pd.Series([_time_text(v) for v in values], dtype="object")
+        return pd.to_timedelta(ser, errors="coerce").astype(dtype)
+    return pd.Series(values, dtype="object")
+
+
+def _typed_chunk(rows: list[tuple], names: list[str], dtypes: list[str | None]) -> pd.DataFrame:
+    cols = list(zip(*rows)) if rows else [()] * len(names)
+    return pd.DataFrame({n: _typed_column(list(c), t) for n, c, t in zip(names, cols, dtypes)})
+
+
+def iter_excel_chunks(path: str | Path,
+                      columns: Mapping[str, str] | None = None,
+                      chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Читає перший аркуш XLSX в режимі openpyxl read_only і віддає типізовані шматки
+    по chunk_rows рядків. Залишає ЛИШЕ колонки з columns (роль -> назва;
+    за замовчуванням DEFAULT_INTERCEPT_COLUMNS), типи — INTERCEPT_DTYPES.
+    Пам'ять обмежена розміром шматка, а не файлу.
+    Повністю порожні рядки пропускаються (як у pd.read_excel).
+    """
+    from openpyxl import load_workbook
+
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Excel file not found: {path}")
+    columns = dict(columns or DEFAULT_INTERCEPT_COLUMNS)
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows_iter = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows_iter, None)
+        if header is None:
+            return
+        header = [str(h).strip() if h is not None else "" for h in header]
+
+        picked: list[tuple[int, str, str | None]] = []
+        for role, name in columns.items():
+            if name in header:
+                picked.append((header.index(name), name, INTERCEPT_DTYPES.get(role)))
+            else:
+                log.warning("WARN: У %s немає колонки '%s' (%s) — пропущено.", path.name, name, role)
+        picked.sort()
+        positions = [i for i, _, _ in picked]
+        names = [n for _, n, _ in picked]
+        dtypes = [t for _, _, t in picked]
+
+        buf: list[tuple] = []
+        for row in rows_iter:
+            vals = tuple(row[i] if i < len(row) else None for i in positions)
+            if all(v is None or v == "" for v in vals):
+                continue
+            buf.append(vals)
+            if len(buf) >= chunk_rows:
+                yield _typed_chunk(buf, names, dtypes)
+                buf = []
+        if buf:
+            yield _typed_chunk(buf, names, dtypes)
+    finally:
+        wb.close()
+
+
+def concat_chunks(chunks) -> pd.DataFrame:
+    """Склеює шматки; категоріальні колонки об'єднуються без переходу в object."""
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    # спільний набір категорій на колонку, інакше concat зведе її до object
+    for col in chunks[0].columns:
+        if not isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            continue
+        cats = pd.unique(pd.Series(
+            [v for c in chunks for v in c[col].cat.categories], dtype="object"))
+        dtype = pd.CategoricalDtype(pd.Index(cats, dtype="object"))
+        chunks = [c.assign(**{col: c[col].astype(dtype)}) for c in chunks]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_excel_streaming(path: str | Path,
+                         columns: Mapping[str, str] | None = None,
+                         chunk_rows: int = STREAM_CHUNK_ROWS) -> pd.DataFrame:
+    """Потокове читання цілого файлу в один типізований DataFrame."""
+    return concat_chunks(iter_excel_chunks(path, columns, chunk_rows))
+
+
 def peleng_path(beamshots_dir: str, freq: str) -> str | None:
-    d = Path(beamshots_dir)
-    candidates = [
-        d / f"{freq}.png",                           # 4 знаки (нормалізована частота, типу 408.3150)
-        d / f"{float(freq):.3f}.png" if freq else None,  # запасний варіант з 3 знаками (408.315)
-    ]
-    for p in candidates:
-        if p and p.exists():
-            return str(p)
-    return None
+    """
+    Скріншот пеленга для частоти: <freq>.png (4 знаки, типу 408.3150) або запасний
+    варіант з 3 знаками (408.315). Каталог індексується один раз (перечитується при зміні
+    mtime) — без stat на кожну частоту.
+    """
+    stems = [str(freq)]
+    if freq:
+        stems.append(f"{float(freq):.3f}")
+    p = image_index(beamshots_dir).get(*stems)
+    return str(p) if p else None
 
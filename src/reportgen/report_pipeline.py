@@ -0,0 +1,174 @@
+# src/reportgen/report_pipeline.py
+from __future__ import annotations
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+import os
+import time
+
+from src.armorkit.data_loader import LoadedInputs, load_inputs, load_window
+from src.armorkit.dates import parse_period_from_filename
+from src.armorkit.domain.callsigns import callsign_table
+from src.armorkit.domain.intercepts import InterceptSlices
+from src.armorkit.domain.reference_index import ReferenceIndex
+from src.armorkit.instrument import timed
+from src.armorkit.normalize_freq import normalize_frequency_column
+from src.reportgen.grouping import unique_frequencies_with_counts, group_frequencies_by_tag
+from src.reportgen.settings import Config, load_config
+
+log = logging.getLogger(__name__)
+
+
+# =========================
+# Спільний стан: завантажити / нормалізувати / проіндексувати ОДИН раз
+# =========================
+
+@dataclass
+class PreparedInputs:
+    """Усе, що потрібно генераторам звітів, підготовлене один раз."""
+    cfg: Config
+    li: LoadedInputs                 # intercepts_df вже з нормалізованою «Частота»
+    ref_idx: ReferenceIndex
+    slices: InterceptSlices
+    freqs: List[str]
+    counts: Counter
+    groups: "OrderedDict[str, List[str]]"
+    period_start: str
+    period_end: str
+    # freq4 -> відсортовані унікальні позивні (хто/кому, з cfg.callsign_aliases)
+    callsigns: Dict[str, List[str]] = field(default_factory=dict)
+
+
+# вікно часу (початок, кінець); None з будь-якого боку — без обмеження
+Window = Tuple[Optional[datetime], Optional[datetime]]
+
+
+def prepare_inputs(config_path: str = "config.yml", window: Window | None = None) -> PreparedInputs:
+    """window — замість найсвіжішого звіту взяти всі звіти, що перетинають вікно (load_window)."""
+    cfg = load_config(config_path)
+    li = load_window(config_path, *window) if window else load_inputs(config_path)
+    return prepare_loaded(cfg, li)
+
+
+@timed()
+def prepare_loaded(cfg: Config, li: LoadedInputs, ref_idx: ReferenceIndex | None = None,
+                   normalized: bool = False) -> PreparedInputs:
+    """
+    Усе після завантаження: індекс довідника, нормалізація «Частота», групи, зрізи, позивні.
+    ref_idx/normalized=True — для вже проіндексованих і нормалізованих даних (режим watch).
+    """
+    if ref_idx is None:
+        ref_idx = ReferenceIndex.from_frame(li.reference_df, cfg.grouping)
+    if not normalized:
+        normalize_frequency_column(li.intercepts_df, ref_idx)
+
+    freqs, counts = unique_frequencies_with_counts(li.intercepts_df)
+    allowed = (cfg.grouping or {}).get("allowed_tags", [])
+    other   = (cfg.grouping or {}).get("other_bucket", "Інші радіомережі")
+    groups = group_frequencies_by_tag(freqs, ref_idx, allowed, other, cfg.grouping)
+
+    period_start, period_end = li.period or parse_period_from_filename(li.report_path)
+
+    return PreparedInputs(
+        cfg=cfg,
+        li=li,
+        ref_idx=ref_idx,
+        slices=InterceptSlices.from_frame(li.intercepts_df),
+        freqs=freqs,
+        counts=counts,
+        groups=groups,
+        period_start=period_start,
+        period_end=period_end,
+        callsigns=callsign_table(li.intercepts_df, cfg.callsign_aliases),
+    )
+
+
+# =========================
+# Реєстр звітів
+# =========================
+
+def _builders(section_workers: int | None = None) -> Dict[str, Callable[[PreparedInputs], object]]:
+    # імпорти тут: модулі звітів самі імпортують PreparedInputs з цього модуля
+    from src.reportgen.export.word_report import build_draft_docx
+    from src.activefrequencies.report import build_active_frequencies_docx
+    from src.artyleria.runner import run as arty_run
+    from src.etalonky.runner import run as eralonky_run
+    from src.enemies.generate_enemies_report import main as enemies_main
+
+    return OrderedDict([
+        ("draft-docx",       lambda p: build_draft_docx(prepared=p, section_workers=section_workers)),
+        ("active-freqs",     lambda p: build_active_frequencies_docx(prepared=p)),
+        ("artyleria-report", lambda p: arty_run(prepared=p)),
+        ("eralonky",         lambda p: eralonky_run(prepared=p)),
+        ("enemies",          lambda p: enemies_main(prepared=p)),
+    ])
+
+
+REPORT_NAMES = ["draft-docx", "active-freqs", "artyleria-report", "eralonky", "enemies"]
+
+
+def build_report(name: str, prepared: PreparedInputs, section_workers: int | None = None) -> str:
+    builders = _builders(section_workers)
+    if name not in builders:
+        raise KeyError(f"Невідомий звіт: {name}")
+    return str(builders[name](prepared))
+
+
+# --- робочий процес пулу: спільний стан передається один раз через initializer ---
+_WORKER_STATE: PreparedInputs | None = None
+
+
+def _init_worker(prepared: PreparedInputs) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = prepared
+
+
+def _build_in_worker(name: str) -> tuple[str, str, float]:
+    t0 = time.perf_counter()
+    path = build_report(name, _WORKER_STATE)
+    return name, path, time.perf_counter() - t0
+
+
+def run_pipeline(config_path: str = "config.yml",
+                 reports: Iterable[str] | None = None,
+                 workers: int | None = None,
+                 section_workers: int | None = None,
+                 window: Window | None = None) -> Dict[str, str]:
+    """
+    Повний конвеєр: завантаження + нормалізація + індекси один раз,
+    далі кожен обраний звіт рендериться зі спільного стану.
+    Незалежні DOCX будуються паралельно у пулі процесів (workers=1 — послідовно).
+    section_workers діє лише при послідовному рендері звітів (без вкладених пулів).
+    window — звіти за вікно часу з кількох вивантажень (див. prepare_inputs).
+    Повертає {назва звіту: шлях до файлу}.
+    """
+    names = list(reports or REPORT_NAMES)
+    unknown = [n for n in names if n not in REPORT_NAMES]
+    if unknown:
+        raise KeyError(f"Невідомі звіти: {unknown}")
+
+    t0 = time.perf_counter()
+    prepared = prepare_inputs(config_path, window)
+    log.info("Конвеєр: вхідні дані підготовлено за %.2f с", time.perf_counter() - t0)
+
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    results: Dict[str, str] = {}
+
+    if workers <= 1 or len(names) == 1:
+        for name in names:
+            t1 = time.perf_counter()
+            results[name] = build_report(name, prepared, section_workers)
+            log.info("Конвеєр: %s — %.2f с", name, time.perf_counter() - t1)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(prepared,)) as pool:
+            futures = [pool.submit(_build_in_worker, name) for name in names]
+            for fut in as_completed(futures):
+                name, path, dt = fut.result()
+                results[name] = path
+                log.info("Конвеєр: %s — %.2f с", name, dt)
+
+    log.info("Конвеєр: усього %.2f с", time.perf_counter() - t0)
+    return {name: results[name] for name in names}
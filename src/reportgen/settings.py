@@ -12,12 +12,14 @@ class PathsCfg:
     output_dir: str = "build"
     beamshots_dir: Optional[str] = None
     report_mask: str = "report_*.xlsx"   # <-- ДОДАЛИ
+    cache_dir: Optional[str] = None      # кеш розпарсених XLSX (за замовчуванням <output_dir>/.cache)
 
 @dataclass
 class Config:
     paths: PathsCfg
     grouping: Dict[str, Any] | None = None
     callsign_aliases: Dict[str, str] | None = None
+    columns: Dict[str, Any] | None = None   # columns.reference / columns.intercepts
 
 def _as_dict(d: Dict[str, Any] | None) -> Dict[str, Any]:
     return d if isinstance(d, dict) else {}
@@ -32,6 +34,7 @@ def load_config(path: str = "config.yml") -> Config:
     paths_raw = _as_dict(raw.get("paths"))
     grouping = _as_dict(raw.get("grouping"))
     callsign_aliases = _as_dict(raw.get("callsign_aliases"))
+    columns = _as_dict(raw.get("columns"))
 
     freq_file = paths_raw.get("freq_file")
     reports_dir = paths_raw.get("reports_dir")
@@ -44,10 +47,12 @@ def load_config(path: str = "config.yml") -> Config:
         output_dir=paths_raw.get("output_dir", "build"),
         beamshots_dir=paths_raw.get("beamshots_dir"),
         report_mask=paths_raw.get("report_mask", "report_*.xlsx"),  # <-- ДОДАЛИ
+        cache_dir=paths_raw.get("cache_dir"),
     )
     
     return Config(
         paths=paths,
         grouping=grouping,
         callsign_aliases=callsign_aliases,   # <-- Виправлено (було call_sign_aliases)
+        columns=columns,
     )
\ No newline at end of file
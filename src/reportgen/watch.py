@@ -0,0 +1,325 @@
+# src/reportgen/watch.py
+"""
+Режим watch: довгоживучий процес замість ручного перезапуску .bat після кожного вивантаження.
+
+Стан у пам'яті:
+  - довідник + ReferenceIndex (перечитуються лише коли змінився freq_file);
+  - нормалізовані перехоплення ПО ФАЙЛАХ (новий/змінений report_*.xlsx парситься сам по собі);
+  - підписи мереж freq4 -> (кількість рядків, хеш рядків) — щоб знати, які мережі змінились;
+  - кеш XML секцій чернетки за вмістом — перерендерюються лише змінені мережі.
+Звіт перебудовується, лише якщо зачеплено його мережі (REPORT_SCOPES).
+"""
+from __future__ import annotations
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import time
+
+import pandas as pd
+
+from src.armorkit.data_loader import (
+    LoadedInputs, cache_for_config, dedup_intercepts, load_latest_report_path, load_reference, load_report,
+    select_reports_in_window,
+)
+from src.armorkit.docxutils.fragment_cache import FragmentCache
+from src.armorkit.dates import add_datetime_column, format_period_bound, parse_period_bounds
+from src.armorkit.domain.freqnorm import freq4_str
+from src.armorkit.domain.reference_index import ReferenceIndex
+from src.armorkit.normalize_freq import normalize_frequency_column
+from src.armorkit.xlsxutils.workbook import release_workbooks
+from src.reportgen.io_utils import intercept_columns
+from src.reportgen.report_pipeline import REPORT_NAMES, PreparedInputs, Window, build_report, prepare_loaded
+from src.reportgen.settings import load_config
+
+log = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 60.0
+
+# (розмір, mtime_ns) — зміна будь-якого з них означає, що файл треба перечитати
+Stamp = Tuple[int, int]
+
+
+def _stamp(path: Path) -> Stamp | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def network_signatures(df: pd.DataFrame, freq_col: str = "Частота") -> Dict[str, Tuple[int, int]]:
+    """freq4 -> (кількість рядків, сума хешів рядків): змінився будь-який рядок мережі — змінився підпис."""
+    if df.empty or freq_col not in df.columns:
+        return {}
+    freqs = df[freq_col].astype("object")
+    f4 = freqs.map({u: freq4_str(u) for u in pd.unique(freqs.dropna())})
+    hashes = pd.util.hash_pandas_object(df.astype("object"), index=False)
+    agg = hashes.groupby(f4, sort=False).agg(["size", "sum"])
+    return {f: (int(n), int(h)) for f, n, h in zip(agg.index, agg["size"], agg["sum"])}
+
+
+# ---------- від яких мереж залежить кожен звіт ----------
+# None — від усіх мереж (і періоду), set() — лише від довідника
+
+def _scope_artyleria(p: PreparedInputs) -> Set[str]:
+    from src.artyleria.runner import art_reference
+    return set(art_reference(p.li.reference_df)["freq4"])
+
+
+def _scope_enemies(p: PreparedInputs) -> Set[str]:
+    from src.enemies.generate_enemies_report import watch_list
+    return set(watch_list(p.ref_idx))
+
+
+REPORT_SCOPES: Dict[str, Callable[[PreparedInputs], Optional[Set[str]]]] = {
+    "draft-docx":       lambda p: None,
+    "active-freqs":     lambda p: None,
+    "artyleria-report": _scope_artyleria,
+    "eralonky":         lambda p: set(),
+    "enemies":          _scope_enemies,
+}
+
+
+class ReportWatcher:
+    """
+    Опитує reports_dir (report_mask) і freq_file кожні interval секунд.
+      - старт: як load_inputs (найсвіжіший звіт) або load_window (якщо задано window);
+      - новий/змінений файл: парситься лише він, рядки нормалізуються і додаються до стану
+        (кілька файлів — склеюються і дедуплікуються, як у load_window);
+      - змінився довідник: новий індекс, перечитування файлів стану (з дискового кешу),
+        повний перерендер.
+    Недописаний файл (помилка читання) пропускається і перечитується на наступному циклі.
+    Розмір стану: з window — файли, що перетинають вікно (як load_window); без window — лише
+    останнє вивантаження (як load_inputs): новий файл витісняє попередній, тож стан не росте
+    з кожним вивантаженням за час роботи процесу.
+    Наприкінці кожного циклу дескриптори спільних книг (довідник) закриваються — файл
+    між циклами не тримається відкритим, розпарсені аркуші лишаються в пам'яті.
+    """
+
+    def __init__(self, config_path: str = "config.yml", reports: Iterable[str] | None = None,
+                 window: Window | None = None, section_workers: int | None = None):
+        self.config_path = config_path
+        self.cfg = load_config(config_path)
+        self.reports = list(reports or REPORT_NAMES)
+        unknown = [n for n in self.reports if n not in REPORT_NAMES]
+        if unknown:
+            raise KeyError(f"Невідомі звіти: {unknown}")
+        self.window = window
+        self.section_workers = section_workers
+
+        self.cache = cache_for_config(self.cfg)
+        self.reports_dir = Path(self.cfg.paths.reports_dir)
+        self.freq_path = Path(self.cfg.paths.freq_file)
+        self.columns = intercept_columns(self.cfg.columns)
+
+        self.ref_stamp: Stamp | None = None
+        self.reference_df: pd.DataFrame | None = None
+        self.ref_idx: ReferenceIndex | None = None
+        self.stamps: Dict[Path, Stamp] = {}         # усі побачені файли каталогу
+        self.frames: Dict[Path, pd.DataFrame] = {}  # файли у стані: нормалізовані перехоплення
+        self.signatures: Dict[str, Tuple[int, int]] = {}
+        self.period: Tuple[str, str] | None = None
+        self.section_cache: FragmentCache | None = None  # XML секцій чернетки (за вмістом)
+        self.prepared: PreparedInputs | None = None
+        self.outputs: Dict[str, str] = {}
+        self.cycles = 0
+        self._started = False
+
+    # ---------- файли ----------
+    def _in_window(self, path: Path) -> bool:
+        if not self.window:
+            return True
+        bounds = parse_period_bounds(path)
+        if bounds is None:
+            return False
+        start, end = self.window
+        return (start is None or bounds[1] > start) and (end is None or bounds[0] < end)
+
+    def _initial_files(self) -> List[Path]:
+        paths = self.cfg.paths
+        if self.window:
+            start, end = self.window
+            return [p for p, _, _ in select_reports_in_window(
+                paths.reports_dir, paths.report_mask, start or datetime.min, end or datetime.max)]
+        try:
+            return [load_latest_report_path(paths.reports_dir, paths.report_mask)]
+        except FileNotFoundError:
+            # каталог ще порожній — чекаємо на перше вивантаження
+            log.info("Watch: у %s ще немає %s — чекаємо.", paths.reports_dir, paths.report_mask)
+            return []
+
+    def _parse(self, path: Path) -> pd.DataFrame:
+        df = load_report(path, self.cache)
+        add_datetime_column(df, self.columns["date"], self.columns["time"])
+        normalize_frequency_column(df, self.ref_idx)
+        return df
+
+    def _load_reference(self) -> None:
+        self.reference_df = load_reference(self.freq_path, self.cache)
+        self.ref_idx = ReferenceIndex.from_frame(self.reference_df, self.cfg.grouping)
+
+    def _scan(self) -> Tuple[List[Path], List[Path]]:
+        """(нові/змінені файли, що мають потрапити у стан; файли стану, які зникли)."""
+        current = {p.resolve(): _stamp(p) for p in self.reports_dir.glob(self.cfg.paths.report_mask)}
+        current = {p: st for p, st in current.items() if st is not None}
+        if not self._started:
+            # перший цикл: решта каталогу — «вже бачили», у стан лише стартові файли
+            self._started = True
+            self.stamps = current
+            return [p.resolve() for p in self._initial_files()], []
+        changed = [p for p, st in current.items() if self.stamps.get(p) != st and self._in_window(p)]
+        removed = [p for p in self.frames if p not in current]
+        self.stamps = current
+        if not self.window:
+            # без вікна у стані лише найсвіжіше вивантаження; зникло воно — беремо наступне з каталогу
+            if not changed and removed and len(removed) == len(self.frames):
+                changed = list(current)
+            if changed:
+                changed = [max(changed, key=lambda p: current[p][1])]
+        return sorted(changed), removed
+
+    def _combined(self) -> LoadedInputs:
+        def _order(p: Path):
+            # за зростанням періоду (як у load_window); файли без періоду в назві — в кінці
+            return (parse_period_bounds(p) or (datetime.max, datetime.max), p.name)
+
+        paths = sorted(self.frames, key=_order)
+        if len(paths) == 1:
+            # один файл — як load_inputs (без дедуплікації і з періодом із назви)
+            intercepts_df, period = self.frames[paths[0]].copy(), None
+        else:
+            combined = pd.concat([self.frames[p] for p in paths], ignore_index=True)
+            intercepts_df = dedup_intercepts(combined, (self.cfg.columns or {}).get("intercepts"))
+            bounds = [b for b in map(parse_period_bounds, paths) if b is not None]
+            period = ((format_period_bound(min(s for s, _ in bounds)), format_period_bound(max(e for _, e in bounds)))
+                      if bounds else None)
+        return LoadedInputs(
+            cfg_path=str(Path(self.config_path).resolve()),
+            freq_path=str(self.freq_path.resolve()),
+            report_path=str(paths[-1]),
+            reference_df=self.reference_df,
+            intercepts_df=intercepts_df,
+            report_paths=[str(p) for p in paths],
+            period=period,
+        )
+
+    # ---------- цикл ----------
+    def poll(self) -> Dict[str, str]:
+        """Один цикл опитування. Повертає {звіт: шлях} для перебудованих звітів."""
+        try:
+            return self._poll()
+        finally:
+            release_workbooks()
+
+    def _poll(self) -> Dict[str, str]:
+        t0 = time.perf_counter()
+        self.cycles += 1
+
+        ref_stamp = _stamp(self.freq_path)
+        if ref_stamp is None and self.ref_idx is None:
+            log.warning("Watch: довідника %s ще немає — чекаємо.", self.freq_path)
+            return {}
+        ref_changed = ref_stamp != self.ref_stamp
+        if ref_changed:
+            self._load_reference()
+            self.ref_stamp = ref_stamp
+
+        changed_files, removed = self._scan()
+        if ref_changed:
+            # нова нормалізація частот — перечитуємо файли стану (FrameCache, без XLSX)
+            # (нове вивантаження — останнім: без вікна воно й лишиться у стані)
+            changed_files = [p for p in self.frames if p not in changed_files] + changed_files
+        for p in removed:
+            self.frames.pop(p, None)
+            log.info("Watch: %s зник — прибрано зі стану.", p.name)
+        loaded = 0
+        for p in changed_files:
+            try:
+                df = self._parse(p)
+            except Exception as e:
+                # файл ще копіюється / пошкоджений — спробуємо на наступному циклі
+                self.stamps.pop(p, None)
+                log.warning("Watch: %s не прочитано (%s) — повтор на наступному циклі.", p.name, e)
+                continue
+            if not self.window:
+                # лише останнє вивантаження: попереднє витісняється, коли нове вже прочитане
+                for old in [q for q in self.frames if q != p]:
+                    del self.frames[old]
+                    removed.append(old)
+            self.frames[p] = df
+            loaded += 1
+        if not self.frames:
+            log.warning("Watch: немає жодного звіту перехоплень у стані.")
+            return {}
+        if not (ref_changed or loaded or removed):
+            return {}
+        t_load = time.perf_counter() - t0
+
+        li = self._combined()
+        prepared = prepare_loaded(self.cfg, li, self.ref_idx, normalized=True)
+        signatures = network_signatures(li.intercepts_df)
+        changed = {f for f in set(signatures) | set(self.signatures) if signatures.get(f) != self.signatures.get(f)}
+        period_changed = (prepared.period_start, prepared.period_end) != self.period
+        full = ref_changed or self.prepared is None
+
+        self.prepared, self.signatures = prepared, signatures
+        self.period = (prepared.period_start, prepared.period_end)
+
+        built: Dict[str, str] = {}
+        for name in self.reports:
+            scope = REPORT_SCOPES[name](prepared)
+            if not full:
+                if scope is None and not (changed or period_changed):
+                    continue
+                if scope is not None and not (changed & scope):
+                    continue
+            t1 = time.perf_counter()
+            try:
+                if name == "draft-docx":
+                    path = self._build_draft(prepared)
+                else:
+                    path = build_report(name, prepared, self.section_workers)
+            except Exception:
+                log.exception("Watch: звіт %s не побудовано.", name)
+                continue
+            built[name] = self.outputs[name] = str(path)
+            log.info("Watch: %s — %.2f с", name, time.perf_counter() - t1)
+
+        log.info("Watch #%d: файлів %d (+прибрано %d), мереж змінено %d, звітів %d — %.2f с (дані %.2f с)",
+                 self.cycles, loaded, len(removed), len(signatures) if full else len(changed),
+                 len(built), time.perf_counter() - t0, t_load)
+        return built
+
+    def _build_draft(self, prepared: PreparedInputs) -> str:
+        # кеш секцій живе весь процес: незмінені мережі вклеюються готовим XML
+        from src.reportgen.export.word_report import (
+            SECTION_CACHE_VERSION, build_draft_docx, open_section_cache,
+        )
+        if self.section_cache is None:
+            self.section_cache = open_section_cache(self.cfg)
+            if self.section_cache is None:  # --no-cache: лише в пам'яті процесу
+                self.section_cache = FragmentCache(version=SECTION_CACHE_VERSION)
+        return build_draft_docx(prepared=prepared, section_workers=self.section_workers,
+                                section_cache=self.section_cache)
+
+    def run(self, interval: float = DEFAULT_INTERVAL, cycles: int | None = None) -> None:
+        """Цикл опитування до Ctrl+C (або cycles циклів)."""
+        log.info("Watch: стежимо за %s (%s) і %s кожні %.0f с.",
+                 self.reports_dir, self.cfg.paths.report_mask, self.freq_path.name, interval)
+        n = 0
+        try:
+            while cycles is None or n < cycles:
+                try:
+                    built = self.poll()
+                except Exception:
+                    # напр. довідник саме копіюється — процес не падає, повтор на наступному циклі
+                    log.exception("Watch: цикл #%d не вдався — повтор через %.0f с.", self.cycles, interval)
+                    built = {}
+                for name, path in built.items():
+                    print(f"OK: {name} → {path}")
+                n += 1
+                if cycles is None or n < cycles:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            log.info("Watch: зупинено.")
@@ -0,0 +1,16 @@
+from benchmarks.run import compare_results, run_benchmarks
+
+
+def test_benchmark_tiny_dataset(tmp_path):
+    result = run_benchmarks(tmp_path, [200], networks=20, etalon_sheets=3, reports=["active-freqs", "draft-docx"])
+    (run,) = result["runs"]
+    assert run["spec"]["rows"] == 200
+    assert {"load", "load_cached", "normalize", "grouping", "docx:active-freqs",
+            "docx:draft-docx", "docx:draft-docx:cold-cache", "docx:draft-docx:cached"} <= set(run["stages"])
+    assert (tmp_path / "rows_200" / "build").is_dir()
+
+    slower = {"runs": [{"spec": run["spec"], "stages": {k: v * 2 + 1 for k, v in run["stages"].items()}}]}
+    _, regressed = compare_results(result, slower)
+    assert regressed
+    _, regressed = compare_results(slower, result)
+    assert not regressed
@@ -0,0 +1,14 @@
+import pandas as pd
+
+from src.armorkit.domain.callsigns import build_callsign_str_for_freq, callsign_table
+
+
+def test_callsign_table_all_frequencies():
+    df = pd.DataFrame({
+        "Частота": ["300.1", "300.100", "300.2", None],
+        "хто": ["сокіл 1, ОРЕЛ", "вовк;лис", "НВ", "x"],
+        "кому": ["«база»  2", None, "", None],
+    })
+    table = callsign_table(df, {"ЛИС": "ЛИСИЦЯ"})
+    assert table == {"300.1000": ["БАЗА-2", "ВОВК", "ЛИСИЦЯ", "ОРЕЛ", "СОКІЛ-1"]}
+    assert build_callsign_str_for_freq(df, "300.2000") == "—"
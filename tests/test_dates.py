@@ -0,0 +1,41 @@
+from datetime import datetime, time
+
+import pandas as pd
+
+from src.armorkit.dates import combine_date_time, parse_datetime_columns
+
+
+def test_datetime_columns_match_row_parser():
+    dates = pd.Series(["01.10.2025", "01.10.2025", "02.10.2025", None, "погано"], dtype=object)
+    times = pd.Series(["12:05", "9:30:15", None, "10:00", "12:00"], dtype=object)
+    got = parse_datetime_columns(dates, times)
+    assert got.dtype == "datetime64[ns]"
+    assert got.tolist() == [combine_date_time(d, t) or pd.NaT for d, t in zip(dates, times)]
+
+
+def test_datetime_columns_typed_cells():
+    dates = pd.Series([datetime(2025, 10, 3), pd.Timestamp("2025-10-04")], dtype=object)
+    times = pd.Series([time(8, 1), pd.Timedelta(hours=23, minutes=59)], dtype=object)
+    assert parse_datetime_columns(dates, times).tolist() == [
+        pd.Timestamp("2025-10-03 08:01"), pd.Timestamp("2025-10-04 23:59")]
+
+
+def test_datetime_columns_all_blank():
+    # порожні Дата/Час (увесь стовпець) — не падаємо: NaT і 00:00
+    blank = pd.Series([None, None], dtype=object)
+    dates = pd.Series(["01.10.2025", "02.10.2025"], dtype=object)
+    assert parse_datetime_columns(blank, blank).isna().all()
+    assert parse_datetime_columns(dates, blank).tolist() == [
+        pd.Timestamp("2025-10-01"), pd.Timestamp("2025-10-02")]
+    assert parse_datetime_columns(pd.Series([], dtype=object), pd.Series([], dtype=object)).empty
+
+
+def test_datetime_columns_messy_times():
+    # запасні формати часу; нерозпізнане — NaT (не північ), порожнє — 00:00
+    times = pd.Series(["1205", "12.05", "12:05 PM", "abc", "25:00", "", None], dtype=object)
+    got = parse_datetime_columns(pd.Series(["01.10.2025"] * len(times), dtype=object), times)
+    noon = pd.Timestamp("2025-10-01 12:05")
+    midnight = pd.Timestamp("2025-10-01")
+    assert got.tolist()[:3] == [noon] * 3
+    assert got[3:5].isna().all()
+    assert got.tolist()[5:] == [midnight, midnight]
@@ -0,0 +1,25 @@
+from docx import Document
+
+from src.armorkit.docxutils.tables import Cell, Col, add_xml_table
+
+
+def test_xml_table_spans_links_and_line_breaks():
+    doc = Document()
+    t = add_xml_table(
+        doc,
+        [Col(1, align="center", vcenter=True), Col(3)],
+        [
+            (Cell("Група", span=2, bold=True),),
+            ("1", Cell("145.9500", anchor="freq-145_9500")),
+            ("2", "рядок 1\nрядок 2\x0b"),
+            ("3",),                       # короткий рядок добивається порожньою коміркою
+        ],
+        header=("№", "Текст"),
+        row_height_cm=0.9,
+    )
+    assert len(t.rows) == 5
+    assert [c.text for c in t.rows[0].cells] == ["№", "Текст"]
+    assert t.rows[1].cells[0].text == "Група" and t.rows[1].cells[0]._tc.grid_span == 2
+    assert 'w:anchor="freq-145_9500"' in t.rows[2].cells[1]._tc.xml
+    assert t.rows[3].cells[1].text == "рядок 1\nрядок 2"
+    assert t.rows[4].cells[1].text == ""
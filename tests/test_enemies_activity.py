@@ -0,0 +1,31 @@
+import pandas as pd
+
+from src.armorkit.dates import add_datetime_column
+from src.enemies.generate_enemies_report import activity_period_for_freq4, network_activity
+
+
+def _intercepts():
+    return pd.DataFrame({
+        "Частота": ["150.125", "150.1250", "150.125", "151.5", "151.5", "160.0"],
+        "Дата": ["01.10.2025", "01.10.2025", "01.10.2025", "01.10.2025", "01.10.2025", "01.10.2025"],
+        "Час": ["12:05", "09:30:15", None, None, "погано", "23:59"],
+    }, dtype=object)
+
+
+def test_network_activity_periods():
+    df = _intercepts()
+    freqs = ["150.1250", "151.5000", "160.0000", "999.0000"]
+    expected = [("09:30", "12:05"), ("-", "-"), ("23:59", "23:59"), ("-", "-")]
+    # без часу (151.5) — не 00:00, а '-'; без перехоплень — '-'
+    act = network_activity(df, freqs)
+    assert list(zip(act["period_start"], act["period_end"])) == expected
+    assert act["network_name"].tolist() == ["—"] * 4
+    assert act["count"].tolist() == [3, 2, 1, 0]
+
+    # з готовим DT_COL (load_inputs) — той самий результат
+    act_dt = network_activity(add_datetime_column(df.copy()), freqs)
+    assert list(zip(act_dt["period_start"], act_dt["period_end"])) == expected
+    assert act_dt["count"].tolist() == [3, 2, 1, 0]
+
+    assert activity_period_for_freq4(df, "150.1250") == ("09:30", "12:05")
+    assert activity_period_for_freq4(df, "151.5000") == ("-", "-")
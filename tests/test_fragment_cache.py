@@ -0,0 +1,47 @@
+from docx import Document
+
+from src.armorkit.docxutils.fragment_cache import FragmentCache
+from src.armorkit.docxutils.merge import body_fragment_xml, body_length, splice_body_xml
+
+
+def _fragment(text: str):
+    doc = Document()
+    doc.add_paragraph(text)
+    return body_fragment_xml(doc)
+
+
+def test_lru_eviction_and_stats():
+    a, b, c = _fragment("a"), _fragment("b"), _fragment("c")
+    cache = FragmentCache(max_bytes=sum(map(len, a)) * 2 + 8)
+    cache.put("a", a)
+    cache.put("b", b)
+    assert cache.get("a") == a          # «a» тепер найсвіжіший
+    cache.put("c", c)                   # витісняє «b»
+    assert cache.get("b") is None and cache.get("c") == c
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 1)
+
+
+def test_persisted_fragments_splice_back(tmp_path):
+    path = tmp_path / "sections.pkl"
+    cache = FragmentCache(path=path, version=3)
+    cache.put("k", _fragment("секція"))
+    cache.save()
+
+    assert len(FragmentCache.load(path, version=2)) == 0   # інша версія рендеру
+    loaded = FragmentCache.load(path, version=3)
+    doc = Document()
+    splice_body_xml(doc, loaded.get("k"))
+    assert [p.text for p in doc.paragraphs] == ["секція"]
+
+
+def test_fragments_sliced_from_one_document():
+    # кілька секцій в одному документі ріжуться по body_length — як окремі документи
+    doc = Document()
+    parts = []
+    for text in ("перша", "друга"):
+        start = body_length(doc)
+        doc.add_paragraph(text)
+        doc.add_paragraph(text + " ще")
+        parts.append(body_fragment_xml(doc, start))
+    assert parts[1] == _fragment("друга") + _fragment("друга ще")
+    assert body_fragment_xml(doc) == parts[0] + parts[1]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from src.pelenggen.geo import (haversine_m, latlon_to_mgrs, mgrs_to_latlon, mgrs_to_utm,
+                               records_latlon)
+from src.pelengreport.parser import parse_whatsapp_text
+
+
+def test_mgrs_to_latlon_batch():
+    # еталон — GeoTrans (пакет mgrs)
+    lat, lon = mgrs_to_latlon(["37U DQ 30135 28465", "37UDQ3013528465", "56HLH3430348378"])
+    assert np.allclose(lat, [49.0051238985566, 49.0051238985566, -33.89196051120307], atol=1e-7)
+    assert np.allclose(lon, [38.04470600043589, 38.04470600043589, 151.2081062832057], atol=1e-7)
+
+
+def test_condensed_mgrs_any_precision():
+    # злиті цифри будь-якої парної довжини — навпіл (234|064), як у GeoTrans
+    lat, lon = mgrs_to_latlon(["18SUJ234064", "18S UJ 234 064", "18SUJ2306"])
+    assert np.allclose(lat, [38.88873464989838, 38.88873464989838, 38.885051831738465], atol=1e-7)
+    assert np.allclose(lon, [-77.03617813206859, -77.03617813206859, -77.04068426198039], atol=1e-7)
+    with pytest.raises(ValueError):
+        mgrs_to_utm(["18SUJ2340645"])          # непарна кількість цифр
+
+
+def test_latlon_to_mgrs_and_round_trip():
+    assert latlon_to_mgrs([48.9, -33.8688], [37.9, 151.2093]) == ["37U DQ 19382 16922", "56H LH 34368 50948"]
+    lat = np.array([47.5, 48.01, 49.99, 50.4])
+    lon = np.array([36.1, 38.7, 39.99, 35.2])
+    lat2, lon2 = mgrs_to_latlon(latlon_to_mgrs(lat, lon))
+    assert haversine_m(lat, lon, lat2, lon2).max() < 1.5
+    # MGRS -> lat/lon -> MGRS без втрати метра на округленні
+    cells = ["37U DQ 30135 28465", "37U DQ 30535 28465", "56H LH 34303 48378"]
+    assert latlon_to_mgrs(*mgrs_to_latlon(cells)) == cells
+
+
+def test_invalid_and_records():
+    with pytest.raises(ValueError):
+        mgrs_to_utm(["37U JQ 30135 28465"])   # J — не з набору стовпців зони 37
+    utm = mgrs_to_utm(["нісенітниця", "37U DQ 301 284"], strict=False)
+    assert np.isnan(utm.easting[0]) and utm.easting[1] == 430100.0
+
+    chat = ["Пеленг РЕР_63: 150.125 / 01.02.2024 10:15", "опис", "37U DQ 30135 28465", "37U DQ 19382 16922"]
+    lat, lon = records_latlon(list(parse_whatsapp_text(chat)))
+    assert np.allclose(lat, [49.0051239, 48.9], atol=1e-5)
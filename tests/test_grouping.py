@@ -0,0 +1,23 @@
+import pandas as pd
+
+from src.armorkit.domain.reference_index import ReferenceIndex
+from src.reportgen.grouping import group_frequencies_by_tag
+
+GROUPING = {
+    "tag_normalization": {
+        "map": {"36 мсп 67 мсд 25 ЗА": "36 мсп"},
+        "patterns": [{"match": r"(?i)^\s*(\d+)\s*мсп\b.*$", "to": r"\1 мсп"}],
+    }
+}
+
+
+def test_grouping_uses_normalized_reference_tags():
+    ref = pd.DataFrame({
+        "Частота": ["300.100", "300.200", "300.300", "300.400"],
+        "Хто": ["36 мсп 67 мсд 25 ЗА", " 31 МСП 67 мсд", None, "невідомо"],
+    })
+    idx = ReferenceIndex.from_frame(ref, GROUPING)
+    assert idx.tags == {"300.1000": "36 мсп", "300.2000": "31 мсп", "300.3000": None, "300.4000": "невідомо"}
+
+    groups = group_frequencies_by_tag(["300.4", "300.2", "300.1", "300.3"], idx, ["31 мсп", "36 мсп"], "Інші", GROUPING)
+    assert groups == {"31 мсп": ["300.2"], "36 мсп": ["300.1"], "Інші": ["300.3", "300.4"]}
@@ -0,0 +1,32 @@
+import os
+
+from src.armorkit.images import ImageIndex
+from src.reportgen.io_utils import peleng_path
+
+
+def test_lookup_order_matches_exists_checks(tmp_path):
+    for name in ("408.315.png", "408.3150.png", "136.56.PNG", "150.125.png", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    idx = ImageIndex(tmp_path)
+    assert idx.get("408.3150").name == "408.3150.png"
+    assert idx.get("136.5600") is None                   # лише точне ім'я, без нормалізації
+    assert idx.get("999.0000", "150.125").name == "150.125.png"
+    assert idx.get("notes") is None
+
+    # peleng_path: 4 знаки, далі запасні 3 знаки — лише як ім'я файлу
+    assert peleng_path(str(tmp_path), "408.3150") == str(tmp_path / "408.3150.png")
+    assert peleng_path(str(tmp_path), "150.1250") == str(tmp_path / "150.125.png")
+    assert peleng_path(str(tmp_path), "150.1254") == str(tmp_path / "150.125.png")
+    # 408.3154 не підхоплює скріншот іншої мережі 408.3150 — запасний варіант лише 408.315.png
+    (tmp_path / "408.315.png").unlink()
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 10**9))
+    assert ImageIndex(tmp_path).get("408.3154", "408.315") is None
+
+
+def test_index_refreshes_on_dir_mtime(tmp_path):
+    idx = ImageIndex(tmp_path, recheck_s=0)
+    assert idx.get("101.0000") is None
+    assert not idx.refresh()                              # каталог не змінився — без сканування
+    (tmp_path / "101.0000.png").write_bytes(b"")
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 10**9))
+    assert idx.get("101.0000").name == "101.0000.png"
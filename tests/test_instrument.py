@@ -0,0 +1,43 @@
+from src.armorkit.instrument import Profiler, PROFILER, enable_profiling, timed
+
+
+@timed(label=lambda freq4: freq4)
+def _section(freq4):
+    return bytearray(1 << 20)
+
+
+def test_disabled_profiler_records_nothing():
+    PROFILER.disable()
+    PROFILER.events.clear()
+    _section("150.0000")
+    assert PROFILER.events == []
+
+
+def test_nested_stages_and_memory_peaks(tmp_path):
+    prof = enable_profiling(memory=True)
+    try:
+        with prof.stage("draft"):
+            for f in ("150.0000", "151.0000"):
+                _section(f)
+    finally:
+        prof.disable()
+
+    outer, *sections = prof.events
+    assert outer.name == "draft" and outer.depth == 0
+    assert [(e.name, e.label, e.depth) for e in sections] == [("_section", "150.0000", 1), ("_section", "151.0000", 1)]
+    assert all(e.peak_bytes >= 1 << 20 for e in sections)
+    assert outer.peak_bytes >= 1 << 20
+
+    stats = prof.stats()
+    assert stats["_section"].calls == 2
+    assert "_section" in prof.table()
+    assert prof.write_trace(tmp_path / "trace.json").exists()
+
+
+def test_time_only_profiler():
+    prof = Profiler()
+    prof.enable(memory=False)
+    with prof.stage("load"):
+        pass
+    prof.disable()
+    assert prof.events[0].peak_bytes is None
@@ -0,0 +1,38 @@
+from datetime import datetime, time
+
+import openpyxl
+import pandas as pd
+
+from src.armorkit.normalize_freq import normalize_frequency_chunks
+from src.reportgen.grouping import unique_frequencies_with_counts
+from src.reportgen.io_utils import iter_excel_chunks, read_excel_streaming
+
+
+def _write(path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Дата", "Час", "Частота", "хто", "кому", "р\\обмін", "примітки", "зайве"])
+    ws.append(["01.10.2025", "12:05", 145.95, "ОРЕЛ", "БАЗА", "текст", None, 1])
+    ws.append([datetime(2025, 10, 2), time(9, 30), "100.107", "ОРЕЛ", None, "текст", "к", 2])
+    ws.append([None] * 8)
+    ws.append(["02.10.2025", "23:59:10", None, "вовк", "БАЗА", "КОЛО\nще", None, 3])
+    wb.save(path)
+
+
+def test_streaming_reader_types_and_incremental_counts(tmp_path):
+    path = tmp_path / "report_x.xlsx"
+    _write(path)
+
+    df = read_excel_streaming(path, chunk_rows=2)
+    assert list(df.columns) == ["Дата", "Час", "Частота", "хто", "кому", "р\\обмін", "примітки"]
+    assert len(df) == 3                                   # порожній рядок пропущено
+    assert isinstance(df["Частота"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["хто"].dtype, pd.CategoricalDtype)
+    assert df["Дата"].tolist() == [pd.Timestamp("2025-10-01"), pd.Timestamp("2025-10-02"), pd.Timestamp("2025-10-02")]
+    assert df["Час"].tolist() == [pd.Timedelta("12:05:00"), pd.Timedelta("09:30:00"), pd.Timedelta("23:59:10")]
+
+    ref = pd.DataFrame({"Частота": [150.1, 160.2], "Маска_3": [100.107, None], "Маска_А": [None, "КОЛО"]})
+    chunks = normalize_frequency_chunks(iter_excel_chunks(path, chunk_rows=2), ref)
+    freqs, counts = unique_frequencies_with_counts(chunks)
+    assert freqs == ["145.9500", "150.1000", "160.2000"]
+    assert sum(counts.values()) == 3
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from src.armorkit.normalize_freq import FREQ_NOT_FOUND, MaskIndex, normalize_frequency_column
+
+
+def _ref():
+    return pd.DataFrame({
+        "Частота": [145.95, 150.1, None],
+        "Маска_3": [100.107, "100,107", 300.2],
+        "Маска_Ш": [None, 200.5, None],
+        "Маска_А": ["КОЛО", None, None],
+        "Маска_Акв": [None, "КОЛО", None],
+    })
+
+
+def test_normalize_masks_text_and_sentinel():
+    df = pd.DataFrame({
+        "Частота": [" 420.850", "100.107", "200,500", "300.2", "100.999", None],
+        "р\\обмін": ["", "", "", "", "", "\n  КОЛО\nтекст"],
+    })
+    normalize_frequency_column(df, _ref())
+    assert df["Частота"].tolist() == [
+        " 420.850",       # реальна частота не змінюється
+        "145.95",         # перший збіг виграє
+        "150.1",
+        FREQ_NOT_FOUND,   # збіг без 'Частота'
+        FREQ_NOT_FOUND,   # маски немає у довіднику
+        "145.95",         # пошук за першим рядком тексту
+    ]
+
+
+def test_mask_index_counts_duplicates():
+    idx = MaskIndex.from_frame(_ref())
+    assert idx.by_mask3["100.107"] == "145.95"
+    assert idx.mask3_hits["100.107"] == 2
@@ -0,0 +1,35 @@
+from src.pelengreport.batch import expand_inputs, merge_records, parse_files, run_batch
+
+A = """[1] Пеленг РЕР_63: 300.350 / 16.10.2025 19:40
+УКХ р/м загін
+37U DQ 22585 26357
+[2] Пеленг РЕР_63: 164.475 / 16.10.2025 19.30
+УКХ р/м НВ
+37U DQ 30135 28465
+"""
+B = """[3] Пеленг РЕР_63: 164.475 / 16.10.2025 19.30
+УКХ р/м НВ (інший оператор)
+37U DQ 30135 28465
+37U DQ 30000 28000
+"""
+
+
+def test_batch_dedups_across_files(tmp_path):
+    (tmp_path / "a.txt").write_text(A, encoding="utf-8")
+    (tmp_path / "b.TXT").write_text(B, encoding="utf-8-sig")
+    (tmp_path / "notes.md").write_text(A, encoding="utf-8")
+
+    files = expand_inputs([tmp_path, str(tmp_path / "*.txt")])
+    assert [f.name for f in files] == ["a.txt", "b.TXT"]
+
+    merged, stats = merge_records(files, parse_files(files, workers=2))
+    assert [(s.records, s.unique, s.duplicates) for s in stats] == [(2, 2, 0), (2, 1, 1)]
+    # за часом пеленга; дубль з b.TXT відкинуто, опис лишився з першого файлу
+    assert [(r["dt"], r["mgrs"], r["unit_desc"]) for r in merged] == [
+        ("16.10.2025 19:30:00", "37U DQ 30135 28465", "УКХ р/м НВ"),
+        ("16.10.2025 19:30:00", "37U DQ 30000 28000", "УКХ р/м НВ (інший оператор)"),
+        ("16.10.2025 19:40:00", "37U DQ 22585 26357", "УКХ р/м загін"),
+    ]
+
+    out, _ = run_batch([tmp_path], out_dir=tmp_path / "out", workers=1)
+    assert out.exists()
@@ -0,0 +1,67 @@
+import numpy as np
+from docx import Document
+
+from src.pelengreport.clusters import ClusterParams, cluster_labels, cluster_records
+from src.pelengreport.report import build_docx
+
+
+def _rec(freq, dt, mgrs):
+    return {"freq_or_mask": freq, "unit_desc": "", "dt": dt, "mgrs": mgrs}
+
+
+RECORDS = [
+    _rec("164.475", "16.10.2025 19:30:00", "37U DQ 30135 28465"),
+    _rec("164.475", "16.10.2025 20:00:00", "37U DQ 30535 28465"),   # 400 м — той самий район
+    _rec("164.475", "16.10.2025 21:00:00", "37U DQ 30935 28465"),   # ланцюжок ще +400 м
+    _rec("164.475", "19.10.2025 21:00:00", "37U DQ 30135 28465"),   # поза вікном 24 год
+    _rec("300.350", "16.10.2025 19:40:00", "37U DQ 30135 28465"),   # інша частота
+    _rec("164.475", "16.10.2025 19:45:00", "37U DQ 40135 28465"),   # 10 км
+    _rec("164.475", "16.10.2025 19:45:00", "не координата"),
+]
+
+
+def test_labels_match_bruteforce():
+    rng = np.random.default_rng(7)
+    n = 400
+    freqs = rng.choice(["a", "b"], n).tolist()
+    lat = 48.5 + rng.random(n) * 0.05
+    lon = 37.5 + rng.random(n) * 0.05
+    hours = np.where(rng.random(n) < 0.1, np.nan, rng.random(n) * 72)
+    params = ClusterParams(radius_m=400, window_h=12)
+    labels = cluster_labels(freqs, lat, lon, hours, params)
+
+    # еталон O(n²) у тій самій локальній проекції: компоненти зв'язності за правилом відстані/часу
+    y = np.radians(lat) * 6_371_008.8
+    x = np.radians(lon) * 6_371_008.8 * np.cos(np.radians(lat.mean()))
+    parent = list(range(n))
+
+    def find(a):
+        while parent[a] != a:
+            a = parent[a]
+        return a
+
+    for i in range(n):
+        for j in range(i):
+            linked = (freqs[i] == freqs[j] and (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 <= 400 ** 2
+                      and np.isnan(hours[i]) == np.isnan(hours[j])
+                      and not abs(hours[i] - hours[j]) > 12)
+            if linked:
+                parent[find(i)] = find(j)
+
+    # розбиття збігаються: мітка -> компонента еталона — взаємно однозначна відповідність
+    pairs = {(int(labels[i]), find(i)) for i in range(n)}
+    assert len(pairs) == len({p[0] for p in pairs}) == len({p[1] for p in pairs})
+    assert len(pairs) > 20 and len(pairs) < n        # є і злиті райони, і окремі пеленги
+
+
+def test_areas_in_report(tmp_path):
+    areas = cluster_records(RECORDS)
+    assert [(a.freq_or_mask, a.fixes, a.first_dt, a.last_dt) for a in areas] == [
+        ("164.475", 3, "16.10.2025 19:30:00", "16.10.2025 21:00:00")]
+    assert areas[0].mgrs == "37U DQ 30535 28465"
+    assert len(cluster_records(RECORDS, ClusterParams(min_fixes=1))) == 4
+    assert len(cluster_records(RECORDS, ClusterParams(window_h=None))) == 1
+
+    doc = Document(build_docx(RECORDS, tmp_path / "f.docx"))
+    cells = [c.text for t in doc.tables for row in t.rows for c in row.cells]
+    assert "Викрито районів: 1" in cells and areas[0].mgrs in cells
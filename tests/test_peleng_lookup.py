@@ -0,0 +1,32 @@
+import pandas as pd
+
+from src.armorkit.domain.reference_index import ReferenceIndex
+from src.pelenggen.lookup import PelengLookup
+
+
+def _lookup():
+    ref = pd.DataFrame({
+        "Частота": [150.125, 151.5, 152.0],
+        "Радіомережа": ["Мережа А", "Мережа Б", None],
+        "Маска_3": [100.1, None, 100.15],
+        "Підрозділ": ["1 мсп", None, "3 мсп"],
+        "Зона функціонування": ["КРЕМІННА", None, float("nan")],
+    })
+    return PelengLookup.from_reference(ReferenceIndex.from_frame(ref))
+
+
+def test_masks_and_places():
+    lk = _lookup()
+    assert lk.freq_by_mask["100.100"] == "150.1250"
+    assert lk.place("150.1250") == ("1 мсп", "КРЕМІННА")
+    assert lk.place("151.5000") == (None, None)
+    assert lk.place("152.0000") == ("3 мсп", None)
+    assert lk.place("999.0000") == (None, None)
+
+
+def test_suggest_by_prefix():
+    lk = _lookup()
+    assert [s.key for s in lk.suggest("100,1")] == ["100.100", "100.150"]
+    assert [s.freq4 for s in lk.suggest("15")] == ["150.1250", "151.5000", "152.0000"]
+    assert lk.suggest("15", limit=1)[0].name == "Мережа А"
+    assert lk.suggest("") == [] and lk.suggest("7") == []
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from src.pelengreport.parser import (
+    BLANK, HEADER, MGRS, TEXT, classify_line, parse_whatsapp_file, parse_whatsapp_text, sanitize_mgrs,
+)
+
+DATA = Path(__file__).resolve().parents[1] / "src" / "pelengreport" / "data" / "peleng.txt"
+
+
+def test_classify_line_matches_sanitize_mgrs():
+    assert classify_line("[1/1/2025 9:00] Пеленг РЕР_63: 300.35 / 16.10.2025 19.40\n")[0] == HEADER
+    assert classify_line("   \n")[0] == BLANK
+    assert classify_line("привіт\n")[0] == TEXT
+    for line in ("37u dq 30135 28465\n", "a  b c\t12345 54321 "):
+        kind, m = classify_line(line)
+        assert kind == MGRS
+        assert f"{m.group('t0').upper()} {m.group('t1').upper()} {m.group('d1')} {m.group('d2')}" == sanitize_mgrs(line)
+    assert classify_line("x 12345 12345\n")[0] == TEXT        # лише 3 токени
+    assert classify_line("a b 123456 12345\n")[0] == TEXT
+
+
+def test_parse_header_desc_join_and_coords():
+    lines = [
+        "шум\n",
+        "[x] Пеленг РЕР_63: 300.346 / 16.10.2025 9.43\n",
+        "УКХ р/м  3мсб\n",
+        "(СЕРЕБРЯНСЬКИЙ ЛІС)\n",
+        "37U DQ 27420 24168\n",
+        "\n",
+        "37u dq 27355 25929\n",
+        "інше повідомлення\n",
+        "37U DQ 11111 22222\n",          # після тексту — вже не координата пеленга
+    ]
+    recs = list(parse_whatsapp_text(iter(lines)))
+    assert recs == [
+        {"freq_or_mask": "300.346", "unit_desc": "УКХ р/м 3мсб (СЕРЕБРЯНСЬКИЙ ЛІС)", "dt": "16.10.2025 09:43:00",
+         "mgrs": "37U DQ 27420 24168"},
+        {"freq_or_mask": "300.346", "unit_desc": "УКХ р/м 3мсб (СЕРЕБРЯНСЬКИЙ ЛІС)", "dt": "16.10.2025 09:43:00",
+         "mgrs": "37U DQ 27355 25929"},
+    ]
+
+
+def test_parse_sample_export():
+    recs = list(parse_whatsapp_file(DATA))
+    assert len(recs) == 18
+    assert recs[0] == {"freq_or_mask": "164.475", "unit_desc": "УКХ р/м НВ підрозділу  (ДІБРОВА)",
+                       "dt": "16.10.2025 19:30:00", "mgrs": "37U DQ 30135 28465"}
@@ -0,0 +1,14 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_cli_and_gui_modules_do_not_import_pandas():
+    # швидкий старт: pandas/python-docx вантажаться лише в гілці обраного режиму
+    code = ("import sys, main, src.pelenggen.gui; "
+            "heavy = [m for m in ('pandas', 'docx', 'openpyxl') if m in sys.modules]; "
+            "print(heavy); sys.exit(1 if heavy else 0)")
+    r = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert r.returncode == 0, r.stdout + r.stderr
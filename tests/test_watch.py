@@ -0,0 +1,103 @@
+import os
+
+import pandas as pd
+
+from src.armorkit.xlsxutils import workbook
+from src.reportgen import watch
+from src.reportgen.watch import network_signatures
+
+
+def test_network_signatures_track_changed_networks():
+    df = pd.DataFrame({"Частота": ["300.1", "300.100", "300.2"], "Час": ["12:00", "12:05", "13:00"]})
+    before = network_signatures(df)
+    assert set(before) == {"300.1000", "300.2000"} and before["300.1000"][0] == 2
+
+    changed = df.copy()
+    changed.loc[2, "Час"] = "13:01"
+    after = network_signatures(pd.concat([changed, df.iloc[[0]].assign(Частота="400.5")], ignore_index=True))
+    assert {f for f in set(before) | set(after) if before.get(f) != after.get(f)} == {"300.2000", "400.5000"}
+
+
+def _export(path, freqs, stamp):
+    rows = [{"Дата": "01.10.2025", "Час": f"12:{i:02d}", "Частота": f, "р\\обмін": f"текст {i}"}
+            for i, f in enumerate(freqs)]
+    pd.DataFrame(rows).to_excel(path, index=False)
+    os.utime(path, ns=(stamp, stamp))
+
+
+def _setup(tmp_path):
+    ref, reports = tmp_path / "ref.xlsx", tmp_path / "reports"
+    reports.mkdir()
+    cfg = tmp_path / "config.yml"
+    cfg.write_text(f"paths:\n  freq_file: '{ref}'\n  reports_dir: '{reports}'\n"
+                   f"  output_dir: '{tmp_path / 'build'}'\n", encoding="utf-8")
+    pd.DataFrame({"Частота": [300.1, 400.5], "Радіомережа": ["А", "Б"], "Хто": ["36 мсп", "37 мсп"]}).to_excel(ref, index=False)
+    return cfg, ref, reports
+
+
+def test_poll_rebuilds_only_touched_reports(tmp_path, monkeypatch):
+    cfg, ref, reports = _setup(tmp_path)
+    first = reports / "report_2025-10-01T08-00_2025-10-01T12-00.xlsx"
+    second = reports / "report_2025-10-01T12-00_2025-10-01T16-00.xlsx"
+    _export(first, [300.1, 300.1], 10**18)
+
+    built = []
+    monkeypatch.setattr(watch, "build_report", lambda name, prepared, workers: built.append(name) or name)
+    monkeypatch.setitem(watch.REPORT_SCOPES, "enemies", lambda p: {"400.5000"})
+    w = watch.ReportWatcher(str(cfg), reports=["active-freqs", "enemies"])
+
+    def poll():
+        built.clear()
+        w.poll()
+        assert all(wb._xls is None for _, wb in workbook._OPEN.values())  # книги закриті між циклами
+        return sorted(built), [p.name for p in w.frames]
+
+    assert poll() == (["active-freqs", "enemies"], [first.name])
+    assert poll() == ([], [first.name])
+
+    # нове вивантаження без вікна витісняє попереднє; мережа 400.5 не змінилась — enemies не чіпаємо
+    _export(second, [300.1], 10**18 + 1)
+    assert poll() == (["active-freqs"], [second.name])
+
+    # файл не прочитався (ще копіюється / заблокований) — пропуск і повтор на наступному циклі,
+    # навіть якщо розмір і mtime вже не змінюються
+    third = reports / "report_2025-10-01T16-00_2025-10-01T20-00.xlsx"
+    _export(third, [300.1, 400.5], 10**18 + 2)
+    def locked(path):
+        raise OSError("locked")
+
+    parse = w._parse
+    w._parse = locked
+    assert poll() == ([], [second.name])
+    w._parse = parse
+    assert poll() == (["active-freqs", "enemies"], [third.name])
+
+    # змінився довідник — повна перебудова
+    pd.DataFrame({"Частота": [300.1, 400.5], "Радіомережа": ["А", "В"], "Хто": ["36 мсп", "37 мсп"]}).to_excel(ref, index=False)
+    os.utime(ref, ns=(10**18 + 3, 10**18 + 3))
+    assert poll() == (["active-freqs", "enemies"], [third.name])
+
+    # файл стану видалено — стан переходить на найсвіжіший із решти
+    third.unlink()
+    assert poll() == (["active-freqs", "enemies"], [second.name])
+
+
+def test_run_waits_for_first_export_and_survives_errors(tmp_path, monkeypatch):
+    cfg, ref, reports = _setup(tmp_path)
+    built = []
+    monkeypatch.setattr(watch, "build_report", lambda name, prepared, workers: built.append(name) or name)
+    w = watch.ReportWatcher(str(cfg), reports=["active-freqs"])
+
+    # порожній каталог на старті — не падаємо, чекаємо на перше вивантаження
+    assert w.poll() == {} and not w.frames
+    _export(reports / "report_2025-10-01T08-00_2025-10-01T12-00.xlsx", [300.1], 10**18)
+    assert w.poll() == {"active-freqs": "active-freqs"}
+
+    # довідник «посеред копіювання» — цикл логується, процес живе; наступний цикл його підхоплює
+    ref.write_bytes(b"partial")
+    w.run(interval=0, cycles=1)
+    assert built == ["active-freqs"]
+    pd.DataFrame({"Частота": [300.1], "Радіомережа": ["А"], "Хто": ["36 мсп"]}).to_excel(ref, index=False)
+    os.utime(ref, ns=(10**18 + 1, 10**18 + 1))
+    w.run(interval=0, cycles=1)
+    assert built == ["active-freqs", "active-freqs"]
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import pandas as pd
+
+from src.armorkit.data_loader import dedup_intercepts, select_reports_in_window
+
+
+def test_select_reports_by_period_intersection(tmp_path):
+    for name in ("report_2025-10-01T08-00_2025-10-01T12-00.xlsx",
+                 "report_2025-10-01T12-00_2025-10-01T16-30.xlsx",
+                 "report_2025-10-01T14-00_2025-10-01T18-00.xlsx",
+                 "report_2025-10-02T00-00_2025-10-02T04-00.xlsx",
+                 "report_latest.xlsx"):
+        (tmp_path / name).touch()
+    picked = select_reports_in_window(tmp_path, "report_*.xlsx",
+                                      datetime(2025, 10, 1, 12), datetime(2025, 10, 2))
+    assert [p.name[7:23] for p, _, _ in picked] == ["2025-10-01T12-00", "2025-10-01T14-00"]
+
+
+def test_dedup_overlapping_intercepts():
+    df = pd.DataFrame({
+        "Дата": ["01.10.2025", "01.10.2025", "01.10.2025", "01.10.2025"],
+        "Час": ["12:00", "12:00", "12:00", "12:01"],
+        "Частота": [145.95, 145.95, 145.95, 145.95],
+        "р\\обмін": ["текст", "текст ", "інший", "текст"],
+    })
+    out = dedup_intercepts(df)
+    assert out["р\\обмін"].tolist() == ["текст", "інший", "текст"]